@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Load generator for the portfolio API routes.
+
+Drives a configurable number of concurrent keep-alive connections (optionally
+capped at a fixed request rate) against each API route, records latency
+histograms, throughput and error rates, and checks them against SLOs.
+Uses only the standard library so it runs anywhere `next start` does.
+"""
+
+import http.client
+import json
+import math
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+# name -> (method, path, JSON body)
+ROUTES = {
+    "news": ("GET", "/api/news", None),
+    "contact": ("POST", "/api/contact", {
+        "name": "Load Test",
+        "email": "load@test.com",
+        "message": "Load test message.",
+    }),
+}
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, math.inf]
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RouteStats:
+    """Latencies and outcomes collected for one route."""
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies_ms = []
+        self.statuses = {}
+        self.errors = 0
+        self.exceptions = {}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms, status=None, exception=None):
+        with self._lock:
+            self.latencies_ms.append(latency_ms)
+            if exception is not None:
+                self.errors += 1
+                key = type(exception).__name__
+                self.exceptions[key] = self.exceptions.get(key, 0) + 1
+            else:
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+                if status >= 400:
+                    self.errors += 1
+
+    def histogram(self):
+        counts = [0] * len(BUCKETS_MS)
+        for latency in self.latencies_ms:
+            for i, bound in enumerate(BUCKETS_MS):
+                if latency <= bound:
+                    counts[i] += 1
+                    break
+        return counts
+
+    def summary(self):
+        values = sorted(self.latencies_ms)
+        total = len(values)
+        return {
+            "route": self.name,
+            "requests": total,
+            "errors": self.errors,
+            "error_rate": self.errors / total if total else 0.0,
+            "throughput_rps": total / self.elapsed if self.elapsed else 0.0,
+            "p50_ms": percentile(values, 50),
+            "p90_ms": percentile(values, 90),
+            "p99_ms": percentile(values, 99),
+            "max_ms": values[-1] if values else None,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "exceptions": self.exceptions,
+            "histogram": dict(zip([str(b) for b in BUCKETS_MS], self.histogram())),
+        }
+
+
+class Pacer:
+    """Hands out evenly spaced send times shared by all workers."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def next_slot(self):
+        if not self.interval:
+            return time.perf_counter()
+        # Slots follow a fixed schedule; if the server falls behind, the
+        # backlog shows up as latency instead of being silently dropped
+        with self._lock:
+            slot = self._next
+            self._next += self.interval
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return slot
+
+
+def _connect(target, timeout):
+    if target.scheme == "https":
+        return http.client.HTTPSConnection(target.hostname, target.port or 443, timeout=timeout)
+    return http.client.HTTPConnection(target.hostname, target.port or 80, timeout=timeout)
+
+
+def _worker(target, route, stats, pacer, deadline, budget, timeout):
+    method, path, body = route
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload is not None else {}
+    conn = _connect(target, timeout)
+
+    while time.perf_counter() < deadline and budget.take():
+        # Latency is measured from the scheduled send time, so a slow server
+        # can't hide queueing delay by slowing down the generator
+        scheduled = pacer.next_slot()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            stats.record((time.perf_counter() - scheduled) * 1000, status=response.status)
+            if response.getheader("connection", "").lower() == "close":
+                conn.close()
+                conn = _connect(target, timeout)
+        except (OSError, http.client.HTTPException) as e:
+            stats.record((time.perf_counter() - scheduled) * 1000, exception=e)
+            conn.close()
+            conn = _connect(target, timeout)
+    conn.close()
+
+
+class _Budget:
+    """Shared request counter; unlimited when ``limit`` is 0."""
+
+    def __init__(self, limit):
+        self.remaining = limit or None
+        self._lock = threading.Lock()
+
+    def take(self):
+        if self.remaining is None:
+            return True
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+def route_status(base_url, name, timeout=10):
+    """Status of one HEAD request to a route (None when the server does not answer)."""
+    target = urlparse(base_url)
+    conn = _connect(target, timeout)
+    try:
+        conn.request("HEAD", ROUTES[name][1])
+        return conn.getresponse().status
+    except (OSError, http.client.HTTPException):
+        return None
+    finally:
+        conn.close()
+
+
+def run_route(base_url, name, concurrency=10, rate=0, duration=10, max_requests=0, timeout=10):
+    """Load a single route and return its ``RouteStats``."""
+    target = urlparse(base_url)
+    stats = RouteStats(name)
+    pacer = Pacer(rate)
+    budget = _Budget(max_requests)
+
+    start_time = time.perf_counter()
+    deadline = start_time + duration
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(target, ROUTES[name], stats, pacer, deadline, budget, timeout),
+            daemon=True,
+        )
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats.elapsed = time.perf_counter() - start_time
+    return stats
+
+
+def check_slos(summary, slos):
+    """Return a list of human-readable SLO violations for one route."""
+    violations = []
+    for key, label in (("p50_ms", "p50"), ("p90_ms", "p90"), ("p99_ms", "p99"), ("max_ms", "max")):
+        limit = slos.get(key)
+        if limit is not None and summary[key] is not None and summary[key] > limit:
+            violations.append(f"{label} {summary[key]:.0f}ms > {limit:.0f}ms")
+    limit = slos.get("error_rate")
+    if limit is not None and summary["error_rate"] > limit:
+        violations.append(f"error rate {summary['error_rate']:.2%} > {limit:.2%}")
+    limit = slos.get("throughput_rps")
+    if limit is not None and summary["throughput_rps"] < limit:
+        violations.append(f"throughput {summary['throughput_rps']:.1f} rps < {limit:.1f} rps")
+    if not summary["requests"]:
+        violations.append("no requests completed")
+    return violations
+
+
+def print_summary(summary, violations):
+    print(f"\n{summary['route']}: {summary['requests']} requests, "
+          f"{summary['throughput_rps']:.1f} req/s, error rate {summary['error_rate']:.2%}")
+    if summary["requests"]:
+        print(f"  latency ms  p50={summary['p50_ms']:.1f}  p90={summary['p90_ms']:.1f}  "
+              f"p99={summary['p99_ms']:.1f}  max={summary['max_ms']:.1f}")
+    print(f"  statuses    {summary['statuses'] or '-'}  exceptions {summary['exceptions'] or '-'}")
+
+    counts = list(summary["histogram"].values())
+    peak = max(counts) or 1
+    for bound, count in summary["histogram"].items():
+        label = f">{BUCKETS_MS[-2]}" if bound == "inf" else f"<={bound}"
+        print(f"  {label:>8}ms {'#' * round(40 * count / peak):<40} {count}")
+
+    for violation in violations:
+        print(f"  ❌ SLO violated: {violation}")
+
+
+def run_load_test(base_url, routes, concurrency=10, rate=0, duration=10, max_requests=0,
+                  timeout=10, slos=None, report_path=None):
+    """Load every route in turn; return True when all SLOs are met."""
+    slos = slos or {}
+    results = []
+    passed = True
+
+    for name in routes:
+        # Like requires_endpoint in the tests: a route the app does not serve
+        # is skipped, not loaded with 404s that count against the SLOs
+        if route_status(base_url, name, timeout) == 404:
+            print(f"\nSkipping {ROUTES[name][0]} {ROUTES[name][1]}: not served (404)")
+            results.append({"route": name, "skipped": "not served (404)"})
+            continue
+        print(f"\nLoading {ROUTES[name][0]} {ROUTES[name][1]} "
+              f"(concurrency={concurrency}, rate={rate or 'unlimited'}, duration={duration}s)")
+        summary = run_route(base_url, name, concurrency, rate, duration, max_requests, timeout).summary()
+        violations = check_slos(summary, slos)
+        summary["slo_violations"] = violations
+        passed &= not violations
+        results.append(summary)
+        print_summary(summary, violations)
+
+    if report_path:
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        with open(report_path, "w") as f:
+            json.dump({
+                "base_url": base_url,
+                "concurrency": concurrency,
+                "rate": rate,
+                "duration": duration,
+                "slos": slos,
+                "routes": results,
+            }, f, indent=2)
+    return passed
@@ -6,17 +6,88 @@ Provides different test execution options and configurations.
 
 import os
 import sys
+import time
 import subprocess
 import argparse
+import xml.etree.ElementTree as ET
 from pathlib import Path
 
-def run_command(command, description):
+# Marker selecting each test group (markers are assigned in tests/conftest.py)
+GROUP_MARKERS = {
+    "smoke": "smoke",
+    "ui": "ui",
+    "api": "api",
+    "integration": "integration",
+}
+
+COVERAGE_ARGS = [
+    "--cov=src",
+    "--cov-report=html:reports/coverage",
+    "--cov-report=term-missing",
+    "--cov-fail-under=80",
+]
+
+def results_args(name, report=False):
+    """Result stream (and with ``report`` the reports rendered from it) for one pytest run."""
+    suffix = "" if name == "tests" else f"-{name}"
+    args = [f"--results-jsonl=reports/results{suffix}.jsonl"]
+    if report:
+        args += [f"--results-html=reports/test-report{suffix}.html", f"--results-md=reports/test-report{suffix}.md"]
+    return args
+
+# JUnit XML per pytest process, used to tell test time from runner overhead
+RUNNER_DIR = os.path.join("reports", ".runner")
+
+class RunnerTimings:
+    """Wall time of each pytest process vs. time spent inside its test session."""
+    
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.runs = []
+    
+    def add(self, description, wall_time, junit_path=None):
+        self.runs.append((description, wall_time, _session_time(junit_path)))
+    
+    def print_summary(self):
+        if not self.runs:
+            return
+        total = time.perf_counter() - self.start_time
+        overhead = 0.0
+        
+        print(f"\n{'='*60}")
+        print("Runner timings")
+        print(f"{'='*60}")
+        for description, wall_time, session in self.runs:
+            if session is None:
+                print(f"  {description:<40} {wall_time:7.1f}s wall")
+                continue
+            overhead += wall_time - session
+            print(f"  {description:<40} {wall_time:7.1f}s wall {session:7.1f}s in session "
+                  f"{wall_time - session:6.1f}s overhead")
+        print(f"\n  Total {total:.1f}s for {len(self.runs)} run(s); {overhead:.1f}s spent outside test "
+              f"sessions (interpreter startup, plugin loading, report writing)")
+
+TIMINGS = RunnerTimings()
+
+def _session_time(junit_path):
+    """Duration of the pytest session recorded in a JUnit XML file."""
+    if not junit_path:
+        return None
+    try:
+        root = ET.parse(junit_path).getroot()
+    except (OSError, ET.ParseError):
+        return None
+    suite = root if root.tag == "testsuite" else root.find("testsuite")
+    return float(suite.get("time", 0)) if suite is not None else None
+
+def run_command(command, description, junit_path=None):
     """Run a command and handle errors."""
     print(f"\n{'='*60}")
     print(f"Running: {description}")
     print(f"Command: {' '.join(command)}")
     print(f"{'='*60}\n")
     
+    start_time = time.perf_counter()
     try:
         result = subprocess.run(command, check=True, capture_output=False)
         print(f"\n✅ {description} completed successfully!")
@@ -24,95 +95,221 @@ def run_command(command, description):
     except subprocess.CalledProcessError as e:
         print(f"\n❌ {description} failed with exit code {e.returncode}")
         return False
+    finally:
+        TIMINGS.add(description, time.perf_counter() - start_time, junit_path)
 
 def install_dependencies():
     """Install Python dependencies."""
     return run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], 
                       "Installing Python dependencies")
 
-def run_smoke_tests():
-    """Run smoke tests (quick tests)."""
-    return run_command([
-        sys.executable, "-m", "pytest", 
-        "-m", "smoke", 
-        "--tb=short",
-        "-v"
-    ], "Running smoke tests")
+def pytest_command(name, paths=(), markexpr=None, coverage=False, report=False, parallel=False):
+    """Build one pytest command line; returns (command, junit_path)."""
+    junit_path = os.path.join(RUNNER_DIR, f"{name}.xml")
+    command = [sys.executable, "-m", "pytest", *paths]
+    if markexpr:
+        command += ["-m", markexpr]
+    if parallel:
+        command += ["-n", "auto"]
+    if coverage:
+        command += COVERAGE_ARGS
+    command += results_args(name, report)
+    command += ["--tb=short", "-v", f"--junitxml={junit_path}"]
+    return command, junit_path
 
-def run_ui_tests():
-    """Run UI tests."""
-    return run_command([
-        sys.executable, "-m", "pytest", 
-        "tests/test_ui_*.py",
-        "--tb=short",
-        "-v"
-    ], "Running UI tests")
+def selected_groups(args):
+    """Test groups picked on the command line, in a fixed order."""
+    return [group for group in GROUP_MARKERS if getattr(args, group)]
 
-def run_api_tests():
-    """Run API tests."""
-    return run_command([
-        sys.executable, "-m", "pytest", 
-        "tests/test_api_*.py",
-        "--tb=short",
-        "-v"
-    ], "Running API tests")
+def run_tests(args):
+    """Run every selected group in a single pytest invocation.
+    
+    Groups are combined into one ``-m`` expression, so tests are collected
+    once and coverage/HTML reporting happen in the same pass.
+    """
+    groups = [] if args.all else selected_groups(args)
+    markexpr = " or ".join(GROUP_MARKERS[group] for group in groups) or None
+    description = f"Running {', '.join(groups) if groups else 'all'} tests"
+    
+    # --test on its own gets the coverage/report options; next to test
+    # groups it runs separately, since pytest can only AND paths and markers
+    if args.test and not (groups or args.all):
+        command, junit_path = pytest_command(
+            "specific", paths=[args.test], coverage=args.coverage, report=args.report, parallel=args.parallel
+        )
+        return run_command(command, f"Running specific test: {args.test}", junit_path)
+    
+    success = True
+    command, junit_path = pytest_command(
+        "tests", markexpr=markexpr, coverage=args.coverage, report=args.report, parallel=args.parallel
+    )
+    success &= run_command(command, description, junit_path)
+    
+    if args.test:
+        command, junit_path = pytest_command("specific", paths=[args.test], parallel=args.parallel)
+        success &= run_command(command, f"Running specific test: {args.test}", junit_path)
+    return success
 
-def run_integration_tests():
-    """Run integration tests."""
-    return run_command([
-        sys.executable, "-m", "pytest", 
-        "tests/test_integration_*.py",
-        "--tb=short",
-        "-v"
-    ], "Running integration tests")
+def _start_job(args, name, markexpr, paths):
+    """Start one pytest process with its output going to a log file."""
+    command, junit_path = pytest_command(name, paths=paths, markexpr=markexpr, parallel=args.parallel)
+    env = dict(os.environ)
+    if args.coverage:
+        # One data file per process; `coverage combine` merges them afterwards
+        command += ["--cov=src", "--cov-report="]
+        env["COVERAGE_FILE"] = f".coverage.{name}"
+    if args.report:
+        command += results_args(name, report=True)[1:]
+    log_path = os.path.join(RUNNER_DIR, f"{name}.log")
+    print(f"Starting {name}: {' '.join(command)}")
+    log = open(log_path, "w")
+    process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, env=env)
+    return name, process, log, log_path, junit_path, time.perf_counter()
 
-def run_all_tests():
-    """Run all tests."""
-    return run_command([
-        sys.executable, "-m", "pytest",
-        "--tb=short",
-        "-v"
-    ], "Running all tests")
+def _finish_job(job, label):
+    """Wait for a started pytest process and print its output; returns success."""
+    name, process, log, log_path, junit_path, start_time = job
+    returncode = process.wait()
+    log.close()
+    TIMINGS.add(f"{name} tests ({label})", time.perf_counter() - start_time, junit_path)
+    
+    print(f"\n{'='*60}")
+    print(f"Output: {name} tests")
+    print(f"{'='*60}\n")
+    with open(log_path) as f:
+        print(f.read())
+    if returncode in (0, 5):  # 5: no tests selected for this group
+        print(f"✅ {name} tests completed successfully!")
+        return True
+    print(f"❌ {name} tests failed with exit code {returncode}")
+    return False
 
-def run_tests_with_coverage():
-    """Run tests with coverage report."""
-    return run_command([
-        sys.executable, "-m", "pytest",
-        "--cov=src",
-        "--cov-report=html:reports/coverage",
-        "--cov-report=term-missing",
-        "--cov-fail-under=80",
-        "--tb=short",
-        "-v"
-    ], "Running tests with coverage")
+def run_tests_concurrently(args):
+    """Run each selected group as its own pytest process, all at the same time.
+    
+    Groups are made disjoint (a test matching two markers runs in the first
+    group only). Tests that drive the stub news upstream (marked
+    ``stub_upstream``) share one stub and its injected delays and failures,
+    so they are left out of the concurrent processes and run afterwards in
+    one process of their own. Coverage data from every process is combined
+    into one report afterwards; HTML reports are written per process.
+    """
+    groups = selected_groups(args) or list(GROUP_MARKERS)
+    jobs = []
+    seen = []
+    for group in groups:
+        markexpr = GROUP_MARKERS[group]
+        if seen:
+            markexpr = f"{markexpr} and not ({' or '.join(seen)})"
+        seen.append(GROUP_MARKERS[group])
+        jobs.append((group, f"({markexpr}) and not stub_upstream", []))
+    stub_jobs = [("stub-upstream", f"({' or '.join(seen)}) and stub_upstream", [])]
+    if args.test:
+        jobs.append(("specific", "not stub_upstream", [args.test]))
+        stub_jobs.append(("specific-stub-upstream", "stub_upstream", [args.test]))
+    
+    started = [_start_job(args, name, markexpr, paths) for name, markexpr, paths in jobs]
+    success = True
+    for job in started:
+        success &= _finish_job(job, "concurrent")
+    for name, markexpr, paths in stub_jobs:
+        success &= _finish_job(_start_job(args, name, markexpr, paths), "after the concurrent runs")
+    
+    if args.coverage:
+        success &= run_command([sys.executable, "-m", "coverage", "combine"], "Combining coverage data")
+        success &= run_command([sys.executable, "-m", "coverage", "html", "-d", "reports/coverage"],
+                               "Writing coverage report")
+        success &= run_command([sys.executable, "-m", "coverage", "report", "-m", "--fail-under=80"],
+                               "Checking coverage")
+    return success
 
-def run_tests_parallel():
-    """Run tests in parallel."""
-    return run_command([
-        sys.executable, "-m", "pytest",
-        "-n", "auto",
-        "--tb=short",
-        "-v"
-    ], "Running tests in parallel")
+def start_server():
+    """Build, start and warm up the app once, for every run below."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from tests.locking import LockTimeout
+    from tests.server import ServerError, launch_server
+    
+    print(f"\n{'='*60}")
+    print("Starting the app (next build + next start)")
+    print(f"{'='*60}\n")
+    
+    start_time = time.perf_counter()
+    try:
+        managed = launch_server()
+    except (ServerError, LockTimeout) as e:
+        print(f"❌ Could not start the app: {e}")
+        return None
+    TIMINGS.add("Starting and warming up the app", time.perf_counter() - start_time)
+    
+    metrics = managed.server.metrics
+    if "build_s" in metrics:
+        print(f"  build:    {metrics['build_s']:.1f}s")
+    print(f"  startup:  {metrics['startup_s']:.1f}s")
+    print(f"  warm-up:  {metrics['warmup_s']:.1f}s ({metrics['warmup_requests']} requests)")
+    print(f"\n✅ App running at {managed.url}")
+    
+    # The test processes use this server instead of starting their own
+    os.environ["START_SERVER"] = "false"
+    return managed
 
-def run_specific_test(test_path):
-    """Run a specific test file or test function."""
+def run_benchmarks():
+    """Run the benchmark suite (no coverage or HTML report, which would skew timings)."""
     return run_command([
         sys.executable, "-m", "pytest",
-        test_path,
+        "tests/bench",
+        "-m", "bench",
+        "-o", "addopts=",
+        "-p", "no:cov",
+        *results_args("bench"),
         "--tb=short",
         "-v"
-    ], f"Running specific test: {test_path}")
+    ], "Running benchmarks")
 
-def generate_test_report():
-    """Generate HTML test report."""
-    return run_command([
-        sys.executable, "-m", "pytest",
-        "--html=reports/test-report.html",
-        "--self-contained-html",
-        "--tb=short",
-        "-v"
-    ], "Generating HTML test report")
+def load_routes(value):
+    """Parse ``--load-routes``: comma-separated names from ``load_test.ROUTES``."""
+    from load_test import ROUTES
+    
+    routes = [route.strip() for route in value.split(",") if route.strip()]
+    unknown = [route for route in routes if route not in ROUTES]
+    if unknown or not routes:
+        raise argparse.ArgumentTypeError(
+            f"unknown route(s) {', '.join(unknown) or '(none given)'}; valid routes: {', '.join(ROUTES)}"
+        )
+    return routes
+
+def run_load_tests(args):
+    """Run the API load test against a running server."""
+    from load_test import run_load_test
+    
+    base_url = os.getenv("BASE_URL", "http://localhost:3000")
+    slos = {
+        "p50_ms": args.slo_p50,
+        "p90_ms": args.slo_p90,
+        "p99_ms": args.slo_p99,
+        "error_rate": args.slo_error_rate,
+        "throughput_rps": args.slo_min_rps,
+    }
+    
+    print(f"\n{'='*60}")
+    print(f"Running: API load test against {base_url}")
+    print(f"{'='*60}")
+    
+    passed = run_load_test(
+        base_url,
+        args.load_routes,
+        concurrency=args.load_concurrency,
+        rate=args.load_rate,
+        duration=args.load_duration,
+        max_requests=args.load_requests,
+        slos={key: value for key, value in slos.items() if value is not None},
+        report_path="reports/load-test.json",
+    )
+    
+    if passed:
+        print("\n✅ Load test met all SLOs!")
+    else:
+        print("\n❌ Load test violated SLOs")
+    return passed
 
 def main():
     parser = argparse.ArgumentParser(description="Test runner for portfolio website")
@@ -124,54 +321,81 @@ def main():
     parser.add_argument("--all", action="store_true", help="Run all tests")
     parser.add_argument("--coverage", action="store_true", help="Run tests with coverage")
     parser.add_argument("--parallel", action="store_true", help="Run tests in parallel")
-    parser.add_argument("--report", action="store_true", help="Generate HTML test report")
+    parser.add_argument("--concurrent", action="store_true", help="Run the selected groups as concurrent pytest processes")
+    parser.add_argument("--start-server", action="store_true", help="Build and start the app (next start) for this run")
+    parser.add_argument("--report", action="store_true", help="Generate HTML and Markdown test reports")
     parser.add_argument("--test", type=str, help="Run specific test file or function")
+    parser.add_argument("--bench", action="store_true", help="Run benchmarks (cold/new-connection/warm timings, reports/bench.json)")
+    
+    # Load testing
+    parser.add_argument("--load", action="store_true", help="Run API load test (needs a running server)")
+    parser.add_argument("--load-routes", type=load_routes, default="news", help="Comma-separated routes to load: news, contact (default: news)")
+    parser.add_argument("--load-concurrency", type=int, default=10, help="Concurrent connections per route")
+    parser.add_argument("--load-rate", type=float, default=0, help="Target requests/second per route (0 = as fast as possible)")
+    parser.add_argument("--load-duration", type=float, default=10, help="Seconds to load each route")
+    parser.add_argument("--load-requests", type=int, default=0, help="Stop after this many requests per route (0 = no limit)")
+    parser.add_argument("--slo-p50", type=float, help="Max p50 latency in ms")
+    parser.add_argument("--slo-p90", type=float, help="Max p90 latency in ms")
+    parser.add_argument("--slo-p99", type=float, default=2000, help="Max p99 latency in ms (default: 2000)")
+    parser.add_argument("--slo-error-rate", type=float, default=0.01, help="Max error rate (default: 0.01)")
+    parser.add_argument("--slo-min-rps", type=float, help="Min throughput in requests/second")
+    
+    # Performance baseline
+    parser.add_argument("--perf-gate", action="store_true", help="Fail timing tests that regress against the stored baseline")
+    parser.add_argument("--perf-history", type=int, help="Number of previous runs to compare timings against (default: 10)")
+    parser.add_argument("--perf-samples", type=int, help="Repeated measurements per timing test (default: 5)")
     
     args = parser.parse_args()
     
     # Create reports directory
     Path("reports").mkdir(exist_ok=True)
     
+    # Passed to every pytest run below through the environment
+    if args.perf_gate:
+        os.environ["PERF_GATE"] = "true"
+    if args.perf_history:
+        os.environ["PERF_HISTORY"] = str(args.perf_history)
+    if args.perf_samples:
+        os.environ["PERF_SAMPLES"] = str(args.perf_samples)
+    
     # Install dependencies if requested
     if args.install:
         if not install_dependencies():
             sys.exit(1)
     
-    # Run tests based on arguments
-    success = True
-    
-    if args.smoke:
-        success &= run_smoke_tests()
-    
-    if args.ui:
-        success &= run_ui_tests()
-    
-    if args.api:
-        success &= run_api_tests()
-    
-    if args.integration:
-        success &= run_integration_tests()
-    
-    if args.all:
-        success &= run_all_tests()
-    
-    if args.coverage:
-        success &= run_tests_with_coverage()
-    
-    if args.parallel:
-        success &= run_tests_parallel()
-    
-    if args.report:
-        success &= generate_test_report()
+    server = None
+    if args.start_server:
+        server = start_server()
+        if server is None:
+            sys.exit(1)
     
-    if args.test:
-        success &= run_specific_test(args.test)
+    try:
+        # Run tests based on arguments
+        success = True
+        
+        # Groups, coverage, report, parallel and --test compose into one run
+        test_options = [args.smoke, args.ui, args.api, args.integration, args.all,
+                        args.coverage, args.parallel, args.report, args.test]
+        other_modes = [args.bench, args.load]
+        if any(test_options) or not any(other_modes):
+            if not any(test_options):
+                print("No specific test type specified. Running all tests...")
+            Path(RUNNER_DIR).mkdir(parents=True, exist_ok=True)
+            if args.concurrent:
+                success &= run_tests_concurrently(args)
+            else:
+                success &= run_tests(args)
+        
+        if args.bench:
+            success &= run_benchmarks()
+        
+        if args.load:
+            success &= run_load_tests(args)
+    finally:
+        if server is not None:
+            server.stop()
     
-    # If no specific test type was specified, run all tests
-    if not any([args.smoke, args.ui, args.api, args.integration, args.all, 
-                args.coverage, args.parallel, args.report, args.test]):
-        print("No specific test type specified. Running all tests...")
-        success &= run_all_tests()
+    TIMINGS.print_summary()
     
     if success:
         print("\n🎉 All tests completed successfully!")
@@ -10,71 +10,132 @@ interface NewsArticle {
   description?: string;
 }
 
-async function scrapeLegalNews(): Promise<NewsArticle[]> {
-  const articles: NewsArticle[] = [];
-
-  // Law360 - Legal News
-  try {
-    const law360Response = await axios.get("https://www.law360.com/");
-    const $ = cheerio.load(law360Response.data);
-    $(".article-title")
-      .slice(0, 3)
-      .each((i, element) => {
-        const title = $(element).text().trim();
-        const url = $(element).find("a").attr("href");
-        if (title && url) {
-          articles.push({
-            title,
-            url: url.startsWith("http") ? url : `https://www.law360.com${url}`,
-            source: "Law360",
-            publishedAt: new Date().toISOString().split("T")[0],
-          });
-        }
-      });
-  } catch (error) {
-    console.error("Error scraping Law360:", error);
+// Tests point the scrapers at a local stub server by setting
+// NEWS_UPSTREAM_BASE (e.g. http://127.0.0.1:4010); each request then goes to
+// `${NEWS_UPSTREAM_BASE}/${host}${path}` instead of the real site.
+function upstreamUrl(url: string): string {
+  const base = process.env.NEWS_UPSTREAM_BASE;
+  if (!base) {
+    return url;
   }
+  const { host, pathname, search } = new URL(url);
+  return `${base.replace(/\/$/, "")}/${host}${pathname}${search}`;
+}
 
-  // ABC News - Technology
-  try {
-    const abcResponse = await axios.get("https://abcnews.go.com/Technology");
-    const $ = cheerio.load(abcResponse.data);
-    $(".ContentRoll__Headline")
-      .slice(0, 2)
-      .each((i, el) => {
-        const title = $(el).text().trim();
-        const url = $(el).find("a").attr("href");
-        if (title && url) {
-          articles.push({
-            title,
-            url: url.startsWith("http") ? url : `https://abcnews.go.com${url}`,
-            source: "ABC News",
-          });
-        }
-      });
-  } catch (e) {
-    console.error("Error scraping ABC News:", e);
-  }
+// Every upstream is requested at once, so a scrape takes as long as the
+// slowest site rather than all of them in turn; NEWS_UPSTREAM_TIMEOUT_MS
+// bounds how long one unresponsive site can hold the route up.
+const UPSTREAM_TIMEOUT_MS = Number(
+  process.env.NEWS_UPSTREAM_TIMEOUT_MS ?? 5000
+);
 
-  // Forbes - Technology
-  try {
-    const forbesResponse = await axios.get(
-      "https://www.forbes.com/technology/"
-    );
-    const $ = cheerio.load(forbesResponse.data);
-    const el = $("h3").first();
+async function scrapeSource(
+  url: string,
+  parse: ($: cheerio.CheerioAPI) => NewsArticle[]
+): Promise<NewsArticle[]> {
+  const response = await axios.get(upstreamUrl(url), {
+    timeout: UPSTREAM_TIMEOUT_MS,
+  });
+  return parse(cheerio.load(response.data));
+}
+
+// The first headline matching `selector`, as used by most of the tech sites
+function firstHeadline(
+  selector: string,
+  origin: string,
+  source: string
+): ($: cheerio.CheerioAPI) => NewsArticle[] {
+  return ($) => {
+    const el = $(selector).first();
     const title = el.text().trim();
     const url = el.find("a").attr("href");
-    if (title && url) {
-      articles.push({
+    if (!title || !url) {
+      return [];
+    }
+    return [
+      {
         title,
-        url: url.startsWith("http") ? url : `https://www.forbes.com${url}`,
-        source: "Forbes",
-      });
+        url: url.startsWith("http") ? url : `${origin}${url}`,
+        source,
+      },
+    ];
+  };
+}
+
+// Articles of every source that answered in time, in the order given
+async function scrapeSources(
+  sources: [string, string, ($: cheerio.CheerioAPI) => NewsArticle[]][]
+): Promise<NewsArticle[]> {
+  const results = await Promise.allSettled(
+    sources.map(([, url, parse]) => scrapeSource(url, parse))
+  );
+  return results.flatMap((result, i) => {
+    if (result.status === "rejected") {
+      console.error(`Error scraping ${sources[i][0]}:`, result.reason);
+      return [];
     }
-  } catch (e) {
-    console.error("Error scraping Forbes:", e);
-  }
+    return result.value;
+  });
+}
+
+async function scrapeLegalNews(): Promise<NewsArticle[]> {
+  const articles = await scrapeSources([
+    // Law360 - Legal News
+    [
+      "Law360",
+      "https://www.law360.com/",
+      ($) => {
+        const found: NewsArticle[] = [];
+        $(".article-title")
+          .slice(0, 3)
+          .each((i, element) => {
+            const title = $(element).text().trim();
+            const url = $(element).find("a").attr("href");
+            if (title && url) {
+              found.push({
+                title,
+                url: url.startsWith("http")
+                  ? url
+                  : `https://www.law360.com${url}`,
+                source: "Law360",
+                publishedAt: new Date().toISOString().split("T")[0],
+              });
+            }
+          });
+        return found;
+      },
+    ],
+    // ABC News - Technology
+    [
+      "ABC News",
+      "https://abcnews.go.com/Technology",
+      ($) => {
+        const found: NewsArticle[] = [];
+        $(".ContentRoll__Headline")
+          .slice(0, 2)
+          .each((i, el) => {
+            const title = $(el).text().trim();
+            const url = $(el).find("a").attr("href");
+            if (title && url) {
+              found.push({
+                title,
+                url: url.startsWith("http")
+                  ? url
+                  : `https://abcnews.go.com${url}`,
+                source: "ABC News",
+              });
+            }
+          });
+        return found;
+      },
+    ],
+    // Forbes - Technology
+    [
+      "Forbes",
+      "https://www.forbes.com/technology/",
+      firstHeadline("h3", "https://www.forbes.com", "Forbes"),
+    ],
+  ]);
 
   // Fallback articles if scraping fails
   if (articles.length === 0) {
@@ -125,149 +186,49 @@ async function scrapeTechNews(): Promise<NewsArticle[]> {
     }
   }
 
-  // Ars Technica
-  try {
-    const arsResponse = await axios.get("https://arstechnica.com/");
-    const $ = cheerio.load(arsResponse.data);
-    const el = $("h2").first();
-    const title = el.text().trim();
-    const url = el.find("a").attr("href");
-    if (title && url) {
-      addArticle({
-        title,
-        url: url.startsWith("http") ? url : `https://arstechnica.com${url}`,
-        source: "Ars Technica",
-      });
-    }
-  } catch (error) {
-    console.error("Error scraping Ars Technica:", error);
-  }
-
-  // The Verge
-  try {
-    const vergeResponse = await axios.get("https://www.theverge.com/");
-    const $ = cheerio.load(vergeResponse.data);
-    const el = $("h2").first();
-    const title = el.text().trim();
-    const url = el.find("a").attr("href");
-    if (title && url) {
-      addArticle({
-        title,
-        url: url.startsWith("http") ? url : `https://www.theverge.com${url}`,
-        source: "The Verge",
-      });
-    }
-  } catch (error) {
-    console.error("Error scraping The Verge:", error);
-  }
-
-  // Wired
-  try {
-    const wiredResponse = await axios.get("https://www.wired.com/");
-    const $ = cheerio.load(wiredResponse.data);
-    const el = $("h3").first();
-    const title = el.text().trim();
-    const url = el.find("a").attr("href");
-    if (title && url) {
-      addArticle({
-        title,
-        url: url.startsWith("http") ? url : `https://www.wired.com${url}`,
-        source: "Wired",
-      });
-    }
-  } catch (error) {
-    console.error("Error scraping Wired:", error);
-  }
-
-  // VentureBeat
-  try {
-    const vbResponse = await axios.get("https://venturebeat.com/");
-    const $ = cheerio.load(vbResponse.data);
-    const el = $("h2").first();
-    const title = el.text().trim();
-    const url = el.find("a").attr("href");
-    if (title && url) {
-      addArticle({
-        title,
-        url: url.startsWith("http") ? url : `https://venturebeat.com${url}`,
-        source: "VentureBeat",
-      });
-    }
-  } catch (error) {
-    console.error("Error scraping VentureBeat:", error);
-  }
-
-  // TechCrunch
-  try {
-    const techCrunchResponse = await axios.get("https://techcrunch.com/");
-    const $ = cheerio.load(techCrunchResponse.data);
-    const el = $("h2").first();
-    const title = el.text().trim();
-    const url = el.find("a").attr("href");
-    if (title && url) {
-      addArticle({
-        title,
-        url: url.startsWith("http") ? url : `https://techcrunch.com${url}`,
-        source: "TechCrunch",
-      });
-    }
-  } catch (error) {
-    console.error("Error scraping TechCrunch:", error);
-  }
-
-  // CNET
-  try {
-    const cnetResponse = await axios.get("https://www.cnet.com/");
-    const $ = cheerio.load(cnetResponse.data);
-    const el = $("h3").first();
-    const title = el.text().trim();
-    const url = el.find("a").attr("href");
-    if (title && url) {
-      addArticle({
-        title,
-        url: url.startsWith("http") ? url : `https://www.cnet.com${url}`,
-        source: "CNET",
-      });
-    }
-  } catch (error) {
-    console.error("Error scraping CNET:", error);
-  }
-
-  // Engadget
-  try {
-    const engadgetResponse = await axios.get("https://www.engadget.com/");
-    const $ = cheerio.load(engadgetResponse.data);
-    const el = $("h2").first();
-    const title = el.text().trim();
-    const url = el.find("a").attr("href");
-    if (title && url) {
-      addArticle({
-        title,
-        url: url.startsWith("http") ? url : `https://www.engadget.com${url}`,
-        source: "Engadget",
-      });
-    }
-  } catch (error) {
-    console.error("Error scraping Engadget:", error);
-  }
-
-  // Mashable
-  try {
-    const mashableResponse = await axios.get("https://mashable.com/tech");
-    const $ = cheerio.load(mashableResponse.data);
-    const el = $("h2").first();
-    const title = el.text().trim();
-    const url = el.find("a").attr("href");
-    if (title && url) {
-      addArticle({
-        title,
-        url: url.startsWith("http") ? url : `https://mashable.com${url}`,
-        source: "Mashable",
-      });
-    }
-  } catch (error) {
-    console.error("Error scraping Mashable:", error);
-  }
+  const scraped = await scrapeSources([
+    [
+      "Ars Technica",
+      "https://arstechnica.com/",
+      firstHeadline("h2", "https://arstechnica.com", "Ars Technica"),
+    ],
+    [
+      "The Verge",
+      "https://www.theverge.com/",
+      firstHeadline("h2", "https://www.theverge.com", "The Verge"),
+    ],
+    [
+      "Wired",
+      "https://www.wired.com/",
+      firstHeadline("h3", "https://www.wired.com", "Wired"),
+    ],
+    [
+      "VentureBeat",
+      "https://venturebeat.com/",
+      firstHeadline("h2", "https://venturebeat.com", "VentureBeat"),
+    ],
+    [
+      "TechCrunch",
+      "https://techcrunch.com/",
+      firstHeadline("h2", "https://techcrunch.com", "TechCrunch"),
+    ],
+    [
+      "CNET",
+      "https://www.cnet.com/",
+      firstHeadline("h3", "https://www.cnet.com", "CNET"),
+    ],
+    [
+      "Engadget",
+      "https://www.engadget.com/",
+      firstHeadline("h2", "https://www.engadget.com", "Engadget"),
+    ],
+    [
+      "Mashable",
+      "https://mashable.com/tech",
+      firstHeadline("h2", "https://mashable.com", "Mashable"),
+    ],
+  ]);
+  scraped.forEach(addArticle);
 
   // Fallback articles if scraping fails
   if (articles.length === 0) {
@@ -303,16 +264,66 @@ async function scrapeTechNews(): Promise<NewsArticle[]> {
   return articles.slice(0, 5);
 }
 
-export async function GET() {
+interface NewsPayload {
+  legal: NewsArticle[];
+  tech: NewsArticle[];
+}
+
+// Scraped articles are kept in memory for NEWS_CACHE_TTL_SECONDS, so repeated
+// requests within that window never reach the upstream sites. Requests that
+// arrive while a scrape is running wait for it instead of starting another.
+const CACHE_TTL_SECONDS = Number(process.env.NEWS_CACHE_TTL_SECONDS ?? 300);
+
+let cached: { payload: NewsPayload; expiresAt: number } | null = null;
+let inFlight: Promise<NewsPayload> | null = null;
+
+async function scrapeNews(): Promise<NewsPayload> {
+  const [legalNews, techNews] = await Promise.all([
+    scrapeLegalNews(),
+    scrapeTechNews(),
+  ]);
+  const payload = { legal: legalNews, tech: techNews };
+  cached = { payload, expiresAt: Date.now() + CACHE_TTL_SECONDS * 1000 };
+  return payload;
+}
+
+function refreshNews(): Promise<NewsPayload> {
+  if (!inFlight) {
+    inFlight = scrapeNews().finally(() => {
+      inFlight = null;
+    });
+  }
+  return inFlight;
+}
+
+// With the scrapers pointed at the stub upstream, tests can send
+// `x-news-cache: refresh` to force a fresh scrape; it is ignored otherwise.
+function refreshRequested(request: Request): boolean {
+  return (
+    Boolean(process.env.NEWS_UPSTREAM_BASE) &&
+    request.headers.get("x-news-cache") === "refresh"
+  );
+}
+
+export async function GET(request: Request) {
   try {
-    const [legalNews, techNews] = await Promise.all([
-      scrapeLegalNews(),
-      scrapeTechNews(),
-    ]);
+    let status = "HIT";
+    let payload: NewsPayload;
+    if (refreshRequested(request)) {
+      status = "REFRESH";
+      payload = await scrapeNews();
+    } else if (cached && cached.expiresAt > Date.now()) {
+      payload = cached.payload;
+    } else {
+      status = "MISS";
+      payload = await refreshNews();
+    }
 
-    return NextResponse.json({
-      legal: legalNews,
-      tech: techNews,
+    return NextResponse.json(payload, {
+      headers: {
+        "Cache-Control": `public, s-maxage=${CACHE_TTL_SECONDS}, stale-while-revalidate=${CACHE_TTL_SECONDS}`,
+        "x-news-cache": status,
+      },
     });
   } catch (error) {
     console.error("Error fetching news:", error);
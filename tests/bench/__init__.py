@@ -0,0 +1 @@
+# Benchmark suite (marker: bench)
@@ -0,0 +1,50 @@
+import os
+from urllib.parse import urljoin, urlparse
+
+import pytest
+import requests
+
+from tests.benchmark import DEFAULT_SAMPLES, PROPERTY, run_benchmark
+
+pytestmark = pytest.mark.bench
+
+SAMPLES = int(os.getenv("BENCH_SAMPLES", DEFAULT_SAMPLES))
+
+API_ROUTES = [
+    ("GET", "/api/news", None),
+    ("GET", "/api/health", None),
+    ("POST", "/api/contact", {
+        "name": "Benchmark",
+        "email": "bench@test.com",
+        "message": "Benchmark message.",
+    }),
+]
+
+
+def _bench(request, http, name, kind, method, url, json_body=None):
+    try:
+        result = run_benchmark(name, kind, method, url, http, samples=SAMPLES, json_body=json_body)
+    except requests.exceptions.RequestException as e:
+        pytest.skip(f"{url} not available: {e}")
+    if result["status"] in (405, 501):
+        pytest.skip(f"{method} {url} not implemented ({result['status']})")
+
+    request.node.user_properties.append((PROPERTY, result))
+    return result
+
+
+def test_bench_page(site_page, http, request):
+    """Benchmark a discovered page over new and kept-alive connections."""
+    path = urlparse(site_page).path or "/"
+    result = _bench(request, http, f"page {path}", "page", "GET", site_page)
+    assert result["status"] == 200, f"{path} returned {result['status']}"
+
+
+@pytest.mark.parametrize("method,path,body", [
+    pytest.param(method, path, body, id=path, marks=pytest.mark.requires_endpoint(path))
+    for method, path, body in API_ROUTES
+])
+def test_bench_api(base_url, http, request, method, path, body):
+    """Benchmark an API route over new and kept-alive connections."""
+    result = _bench(request, http, f"api {method} {path}", "api", method, urljoin(base_url, path), body)
+    assert result["status"] < 500, f"{method} {path} returned {result['status']}"
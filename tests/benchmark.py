@@ -0,0 +1,161 @@
+"""
+Benchmark helpers for the ``tests/bench`` suite.
+
+Each target (a page or an API route) gets three timings:
+
+- "cold": its first request after server start, taken from the managed
+  server's warm-up (``SERVER_METRICS``, see ``tests.server``); unknown when
+  the server was not started by the tests or the warm-up did not request it
+- "new connection": the median of a few requests over a brand-new connection
+  each (TCP setup included, server already warm)
+- "warm": N requests over a kept-alive connection
+
+Results travel to the controller through the test report's
+``user_properties`` so they survive xdist, and are written to
+``reports/bench.json`` together with a comparison table against the previous
+run.
+"""
+
+import json
+import math
+import os
+import time
+
+import requests
+
+from tests.perf_baseline import summarize
+from tests.server import METRICS_ENV
+
+DEFAULT_SAMPLES = 20
+NEW_CONNECTION_SAMPLES = 5
+PROPERTY = "bench"
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def load_cold_times():
+    """First-request times (ms) by URL recorded by the managed server's warm-up."""
+    path = os.getenv(METRICS_ENV)
+    if not path:
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f).get("cold_ms", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _timed(send):
+    start_time = time.perf_counter()
+    response = send()
+    return (time.perf_counter() - start_time) * 1000, response
+
+
+def run_benchmark(name, kind, method, url, http, samples=DEFAULT_SAMPLES, json_body=None, timeout=30):
+    """Measure one target over new and kept-alive connections; return a JSON-serializable result."""
+    # New connection: no pooled connection, no keep-alive
+    new_connection = []
+    for _ in range(NEW_CONNECTION_SAMPLES):
+        with requests.Session() as session:
+            elapsed_ms, response = _timed(lambda: session.request(
+                method, url, json=json_body, headers={"Connection": "close"}, timeout=timeout
+            ))
+        new_connection.append(elapsed_ms)
+    status = response.status_code
+
+    # Warm: the first request opens the pooled connection and is not timed
+    http.request(method, url, json=json_body, timeout=timeout)
+    warm = []
+    for _ in range(samples):
+        elapsed_ms, response = _timed(lambda: http.request(method, url, json=json_body, timeout=timeout))
+        warm.append(elapsed_ms)
+
+    summary = summarize(warm)
+    return {
+        "name": name,
+        "kind": kind,
+        "method": method,
+        "url": url,
+        "status": status,
+        "bytes": len(response.content),
+        "new_connection_ms": summarize(new_connection)["median"],
+        "warm": {
+            "n": summary["n"],
+            "median_ms": summary["median"],
+            "p90_ms": percentile(summary["samples"], 90),
+            "iqr_ms": summary["iqr"],
+            "min_ms": summary["min"],
+            "max_ms": summary["max"],
+        },
+    }
+
+
+class BenchReport:
+    """Collects benchmark results on the controller and writes/compares them."""
+
+    def __init__(self, path):
+        self.path = path
+        self.results = []
+        self.previous = self._load_previous()
+        self.cold = None
+
+    def _load_previous(self):
+        try:
+            with open(self.path) as f:
+                return {result["name"]: result for result in json.load(f)["results"]}
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def collect(self, report):
+        """Pick benchmark results out of a test report."""
+        for name, value in report.user_properties:
+            if name == PROPERTY:
+                # Read once the server is up: --start-server launches it after configure
+                if self.cold is None:
+                    self.cold = load_cold_times()
+                # The warm-up only sends GETs
+                value["cold_ms"] = self.cold.get(value["url"]) if value["method"] == "GET" else None
+                self.results.append(value)
+
+    def write(self):
+        if not self.results:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": sorted(self.results, key=lambda result: result["name"]),
+            }, f, indent=2)
+
+    def table(self):
+        """Rows comparing this run's warm medians with the previous run."""
+        header = f"{'target':<32} {'cold':>9} {'new conn':>9} {'p50 ms':>9} {'p90 ms':>9} {'iqr ms':>8} {'prev p50':>9} {'change':>8}"
+        rows = [header, "-" * len(header)]
+        for result in sorted(self.results, key=lambda result: result["name"]):
+            warm = result["warm"]
+            previous = self.previous.get(result["name"])
+            if previous:
+                before = previous["warm"]["median_ms"]
+                prev_text = f"{before:9.1f}"
+                change = f"{warm['median_ms'] / before - 1:+8.1%}" if before else f"{'-':>8}"
+            else:
+                prev_text, change = f"{'-':>9}", f"{'-':>8}"
+            cold = result.get("cold_ms")
+            cold_text = f"{cold:9.1f}" if cold is not None else f"{'-':>9}"
+            rows.append(
+                f"{result['name'][:32]:<32} {cold_text} {result['new_connection_ms']:9.1f} {warm['median_ms']:9.1f} "
+                f"{warm['p90_ms']:9.1f} {warm['iqr_ms']:8.1f} {prev_text} {change}"
+            )
+        return rows
+
+    def write_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.write_sep("-", "benchmarks")
+        for row in self.table():
+            terminalreporter.write_line(row)
+        terminalreporter.write_line(f"results written to {os.path.relpath(self.path)}")
@@ -0,0 +1,131 @@
+"""
+ChromeDriver resolution with a persistent, version-keyed cache.
+
+``ChromeDriverManager().install()`` looks up the latest matching driver over
+the network every time it is called. The resolved binary path is instead
+stored in a small JSON cache keyed by the installed Chrome version, shared by
+every xdist worker and every later run, so a warm cache never touches the
+network. Set ``CHROMEDRIVER_PATH`` to use a pre-installed chromedriver.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+
+from tests.locking import file_lock
+from tests.stats import STATS
+
+STATS_SECTION = "chromedriver"
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "portfolio-tests")
+
+CHROME_BINARIES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+_VERSION_RE = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
+
+_resolved = None
+
+
+def cache_dir():
+    return os.getenv("CHROMEDRIVER_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def detect_chrome_version():
+    """Return the installed Chrome version string, or ``None`` if not found."""
+    binaries = list(CHROME_BINARIES)
+    if os.getenv("CHROME_BINARY"):
+        binaries.insert(0, os.getenv("CHROME_BINARY"))
+
+    commands = [[binary, "--version"] for binary in binaries]
+    if sys.platform.startswith("win"):
+        commands.append(["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"])
+
+    for command in commands:
+        try:
+            output = subprocess.run(
+                command, capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _VERSION_RE.search(output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _read_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(path, cache):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _usable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _install():
+    """Download (or locate in webdriver-manager's own cache) a matching driver."""
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install()
+
+
+def resolve_chromedriver():
+    """Return the chromedriver binary path, resolving it at most once per process."""
+    global _resolved
+    if _resolved:
+        return _resolved
+
+    override = os.getenv("CHROMEDRIVER_PATH")
+    if override:
+        if not _usable(override):
+            raise FileNotFoundError(f"CHROMEDRIVER_PATH is not an executable file: {override}")
+        STATS.incr(STATS_SECTION, "env override")
+        _resolved = override
+        return _resolved
+
+    key = detect_chrome_version()
+    if key is None:
+        # Nothing to tell a stale entry from a matching one after a Chrome
+        # upgrade, so let webdriver-manager resolve it and cache nothing
+        STATS.incr(STATS_SECTION, "uncached installs (Chrome version unknown)")
+        _resolved = _install()
+        return _resolved
+
+    cache_path = os.path.join(cache_dir(), "chromedriver.json")
+
+    path = _read_cache(cache_path).get(key)
+    if not _usable(path):
+        # Only one worker installs; the others wait and pick up its result
+        with file_lock(cache_path + ".lock"):
+            cache = _read_cache(cache_path)
+            path = cache.get(key)
+            if not _usable(path):
+                path = _install()
+                cache[key] = path
+                _write_cache(cache_path, cache)
+                STATS.incr(STATS_SECTION, "driver installs")
+            else:
+                STATS.incr(STATS_SECTION, "cache hits")
+    else:
+        STATS.incr(STATS_SECTION, "cache hits")
+
+    _resolved = path
+    return _resolved
@@ -1,10 +1,11 @@
 import pytest
 import os
 import sys
+import requests
+from urllib.parse import urljoin, urlparse
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -12,9 +13,51 @@ from selenium.webdriver.support import expected_conditions as EC
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from tests.benchmark import BenchReport
+from tests.chromedriver_cache import resolve_chromedriver
+from tests.crawler import discover_pages
+from tests.dom_cache import DomCache
+from tests.driver_pool import DriverPool
+from tests.http_caching import check_caching
+from tests.http_client import HttpClient
+from tests.image_audit import ImageAuditor
+from tests.link_checker import check_site
+from tests.locking import LockTimeout, file_lock
+from tests.network_log import LOG_TYPE, NetworkLog, enable_network_logging, network_capture_enabled
+from tests.page_cache import PageCache, SharedPageCache
+from tests.page_weight import PageWeightAnalyzer
+from tests.perf_baseline import DEFAULT_HISTORY, DEFAULT_SAMPLES, PerfBaseline, PerfRecorder
+from tests.reachability import MODES as UNREACHABLE_MODES, EndpointMap, probe
+from tests.result_stream import ResultStream, write_html, write_markdown
+from tests.route_cache import REFRESH_HEADERS
+from tests.scheduling import (
+    DEFAULT_BROWSER_WORKERS, WorkerUtilization, assign_groups, configure_node, configure_scheduling,
+    mark_shared_state, remove_shared_pages, shared_pages_dir,
+)
+from tests.server import ServerError, find_free_port, launch_server
+from tests.stats import STATS
+from tests.stub_upstream import DEFAULT_PORT, StubUpstreamClient, StubUpstreamServer
+from tests.viewports import ViewportMatrix, clear_emulation, load_viewports
+from tests.web_vitals import PageMetricsRecorder, load_budgets
+
 # Test configuration
 BASE_URL = "http://localhost:3000"  # Default Next.js development server
 TIMEOUT = 10  # Default timeout for web elements
+CONTENT_PAGES = ["/", "/projects", "/news"]  # Fallback when the site cannot be crawled
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports")
+
+# Benchmark results, gathered on the controller (None on xdist workers)
+_bench_report = None
+
+# Streamed test results, written on the controller (None on xdist workers)
+_result_stream = None
+
+# Per-worker busy time, gathered on the xdist controller (None otherwise)
+_utilization = None
+
+_managed_server_key = pytest.StashKey()
+_reachability_key = pytest.StashKey()
+_endpoints_key = pytest.StashKey()
 
 @pytest.fixture(scope="session")
 def base_url():
@@ -26,9 +69,188 @@ def timeout():
     """Default timeout for web elements."""
     return int(os.getenv("TIMEOUT", TIMEOUT))
 
+@pytest.fixture(scope="session")
+def http(timeout):
+    """Pooled keep-alive HTTP client shared by all requests-based tests."""
+    client = HttpClient(
+        timeout=timeout,
+        retries=int(os.getenv("HTTP_RETRIES", 2)),
+        backoff=float(os.getenv("HTTP_BACKOFF", 0.3)),
+        pool_size=int(os.getenv("HTTP_POOL_SIZE", 10)),
+    )
+    yield client
+    client.close()
+
+@pytest.fixture(scope="session")
+def perf_baseline(request):
+    """Historical timing store shared by all timing tests (one run id per test session)."""
+    config = request.config
+    workerinput = getattr(config, "workerinput", None)
+    return PerfBaseline(
+        os.getenv("PERF_BASELINE", os.path.join(REPORTS_DIR, "perf-baseline.sqlite")),
+        run_id=workerinput["testrunuid"] if workerinput else None,
+        history=config.getoption("perf_history"),
+    )
+
 @pytest.fixture(scope="function")
-def driver():
-    """Selenium WebDriver fixture with Chrome browser."""
+def perf(perf_baseline, request):
+    """Repeated timing measurements recorded and compared against the baseline."""
+    gate = request.config.getoption("perf_gate") or os.getenv("PERF_GATE", "false").lower() == "true"
+    return PerfRecorder(
+        perf_baseline,
+        request.node,
+        samples=int(os.getenv("PERF_SAMPLES", DEFAULT_SAMPLES)),
+        gate=gate,
+    )
+
+@pytest.fixture(scope="session")
+def pages(http, request):
+    """Session-wide page cache: each URL is fetched once and shared by all tests.
+    
+    Under xdist the snapshots are also shared between workers, so a page is
+    fetched once per run rather than once per worker.
+    """
+    directory = shared_pages_dir(request.config)
+    if directory is not None:
+        return SharedPageCache(http.get, directory)
+    return PageCache(http.get)
+
+@pytest.fixture(scope="session")
+def dom():
+    """Session-wide cache of parsed (read-only) documents, one parse per page."""
+    return DomCache()
+
+_discovered_pages_key = pytest.StashKey()
+
+def discovered_pages(config):
+    """Pages found by crawling the site, computed once per process.
+
+    Runs at collection time (the content tests are parametrized over the
+    result), so it cannot use fixtures. The crawl is cached in pytest's cache
+    directory and guarded by a lock so xdist workers collect the same pages.
+    """
+    if _discovered_pages_key in config.stash:
+        return config.stash[_discovered_pages_key]
+    
+    base_url = os.getenv("BASE_URL", BASE_URL)
+    cache = getattr(config, "cache", None)
+    http = HttpClient(timeout=int(os.getenv("TIMEOUT", TIMEOUT)), retries=0)
+    options = dict(
+        max_pages=int(os.getenv("CRAWL_MAX_PAGES", 50)),
+        max_depth=int(os.getenv("CRAWL_MAX_DEPTH", 3)),
+        concurrency=int(os.getenv("CRAWL_CONCURRENCY", 8)),
+        refresh=os.getenv("CRAWL_REFRESH", "false").lower() == "true",
+    )
+    try:
+        if cache is not None:
+            with file_lock(os.path.join(str(cache.mkdir("portfolio")), "crawl.lock")):
+                pages = discover_pages(base_url, http, cache=cache, **options)
+        else:
+            pages = discover_pages(base_url, http, **options)
+    finally:
+        http.close()
+    
+    # Site not reachable: fall back to the known pages so tests still collect (and skip)
+    if not pages:
+        pages = [urljoin(base_url, page) for page in CONTENT_PAGES]
+    
+    config.stash[_discovered_pages_key] = pages
+    return pages
+
+def pytest_generate_tests(metafunc):
+    """Parametrize tests taking ``site_page`` over every discovered page."""
+    if "site_page" in metafunc.fixturenames:
+        pages = discovered_pages(metafunc.config)
+        metafunc.parametrize("site_page", pages, ids=[urlparse(url).path for url in pages])
+
+@pytest.fixture(scope="session")
+def content_pages(request):
+    """Absolute URLs of all pages discovered on the site."""
+    return discovered_pages(request.config)
+
+@pytest.fixture(scope="session")
+def link_report(base_url, content_pages, pages, dom, http):
+    """Every internal link and image asset on the content pages, checked concurrently once."""
+    try:
+        report = check_site(
+            http, pages, dom, content_pages, base_url,
+            concurrency=int(os.getenv("LINK_CHECK_CONCURRENCY", 8)),
+        )
+    except requests.exceptions.RequestException as e:
+        pytest.skip(f"Content pages not available: {e}")
+    report.write(os.path.join(REPORTS_DIR, "link-check.json"))
+    return report
+
+@pytest.fixture(scope="session")
+def caching_report(base_url, content_pages, pages, dom, http):
+    """Caching/compression conformance of every page, asset and API route, checked once."""
+    try:
+        report = check_caching(
+            http, pages, dom, content_pages, base_url,
+            concurrency=int(os.getenv("LINK_CHECK_CONCURRENCY", 8)),
+        )
+    except requests.exceptions.RequestException as e:
+        pytest.skip(f"Content pages not available: {e}")
+    report.write(os.path.join(REPORTS_DIR, "http-caching.json"), os.path.join(REPORTS_DIR, "http-caching.txt"))
+    return report
+
+@pytest.fixture(scope="session")
+def page_weight(http, base_url):
+    """Asset sizes per page against the ``page_weight`` budgets (each asset fetched once)."""
+    return PageWeightAnalyzer(
+        http, load_budgets("page_weight"), base_url,
+        concurrency=int(os.getenv("LINK_CHECK_CONCURRENCY", 8)),
+        report_path=os.path.join(REPORTS_DIR, "page-weight.json"),
+    )
+
+@pytest.fixture(scope="session")
+def image_auditor(http, base_url):
+    """Rendered-vs-intrinsic image audit against the ``image_audit`` budgets."""
+    return ImageAuditor(
+        http, base_url, load_budgets("image_audit"),
+        report_path=os.path.join(REPORTS_DIR, "image-audit.json"),
+    )
+
+@pytest.fixture(scope="session")
+def stub_upstream():
+    """Client for the stub news upstream, starting a local stub if none is running.
+    
+    The app under test must be started with NEWS_UPSTREAM_BASE pointing at
+    the stub (default http://127.0.0.1:4010) for /api/news to use it.
+    """
+    url = os.getenv("STUB_UPSTREAM_URL")
+    server = None
+    if not url:
+        port = int(os.getenv("STUB_UPSTREAM_PORT", DEFAULT_PORT))
+        try:
+            server = StubUpstreamServer(port=port).start()
+            url = server.url
+        except OSError:
+            # Port taken: another worker (or the test runner) already runs the stub
+            url = f"http://127.0.0.1:{port}"
+    
+    client = StubUpstreamClient(url)
+    client.reset()
+    yield client
+    
+    if server is not None:
+        server.stop()
+
+@pytest.fixture(scope="function")
+def news_stub(stub_upstream, base_url, http):
+    """Stub upstream, reset for this test; skips unless /api/news is wired to it."""
+    stub_upstream.reset()
+    try:
+        http.get(urljoin(base_url, "/api/news"), headers=REFRESH_HEADERS)
+    except requests.exceptions.RequestException as e:
+        pytest.skip(f"News API endpoint not available: {e}")
+    if not stub_upstream.total_hits():
+        pytest.skip(f"/api/news is not using the stub; start the app with NEWS_UPSTREAM_BASE={stub_upstream.url}")
+    stub_upstream.reset()
+    return stub_upstream
+
+def _chrome_options():
+    """Chrome options shared by every pooled browser."""
     chrome_options = Options()
     
     # Headless mode for CI/CD environments
@@ -43,22 +265,82 @@ def driver():
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-plugins")
     
-    # Fix for macOS ARM64
-    chrome_options.add_argument("--remote-debugging-port=9222")
+    # Fix for macOS ARM64; a free port per launch, since one process can
+    # run several browsers (driver pool, viewport matrix) besides other workers
+    chrome_options.add_argument(f"--remote-debugging-port={find_free_port()}")
     
+    # CDP network events for the `network` fixture
+    if network_capture_enabled():
+        enable_network_logging(chrome_options)
+    
+    return chrome_options
+
+def _launch_chrome():
+    """Start a new Chrome browser with the proper ChromeDriver."""
+    service = Service(resolve_chromedriver())
+    driver = webdriver.Chrome(service=service, options=_chrome_options())
+    # Tests wait explicitly (tests/waits.py); an implicit wait only slows down
+    # every lookup that is expected to find nothing
+    driver.implicitly_wait(float(os.getenv("IMPLICIT_WAIT", "0")))
+    return driver
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    """Pool of browsers reused across tests (one per test process)."""
+    drain_logs = (LOG_TYPE,) if network_capture_enabled() else ()
+    pool = DriverPool(
+        _launch_chrome, window_size=(1920, 1080), drain_logs=drain_logs, cleanup=(clear_emulation,)
+    )
+    yield pool
+    pool.close()
+
+@pytest.fixture(scope="function")
+def driver(driver_pool):
+    """Selenium WebDriver fixture with Chrome browser, reset after each test."""
     try:
-        # Initialize WebDriver with proper ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.implicitly_wait(10)
-        
-        yield driver
-        
-        # Cleanup
-        driver.quit()
+        driver = driver_pool.acquire()
     except Exception as e:
         # If ChromeDriver fails, skip UI tests
         pytest.skip(f"ChromeDriver not available: {e}")
+    
+    yield driver
+    
+    driver_pool.release(driver)
+
+@pytest.fixture(scope="function")
+def page_metrics(driver, request):
+    """Captures Navigation Timing / Web Vitals for the current page and checks budgets."""
+    return PageMetricsRecorder(driver, request.node, load_budgets("web_vitals"))
+
+@pytest.fixture(scope="function")
+def network(driver, request):
+    """Request log for the current test (needs CAPTURE_NETWORK=true to record requests)."""
+    log = NetworkLog(driver, enabled=network_capture_enabled()).start()
+    yield log
+    log.attach(request.node)
+
+@pytest.fixture(scope="function")
+def viewport_matrix(driver, driver_pool, request):
+    """Device-profile matrix (VIEWPORTS) checked with CDP emulation in VIEWPORT_BROWSERS browsers."""
+    requested = int(os.getenv("VIEWPORT_BROWSERS", 1))
+    drivers = [driver]
+    for _ in range(requested - 1):
+        try:
+            drivers.append(driver_pool.acquire())
+        except Exception as e:
+            # The matrix still runs, sequentially in fewer browsers; say so
+            STATS.incr("viewport matrix", "browsers not acquired", requested - len(drivers))
+            request.node.user_properties.append(("viewport_browsers", {
+                "requested": requested, "acquired": len(drivers), "error": str(e),
+            }))
+            break
+    
+    yield ViewportMatrix(
+        drivers, load_viewports(), request.node, report_path=os.path.join(REPORTS_DIR, "viewports.json")
+    )
+    
+    for extra in drivers[1:]:
+        driver_pool.release(extra)
 
 @pytest.fixture(scope="function")
 def wait(driver):
@@ -88,8 +370,55 @@ def test_data():
         ]
     }
 
+def pytest_addoption(parser):
+    """Options for the managed server and the performance baseline."""
+    group = parser.getgroup("next server")
+    group.addoption(
+        "--start-server", action="store_true",
+        default=os.getenv("START_SERVER", "false").lower() == "true",
+        help="Build and start the app with `next start` on a free port for this session",
+    )
+    
+    group = parser.getgroup("reachability")
+    group.addoption(
+        "--unreachable", choices=UNREACHABLE_MODES, default=os.getenv("UNREACHABLE", "skip"),
+        help="What to do with network tests when BASE_URL does not answer: skip (default) or fail",
+    )
+    
+    group = parser.getgroup("xdist scheduling")
+    group.addoption(
+        "--browser-workers", type=int,
+        default=int(os.getenv("BROWSER_WORKERS", DEFAULT_BROWSER_WORKERS)),
+        help="Run browser tests on at most this many xdist workers (default: 2; 0 = plain load scheduling)",
+    )
+    
+    group = parser.getgroup("result stream")
+    group.addoption(
+        "--results-jsonl", default=os.getenv("RESULTS_JSONL", os.path.join(REPORTS_DIR, "results.jsonl")),
+        help="Write one JSON line per test to this file as tests finish (empty to disable)",
+    )
+    group.addoption(
+        "--results-html", default=os.getenv("RESULTS_HTML"),
+        help="Render an HTML report from the result stream after the session",
+    )
+    group.addoption(
+        "--results-md", default=os.getenv("RESULTS_MD"),
+        help="Render a Markdown report from the result stream after the session",
+    )
+    
+    group = parser.getgroup("performance baseline")
+    group.addoption(
+        "--perf-gate", action="store_true", default=False,
+        help="Fail timing tests that regress significantly against the stored baseline",
+    )
+    group.addoption(
+        "--perf-history", type=int, default=int(os.getenv("PERF_HISTORY", DEFAULT_HISTORY)),
+        help="Number of previous runs to compare timings against (default: 10)",
+    )
+
 def pytest_configure(config):
     """Configure pytest with custom markers."""
+    global _bench_report, _result_stream, _utilization
     config.addinivalue_line(
         "markers", "slow: marks tests as slow (deselect with '-m \"not slow\"')"
     )
@@ -108,13 +437,166 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "regression: marks tests as regression tests"
     )
+    config.addinivalue_line(
+        "markers", "requires_endpoint(*paths): skip unless the app serves these routes (checked once per session)"
+    )
+    config.addinivalue_line(
+        "markers", "bench: marks benchmarks (only run when selected with '-m bench' or tests/bench)"
+    )
+    config.addinivalue_line(
+        "markers", "stub_upstream: uses the shared stub news upstream (assigned automatically)"
+    )
+    
+    # Benchmark results are gathered from test reports on the controller
+    if not hasattr(config, "workerinput"):
+        _bench_report = BenchReport(os.path.join(REPORTS_DIR, "bench.json"))
+    
+    # Results are written by the controller, from every worker's reports
+    if config.getoption("results_jsonl") and not hasattr(config, "workerinput"):
+        _result_stream = ResultStream(config.getoption("results_jsonl"))
+    
+    # Browser tests on a few workers, HTTP tests spread over all of them
+    configure_scheduling(config)
+    if config.getoption("dist", "no") != "no" and not hasattr(config, "workerinput"):
+        _utilization = WorkerUtilization()
+    
+    # Started once on the controller; xdist workers inherit BASE_URL
+    if config.getoption("start_server") and not hasattr(config, "workerinput"):
+        try:
+            config.stash[_managed_server_key] = launch_server()
+        except (ServerError, LockTimeout) as e:
+            raise pytest.UsageError(f"Could not start the app for --start-server: {e}")
+
+def pytest_unconfigure(config):
+    """Stop the server started by --start-server."""
+    endpoints = config.stash.get(_endpoints_key, None)
+    if endpoints is not None:
+        endpoints.http.close()
+    server = config.stash.get(_managed_server_key, None)
+    if server is not None:
+        server.stop()
+
+def _endpoint_map(session):
+    """Route availability, prefetched for every requires_endpoint marker at first use."""
+    config = session.config
+    if _endpoints_key not in config.stash:
+        endpoints = EndpointMap(
+            os.getenv("BASE_URL", BASE_URL), HttpClient(timeout=int(os.getenv("TIMEOUT", TIMEOUT)), retries=0)
+        )
+        endpoints.prefetch(
+            path for item in session.items
+            for marker in item.iter_markers("requires_endpoint") for path in marker.args
+        )
+        config.stash[_endpoints_key] = endpoints
+    return config.stash[_endpoints_key]
+
+@pytest.fixture(scope="session")
+def endpoints(request):
+    """Which routes the app serves: ``endpoints.available("/api/news")``."""
+    return _endpoint_map(request.session)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Short-circuit network tests when the app is down or lacks a route they need."""
+    if "base_url" not in item.fixturenames:
+        return
+    config = item.config
+    
+    # One probe per test process instead of a timeout per test
+    if _reachability_key not in config.stash:
+        config.stash[_reachability_key] = probe(
+            os.getenv("BASE_URL", BASE_URL), timeout=float(os.getenv("PROBE_TIMEOUT", 3))
+        )
+    reachability = config.stash[_reachability_key]
+    if not reachability.ok:
+        STATS.incr("reachability", "tests short-circuited")
+        if config.getoption("unreachable") == "fail":
+            pytest.fail(reachability.reason(), pytrace=False)
+        pytest.skip(reachability.reason())
+    
+    paths = [path for marker in item.iter_markers("requires_endpoint") for path in marker.args]
+    if paths:
+        missing = _endpoint_map(item.session).missing(paths)
+        if missing:
+            STATS.incr("reachability", "tests skipped for missing endpoints")
+            pytest.skip(f"Endpoint not implemented: {', '.join(missing)}")
 
+@pytest.hookimpl(tryfirst=True)
 def pytest_collection_modifyitems(config, items):
-    """Modify test collection to add markers based on test names."""
+    """Modify test collection to add markers based on test module names.
+    
+    Runs first so xdist sees the groups assigned here (it appends them to
+    the node ids in its own hook).
+    """
     for item in items:
-        if "test_ui_" in item.name:
+        module = item.path.name
+        if module.startswith("test_ui_"):
             item.add_marker(pytest.mark.ui)
-        elif "test_api_" in item.name:
+        elif module.startswith("test_api_"):
             item.add_marker(pytest.mark.api)
-        elif "test_integration_" in item.name:
-            item.add_marker(pytest.mark.integration) 
\ No newline at end of file
+        elif module.startswith("test_integration_"):
+            item.add_marker(pytest.mark.integration)
+    
+    mark_shared_state(items)
+    assign_groups(config, items)
+    
+    # Benchmarks are slow and noisy; keep them out of normal runs
+    if "bench" in (config.getoption("markexpr") or "") or any("bench" in arg for arg in config.args):
+        return
+    deselected = [item for item in items if item.get_closest_marker("bench")]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if not item.get_closest_marker("bench")]
+
+def pytest_runtest_logreport(report):
+    """Collect benchmark results, streamed results and worker busy time (on the controller, also from xdist workers)."""
+    if report.when == "call" and _bench_report is not None:
+        _bench_report.collect(report)
+    if _result_stream is not None:
+        _result_stream.collect(report)
+    if _utilization is not None:
+        _utilization.collect(report)
+
+def pytest_sessionfinish(session, exitstatus):
+    """Send this worker's counters to the xdist controller."""
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["stats"] = STATS.as_dict()
+    
+    if _bench_report is not None:
+        _bench_report.write()
+    
+    # Reports are rendered from the finished stream, not from results in memory
+    if _result_stream is not None:
+        _result_stream.close()
+        config = session.config
+        if config.getoption("results_html"):
+            write_html(_result_stream.path, config.getoption("results_html"))
+        if config.getoption("results_md"):
+            write_markdown(_result_stream.path, config.getoption("results_md"))
+    
+    remove_shared_pages(session.config)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Pass the scheduling mode on to a starting xdist worker."""
+    configure_node(node)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge the counters reported by a finished xdist worker."""
+    stats = getattr(node, "workeroutput", {}).get("stats")
+    if stats:
+        STATS.merge(stats)
+        if _utilization is not None:
+            _utilization.add_worker_stats(node.gateway.id, stats)
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report fixture statistics (browser launches, reuse, ...) at session end."""
+    STATS.write_summary(terminalreporter)
+    
+    if _bench_report is not None:
+        _bench_report.write_summary(terminalreporter)
+    
+    if _utilization is not None:
+        _utilization.write_summary(terminalreporter)
@@ -0,0 +1,203 @@
+"""
+Same-origin page discovery for the content tests.
+
+Crawls the site breadth-first from the home page and any sitemap (including
+the ones listed in robots.txt), respecting robots.txt, depth and page limits,
+and deduplicating pages by their canonical URL. Each BFS level is fetched
+concurrently.
+
+The result is cached on disk together with a fingerprint of the home page
+and sitemap; when those are unchanged on the next run the cached page list
+is reused instead of crawling again.
+"""
+
+import hashlib
+import time
+import xml.etree.ElementTree as ElementTree
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+from bs4 import BeautifulSoup
+
+from tests.link_checker import run_bounded
+from tests.stats import STATS
+
+STATS_SECTION = "crawler"
+
+CACHE_KEY = "portfolio/crawl"
+
+# Links to these are assets, not pages; don't download them while crawling
+SKIP_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".avif", ".ico",
+    ".css", ".js", ".json", ".xml", ".txt", ".zip", ".mp4", ".woff", ".woff2",
+)
+SKIP_PREFIXES = ("/api/", "/_next/")
+
+
+def normalize_page_url(url):
+    """Canonical form used for deduplication: no fragment, no trailing slash."""
+    url = urldefrag(url)[0]
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/") or "/"
+    return parsed._replace(path=path, params="").geturl()
+
+
+class Crawler:
+    """Breadth-first crawler limited to the origin of ``base_url``."""
+
+    def __init__(self, base_url, http, max_pages=50, max_depth=3, concurrency=8, user_agent="*"):
+        self.base_url = base_url
+        self.origin = urlparse(base_url).netloc
+        self.http = http
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.user_agent = user_agent
+        self.robots = RobotFileParser()
+
+    def _same_origin(self, url):
+        return urlparse(url).netloc == self.origin
+
+    def _crawlable(self, url):
+        path = urlparse(url).path
+        if not self._same_origin(url):
+            return False
+        if path.startswith(SKIP_PREFIXES) or path.lower().endswith(SKIP_EXTENSIONS):
+            return False
+        return self.robots.can_fetch(self.user_agent, url)
+
+    def _get_text(self, url):
+        try:
+            response = self.http.get(url)
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        return response.text
+
+    def load_robots(self):
+        """Parse robots.txt (a missing file allows everything); return its sitemaps."""
+        robots_txt = self._get_text(urljoin(self.base_url, "/robots.txt")) or ""
+        self.robots.parse(robots_txt.splitlines())
+        return list(self.robots.site_maps() or [])
+
+    def sitemap_urls(self, sitemaps, limit=20):
+        """Page URLs listed in the given sitemaps, following sitemap indexes."""
+        urls = []
+        queue = list(sitemaps)
+        seen = set()
+        while queue and len(seen) < limit:
+            sitemap = queue.pop(0)
+            if sitemap in seen:
+                continue
+            seen.add(sitemap)
+            body = self._get_text(sitemap)
+            if not body:
+                continue
+            try:
+                root = ElementTree.fromstring(body.encode())
+            except ElementTree.ParseError:
+                continue
+            locs = [el.text.strip() for el in root.iter() if el.tag.endswith("loc") and el.text]
+            if root.tag.endswith("sitemapindex"):
+                queue.extend(locs)
+            else:
+                urls.extend(locs)
+        return urls
+
+    def fingerprint(self, sitemaps):
+        """Hash of the home page and sitemap bodies, used to validate the disk cache."""
+        digest = hashlib.sha1()
+        for url in [urljoin(self.base_url, "/")] + sorted(sitemaps):
+            body = self._get_text(url)
+            digest.update((body or "").encode())
+        return digest.hexdigest()
+
+    def _fetch_page(self, url):
+        """Return (final URL, canonical URL, links) or None for non-HTML/error pages."""
+        STATS.incr(STATS_SECTION, "pages fetched")
+        try:
+            response = self.http.get(url)
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code != 200 or "html" not in response.headers.get("content-type", ""):
+            return None
+
+        soup = BeautifulSoup(response.content, "lxml")
+        canonical = response.url
+        link = soup.find("link", rel="canonical")
+        if link and link.get("href"):
+            candidate = urljoin(response.url, link["href"])
+            if self._same_origin(candidate):
+                canonical = candidate
+
+        links = [urljoin(response.url, a["href"]) for a in soup.find_all("a", href=True)]
+        return normalize_page_url(response.url), normalize_page_url(canonical), links
+
+    def crawl(self, seeds):
+        """Breadth-first discovery from ``seeds``; returns canonical page URLs in BFS order."""
+        pages = []
+        canonical_seen = set()
+        queued = set()
+        level = []
+        for seed in seeds:
+            url = normalize_page_url(seed)
+            if url not in queued and self._crawlable(url):
+                queued.add(url)
+                level.append(url)
+
+        depth = 0
+        while level and depth <= self.max_depth and len(pages) < self.max_pages:
+            results = run_bounded(self._fetch_page, level, self.concurrency)
+            next_level = []
+            for result in results:
+                if result is None:
+                    continue
+                final_url, canonical, links = result
+                queued.add(final_url)
+                if canonical in canonical_seen:
+                    continue
+                canonical_seen.add(canonical)
+                if len(pages) < self.max_pages:
+                    pages.append(canonical)
+
+                for link in links:
+                    url = normalize_page_url(link)
+                    if url not in queued and self._crawlable(url):
+                        queued.add(url)
+                        next_level.append(url)
+            level = next_level
+            depth += 1
+
+        return pages
+
+
+def discover_pages(base_url, http, cache=None, refresh=False, **crawler_options):
+    """Return the site's pages, reusing the cached crawl when the site is unchanged.
+
+    ``cache`` is a pytest ``config.cache`` (or ``None`` to disable caching).
+    """
+    crawler = Crawler(base_url, http, **crawler_options)
+    sitemaps = crawler.load_robots() or [urljoin(base_url, "/sitemap.xml")]
+    fingerprint = crawler.fingerprint(sitemaps)
+
+    entries = cache.get(CACHE_KEY, {}) if cache is not None else {}
+    entry = entries.get(base_url)
+    if not refresh and entry and entry.get("fingerprint") == fingerprint:
+        STATS.incr(STATS_SECTION, "cached crawls reused")
+        return entry["pages"]
+
+    start_time = time.perf_counter()
+    seeds = [urljoin(base_url, "/")] + [
+        url for url in crawler.sitemap_urls(sitemaps) if crawler._same_origin(url)
+    ]
+    pages = crawler.crawl(seeds)
+    STATS.incr(STATS_SECTION, "crawls")
+    STATS.incr(STATS_SECTION, "pages discovered", len(pages))
+    STATS.incr(STATS_SECTION, "crawl time (s)", time.perf_counter() - start_time)
+
+    if cache is not None and pages:
+        entries[base_url] = {"fingerprint": fingerprint, "pages": pages, "crawled_at": time.time()}
+        cache.set(CACHE_KEY, entries)
+    return pages
@@ -0,0 +1,145 @@
+"""
+Parsed-document cache shared by the content tests.
+
+Each page body is parsed by BeautifulSoup (with the ``lxml`` parser) once per
+session, keyed by URL and content hash. Tests receive a read-only view of the
+tree: navigation and searching work as usual, but anything that would modify
+the shared tree raises ``TypeError``.
+"""
+
+import hashlib
+import time
+from types import MappingProxyType
+
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, Tag
+
+from tests.stats import STATS
+
+STATS_SECTION = "dom cache"
+
+PARSER = "lxml"
+
+# Tag/BeautifulSoup methods that modify the tree in place
+_MUTATORS = frozenset([
+    "append", "extend", "insert", "insert_before", "insert_after",
+    "clear", "decompose", "extract", "replace_with", "replaceWith",
+    "replace_with_children", "replaceWithChildren", "unwrap", "wrap",
+    "smooth", "new_tag", "new_string", "reset", "feed", "setup",
+])
+
+
+def _freeze(value):
+    """Wrap anything handed out by the tree so it cannot be used to modify it."""
+    if isinstance(value, Tag):
+        return ReadOnlyNode(value)
+    if isinstance(value, NavigableString):
+        return str(value)
+    if isinstance(value, list):
+        return [_freeze(item) for item in value]
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if hasattr(value, "__next__"):
+        return (_freeze(item) for item in value)
+    return value
+
+
+class ReadOnlyNode:
+    """Read-only proxy around a BeautifulSoup ``Tag``."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        object.__setattr__(self, "_node", node)
+
+    def __getattr__(self, name):
+        if name in _MUTATORS:
+            raise TypeError(f"Cached documents are read-only; '{name}' is not allowed")
+        value = getattr(self._node, name)
+        # Tags are callable (shorthand for find_all), so check for them first
+        if callable(value) and not isinstance(value, Tag):
+            def call(*args, **kwargs):
+                return _freeze(value(*args, **kwargs))
+            return call
+        return _freeze(value)
+
+    def __setattr__(self, name, value):
+        raise TypeError("Cached documents are read-only")
+
+    def __delattr__(self, name):
+        raise TypeError("Cached documents are read-only")
+
+    def __getitem__(self, key):
+        value = self._node[key]
+        return tuple(value) if isinstance(value, list) else value
+
+    def __setitem__(self, key, value):
+        raise TypeError("Cached documents are read-only")
+
+    def __delitem__(self, key):
+        raise TypeError("Cached documents are read-only")
+
+    def __call__(self, *args, **kwargs):
+        return _freeze(self._node(*args, **kwargs))
+
+    def __iter__(self):
+        return (_freeze(child) for child in self._node)
+
+    def __len__(self):
+        return len(self._node)
+
+    def __contains__(self, item):
+        return item in self._node
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, ReadOnlyNode):
+            other = other._node
+        return self._node == other
+
+    def __hash__(self):
+        return id(self._node)
+
+    def __str__(self):
+        return str(self._node)
+
+    def __repr__(self):
+        return repr(self._node)
+
+    def get(self, key, default=None):
+        value = self._node.get(key, default)
+        return tuple(value) if isinstance(value, list) else value
+
+    @property
+    def attrs(self):
+        return MappingProxyType({
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in self._node.attrs.items()
+        })
+
+
+class DomCache:
+    """Memoizes parsed documents by URL and content hash."""
+
+    def __init__(self, parser=PARSER):
+        self._parser = parser
+        self._documents = {}
+
+    def parse(self, page):
+        """Return a read-only parsed tree for a fetched page."""
+        key = (page.url, hashlib.sha1(page.content).hexdigest())
+        document = self._documents.get(key)
+        if document is not None:
+            STATS.incr(STATS_SECTION, "cache hits")
+            return document
+
+        start_time = time.perf_counter()
+        soup = BeautifulSoup(page.content, self._parser)
+        STATS.incr(STATS_SECTION, "documents parsed")
+        STATS.incr(STATS_SECTION, "parse time (s)", time.perf_counter() - start_time)
+
+        document = ReadOnlyNode(soup)
+        self._documents[key] = document
+        return document
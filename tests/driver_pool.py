@@ -0,0 +1,99 @@
+"""
+Pool of reusable Selenium WebDriver instances.
+
+Starting Chrome is by far the most expensive part of a UI test, so the
+browser is launched once per test process (one per xdist worker) and handed
+to each test after a cheap reset instead of being quit and relaunched.
+"""
+
+from tests.stats import STATS
+
+STATS_SECTION = "webdriver pool"
+
+
+class DriverPool:
+    """Hands out WebDriver instances and resets them between tests."""
+
+    def __init__(self, factory, window_size=(1920, 1080), drain_logs=(), cleanup=()):
+        self._factory = factory
+        self._window_size = window_size
+        self._drain_logs = drain_logs
+        self._cleanup = cleanup
+        self._idle = []
+        self._all = []
+        self._launch_error = None
+
+    def acquire(self):
+        """Return an idle browser, launching a new one only if none is free."""
+        if self._idle:
+            STATS.incr(STATS_SECTION, "browsers reused")
+            return self._idle.pop()
+
+        # Don't retry a launch that already failed; every UI test would pay for it
+        if self._launch_error is not None:
+            raise self._launch_error
+
+        try:
+            driver = self._factory()
+        except Exception as e:
+            self._launch_error = e
+            STATS.incr(STATS_SECTION, "launch failures")
+            raise
+
+        STATS.incr(STATS_SECTION, "browsers launched")
+        self._all.append(driver)
+        return driver
+
+    def release(self, driver):
+        """Reset a browser and return it to the pool, dropping it if the reset fails."""
+        try:
+            self.reset(driver)
+        except Exception:
+            STATS.incr(STATS_SECTION, "browsers discarded")
+            self._discard(driver)
+            return
+        self._idle.append(driver)
+
+    def reset(self, driver):
+        """Bring a browser back to a clean state for the next test."""
+        handles = driver.window_handles
+        main = handles[0]
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(main)
+
+        # Storage is per origin, so clear it before navigating away from the page
+        try:
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+        except Exception:
+            pass
+        driver.delete_all_cookies()
+
+        # Per-tab state set through CDP (device emulation, ...) survives navigation
+        for cleanup in self._cleanup:
+            cleanup(driver)
+        driver.get("about:blank")
+        driver.set_window_size(*self._window_size)
+
+        # Buffered browser logs would otherwise leak into the next test
+        for log_type in self._drain_logs:
+            driver.get_log(log_type)
+
+    def close(self):
+        """Quit every browser the pool has launched."""
+        for driver in list(self._all):
+            self._discard(driver)
+        self._idle = []
+
+    def _discard(self, driver):
+        if driver in self._all:
+            self._all.remove(driver)
+        if driver in self._idle:
+            self._idle.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,198 @@
+"""
+HTTP caching and compression conformance.
+
+Every page, the assets those pages load and the GET API routes are requested
+once and checked for what makes repeat visits cheap:
+
+- compression: text responses of 1 KB or more carry ``Content-Encoding``
+- validators: pages and public files send an ``ETag`` or ``Last-Modified``
+- revalidation: repeating the request with ``If-None-Match`` (or
+  ``If-Modified-Since``) returns ``304 Not Modified``
+- immutable: hashed ``/_next/static/`` files are ``immutable`` with a
+  max-age of at least a year
+
+The result is a per-URL compliance table (``reports/http-caching.txt``) and
+its JSON counterpart.
+"""
+
+import json
+import os
+import re
+from collections import OrderedDict
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from tests.link_checker import DEFAULT_CONCURRENCY, run_bounded
+from tests.page_weight import collect_assets, compressible_type
+from tests.stats import STATS
+
+STATS_SECTION = "http caching"
+
+API_ROUTES = ("/api/news",)
+KINDS = ("page", "static", "public", "api")
+CHECKS = ("compression", "validator", "revalidation", "immutable")
+
+ONE_YEAR = 31536000
+COMPRESS_MIN_BYTES = 1024
+
+PASS, FAIL, NOT_APPLICABLE = "pass", "FAIL", "-"
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def max_age(cache_control):
+    """The ``max-age`` of a Cache-Control header in seconds (None without one)."""
+    match = _MAX_AGE.search(cache_control or "")
+    return int(match.group(1)) if match else None
+
+
+def kind_of(url, page_urls):
+    path = urlparse(url).path
+    if path.startswith("/_next/static/"):
+        return "static"
+    if path.startswith("/api/"):
+        return "api"
+    if url in page_urls:
+        return "page"
+    return "public"
+
+
+class CachingResult:
+    """Headers of one URL and the outcome of each check."""
+
+    def __init__(self, url, kind):
+        self.url = url
+        self.kind = kind
+        self.status = None
+        self.headers = {}
+        self.revalidation_status = None
+        self.error = None
+        self.checks = OrderedDict((name, (NOT_APPLICABLE, "")) for name in CHECKS)
+
+    @property
+    def compliant(self):
+        return self.error is None and all(outcome != FAIL for outcome, _ in self.checks.values())
+
+    def failures(self):
+        if self.error is not None:
+            return [self.error]
+        return [f"{name}: {detail}" for name, (outcome, detail) in self.checks.items() if outcome == FAIL]
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "kind": self.kind,
+            "status": self.status,
+            "cache_control": self.headers.get("cache-control"),
+            "etag": self.headers.get("etag"),
+            "last_modified": self.headers.get("last-modified"),
+            "content_encoding": self.headers.get("content-encoding"),
+            "revalidation_status": self.revalidation_status,
+            "error": self.error,
+            "checks": {name: {"outcome": outcome, "detail": detail}
+                       for name, (outcome, detail) in self.checks.items()},
+            "compliant": self.compliant,
+        }
+
+
+def check_url(http, result):
+    """Request a URL (and revalidate it) and fill in every applicable check."""
+    try:
+        response = http.get(result.url)
+    except requests.exceptions.RequestException as e:
+        result.error = str(e)
+        return result
+    result.status = response.status_code
+    result.headers = {name.lower(): value for name, value in response.headers.items()}
+    if response.status_code != 200:
+        result.error = f"status {response.status_code}"
+        return result
+
+    headers = result.headers
+    content_type = headers.get("content-type", "")
+    if compressible_type(content_type) and len(response.content) >= COMPRESS_MIN_BYTES:
+        encoding = headers.get("content-encoding")
+        result.checks["compression"] = (
+            (PASS, encoding) if encoding not in (None, "", "identity")
+            else (FAIL, f"{len(response.content)} bytes of {content_type.split(';')[0]} sent uncompressed")
+        )
+
+    etag, last_modified = headers.get("etag"), headers.get("last-modified")
+    # Hashed static files never need revalidating; API routes may opt in
+    if result.kind in ("page", "public") or etag or last_modified:
+        if not (etag or last_modified):
+            result.checks["validator"] = (FAIL, "no ETag or Last-Modified")
+            result.checks["revalidation"] = (FAIL, "nothing to revalidate against")
+        else:
+            result.checks["validator"] = (PASS, "ETag" if etag else "Last-Modified")
+            conditional = {"If-None-Match": etag} if etag else {"If-Modified-Since": last_modified}
+            try:
+                revalidated = http.get(result.url, headers=conditional)
+                result.revalidation_status = revalidated.status_code
+                result.checks["revalidation"] = (
+                    (PASS, "304") if revalidated.status_code == 304
+                    else (FAIL, f"{next(iter(conditional))} answered {revalidated.status_code}, not 304")
+                )
+            except requests.exceptions.RequestException as e:
+                result.checks["revalidation"] = (FAIL, str(e))
+
+    if result.kind == "static":
+        cache_control = headers.get("cache-control", "")
+        age = max_age(cache_control)
+        immutable = "immutable" in cache_control and age is not None and age >= ONE_YEAR
+        result.checks["immutable"] = (
+            (PASS, cache_control) if immutable
+            else (FAIL, f"Cache-Control {cache_control or '(none)'!r}, want 'public, max-age={ONE_YEAR}, immutable'")
+        )
+    return result
+
+
+class CachingReport:
+    """Results for every checked URL, by kind."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def of_kind(self, kind):
+        return [result for result in self.results if result.kind == kind]
+
+    def non_compliant(self, kind=None):
+        return [r for r in self.results if not r.compliant and (kind is None or r.kind == kind)]
+
+    def table(self):
+        """Rows of the per-URL compliance table."""
+        header = f"{'url':<60} {'kind':<7}" + "".join(f" {name[:12]:>12}" for name in CHECKS)
+        rows = [header, "-" * len(header)]
+        for result in sorted(self.results, key=lambda r: (KINDS.index(r.kind), r.url)):
+            path = urlparse(result.url)._replace(scheme="", netloc="").geturl()
+            if result.error is not None:
+                cells = f" {'error: ' + result.error:>51}"
+            else:
+                cells = "".join(f" {outcome:>12}" for outcome, _ in result.checks.values())
+            rows.append(f"{path[:60]:<60} {result.kind:<7}{cells}")
+        return rows
+
+    def write(self, json_path, table_path):
+        os.makedirs(os.path.dirname(json_path), exist_ok=True)
+        with open(json_path, "w") as f:
+            json.dump([result.as_dict() for result in self.results], f, indent=2)
+        with open(table_path, "w") as f:
+            f.write("\n".join(self.table()) + "\n")
+
+
+def check_caching(http, pages, dom, page_urls, base_url, api_routes=API_ROUTES,
+                  concurrency=DEFAULT_CONCURRENCY):
+    """Check the pages, every asset they load and the API routes, concurrently."""
+    urls = OrderedDict.fromkeys(page_urls)
+    for page_url in page_urls:
+        soup = dom.parse(pages.get(page_url))
+        urls.update(OrderedDict.fromkeys(collect_assets(page_url, soup, base_url)))
+    urls.update(OrderedDict.fromkeys(urljoin(base_url, route) for route in api_routes))
+
+    results = [CachingResult(url, kind_of(url, page_urls)) for url in urls]
+    run_bounded(lambda result: check_url(http, result), results, concurrency)
+
+    STATS.incr(STATS_SECTION, "urls checked", len(results))
+    STATS.incr(STATS_SECTION, "non-compliant", sum(1 for r in results if not r.compliant))
+    return CachingReport(results)
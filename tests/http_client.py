@@ -0,0 +1,104 @@
+"""
+Pooled HTTP client shared by all requests-based tests.
+
+Wraps a single ``requests.Session`` so every test reuses keep-alive
+connections instead of opening a new TCP connection per call. The pool also
+counts how many requests were served on a new versus a reused connection.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from tests.stats import STATS
+
+STATS_SECTION = "http connections"
+
+
+class _CountingPoolMixin:
+    """Records whether each checked-out connection is new or already open."""
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        # Idle connections keep their socket; new or dropped ones have none yet
+        if getattr(conn, "sock", None) is not None:
+            STATS.incr(STATS_SECTION, "reused connections")
+        else:
+            STATS.incr(STATS_SECTION, "new connections")
+        return conn
+
+
+class CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report reuse statistics."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """Keep-alive HTTP client with retries and a default timeout."""
+
+    def __init__(self, timeout=10, retries=2, backoff=0.3, pool_size=10):
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            # A refused connection means the server is down; retrying only adds delay
+            connect=0,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = CountingHTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        self.session.hooks["response"].append(self._count_response)
+
+    def _count_response(self, response, *args, **kwargs):
+        STATS.incr(STATS_SECTION, "requests")
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def options(self, url, **kwargs):
+        return self.request("OPTIONS", url, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,319 @@
+"""
+Image optimization audit for rendered pages.
+
+For every ``<img>`` on a page (loaded in Selenium and scrolled through so lazy
+images load too) the audit compares the image's intrinsic pixel size with
+the size it is rendered at, checks whether it is served as WebP/AVIF (or
+could be, through Next's ``/_next/image`` optimizer), whether images below
+the fold are lazy-loaded and how long they may be cached. Each image gets an
+estimate of the bytes it wastes: what it costs now minus what the optimizer
+would send at the rendered size (or, when the optimizer is not available,
+the share of pixels nobody sees). Per-page totals are checked against the
+``image_audit`` section of ``tests/perf_budgets.json``.
+"""
+
+import json
+import time
+from urllib.parse import parse_qs, quote, urljoin, urlparse
+
+import requests
+from selenium.common.exceptions import TimeoutException
+
+from tests.http_caching import max_age
+from tests.link_checker import is_internal
+from tests.locking import file_lock
+from tests.stats import STATS
+from tests.waits import wait_for_document_ready, wait_for_images_loaded
+
+STATS_SECTION = "image audit"
+
+# What a current browser sends; the optimizer picks the format from it
+ACCEPT_IMAGES = "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"
+MODERN_FORMATS = ("image/avif", "image/webp")
+# Widths Next's optimizer accepts by default (imageSizes + deviceSizes)
+NEXT_IMAGE_WIDTHS = (16, 32, 48, 64, 96, 128, 256, 384, 640, 750, 828, 1080, 1200, 1920, 2048, 3840)
+
+_COLLECT_IMAGES = """
+return {
+    viewport_height: window.innerHeight,
+    device_pixel_ratio: window.devicePixelRatio,
+    images: Array.from(document.images).map((img, index) => {
+        const rect = img.getBoundingClientRect();
+        return {
+            index: index,
+            src: img.currentSrc || img.src,
+            natural_width: img.naturalWidth,
+            natural_height: img.naturalHeight,
+            rendered_width: rect.width,
+            rendered_height: rect.height,
+            top: rect.top + window.scrollY,
+            loading: img.getAttribute('loading'),
+            srcset: img.getAttribute('srcset'),
+            complete: img.complete,
+        };
+    }),
+};
+"""
+
+_SCROLL_THROUGH = """
+const done = arguments[arguments.length - 1];
+const step = window.innerHeight;
+let position = 0;
+(function next() {
+    position += step;
+    window.scrollTo(0, position);
+    if (position < document.documentElement.scrollHeight) {
+        requestAnimationFrame(next);
+    } else {
+        window.scrollTo(0, 0);
+        done();
+    }
+})();
+"""
+
+
+def optimizer_width(pixels):
+    """Smallest width the optimizer serves that covers ``pixels``."""
+    for width in NEXT_IMAGE_WIDTHS:
+        if width >= pixels:
+            return width
+    return NEXT_IMAGE_WIDTHS[-1]
+
+
+class ImageFetch:
+    """Bytes, format and caching of one image URL."""
+
+    def __init__(self, url, status=None, content_type="", size=0, cache_control="", error=None):
+        self.url = url
+        self.status = status
+        self.content_type = content_type
+        self.size = size
+        self.cache_control = cache_control
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None and self.status == 200
+
+    @property
+    def modern(self):
+        return self.content_type.split(";")[0].strip().lower() in MODERN_FORMATS
+
+
+def fetch_image(http, url):
+    try:
+        response = http.get(url, headers={"Accept": ACCEPT_IMAGES})
+    except requests.exceptions.RequestException as e:
+        return ImageFetch(url, error=str(e))
+    return ImageFetch(
+        url, response.status_code, response.headers.get("content-type", ""),
+        len(response.content), response.headers.get("cache-control", ""),
+    )
+
+
+class ImageRecord:
+    """One rendered ``<img>``: sizes, what it costs and what it could cost."""
+
+    def __init__(self, info, fold, dpr, fetched, optimized=None):
+        self.info = info
+        self.src = info["src"]
+        self.fold = fold
+        self.dpr = dpr
+        self.fetched = fetched
+        self.optimized = optimized
+
+    @property
+    def rendered(self):
+        return self.info["rendered_width"] > 0 and self.info["rendered_height"] > 0
+
+    @property
+    def needed_width(self):
+        """Pixels needed to fill the rendered box on this screen."""
+        return round(self.info["rendered_width"] * self.dpr)
+
+    @property
+    def below_fold(self):
+        return self.info["first_top"] >= self.fold
+
+    @property
+    def through_optimizer(self):
+        return urlparse(self.src).path.startswith("/_next/image")
+
+    @property
+    def wasted_bytes(self):
+        if not (self.rendered and self.fetched.ok):
+            return 0
+        if self.optimized is not None and self.optimized.ok:
+            return max(0, self.fetched.size - self.optimized.size)
+        natural = self.info["natural_width"] * self.info["natural_height"]
+        needed = self.needed_width * round(self.info["rendered_height"] * self.dpr)
+        if not natural or needed >= natural:
+            return 0
+        return round(self.fetched.size * (1 - needed / natural))
+
+    def issues(self, min_max_age=0):
+        issues = []
+        if self.rendered and self.info["natural_width"] > 2 * self.needed_width:
+            issues.append(
+                f"{self.info['natural_width']}px wide, rendered at {self.needed_width}px"
+            )
+        if self.fetched.ok and not self.fetched.modern:
+            if self.through_optimizer:
+                issues.append(f"optimizer served {self.fetched.content_type} despite Accept: avif/webp")
+            elif self.optimized is not None and self.optimized.ok:
+                issues.append(f"{self.fetched.content_type}; /_next/image would serve {self.optimized.content_type}")
+            else:
+                issues.append(f"{self.fetched.content_type}, no WebP/AVIF variant")
+        if self.below_fold and self.info["loading"] != "lazy":
+            issues.append("below the fold but not loading=lazy")
+        elif not self.below_fold and self.info["loading"] == "lazy":
+            issues.append("above the fold but loading=lazy (delays LCP)")
+        age = max_age(self.fetched.cache_control)
+        if self.fetched.ok and (age is None or age < min_max_age):
+            issues.append(f"Cache-Control {self.fetched.cache_control or '(none)'!r}")
+        return issues
+
+    def as_dict(self, min_max_age=0):
+        return {
+            "src": self.src,
+            "natural": [self.info["natural_width"], self.info["natural_height"]],
+            "rendered": [round(self.info["rendered_width"]), round(self.info["rendered_height"])],
+            "device_pixel_ratio": self.dpr,
+            "below_fold": self.below_fold,
+            "loading": self.info["loading"],
+            "content_type": self.fetched.content_type,
+            "bytes": self.fetched.size,
+            "cache_control": self.fetched.cache_control,
+            "optimized_url": self.optimized.url if self.optimized else None,
+            "optimized_bytes": self.optimized.size if self.optimized and self.optimized.ok else None,
+            "optimized_type": self.optimized.content_type if self.optimized and self.optimized.ok else None,
+            "wasted_bytes": self.wasted_bytes,
+            "issues": self.issues(min_max_age),
+        }
+
+
+class PageImageAudit:
+    """Every image on one page and their summed savings."""
+
+    def __init__(self, page_url, images, budgets):
+        self.page_url = page_url
+        self.images = images
+        self.budgets = budgets
+
+    @property
+    def wasted_bytes(self):
+        return sum(image.wasted_bytes for image in self.images)
+
+    @property
+    def total_bytes(self):
+        return sum(image.fetched.size for image in self.images if image.fetched.ok)
+
+    def over_budget(self):
+        limit = self.budgets.get("wasted_bytes_per_page")
+        return limit is not None and self.wasted_bytes > limit
+
+    def describe(self, limit=5):
+        """The images wasting the most bytes, for assertion messages."""
+        min_max_age = self.budgets.get("min_cache_max_age", 0)
+        worst = sorted(self.images, key=lambda image: image.wasted_bytes, reverse=True)[:limit]
+        return "; ".join(
+            f"{image.src} wastes {image.wasted_bytes} bytes "
+            f"({', '.join(image.issues(min_max_age)) or 'oversized'})"
+            for image in worst if image.wasted_bytes
+        )
+
+    def as_dict(self):
+        min_max_age = self.budgets.get("min_cache_max_age", 0)
+        return {
+            "page": self.page_url,
+            "images": [image.as_dict(min_max_age) for image in self.images],
+            "total_bytes": self.total_bytes,
+            "wasted_bytes": self.wasted_bytes,
+            "budget": self.budgets.get("wasted_bytes_per_page"),
+        }
+
+    def write(self, path):
+        """Merge this page into the JSON report (shared by all xdist workers)."""
+        with file_lock(path + ".lock"):
+            try:
+                with open(path) as f:
+                    pages = json.load(f)
+            except (OSError, ValueError):
+                pages = {}
+            pages[self.page_url] = self.as_dict()
+            with open(path, "w") as f:
+                json.dump(pages, f, indent=2)
+
+
+class ImageAuditor:
+    """Audits the images of pages loaded in a browser; each image URL is fetched once."""
+
+    def __init__(self, http, base_url, budgets, report_path=None, load_timeout=10):
+        self.http = http
+        self.base_url = base_url
+        self.budgets = budgets
+        self.report_path = report_path
+        self.load_timeout = load_timeout
+        self._fetched = {}
+
+    def _fetch(self, url):
+        if url not in self._fetched:
+            self._fetched[url] = fetch_image(self.http, url)
+            STATS.incr(STATS_SECTION, "images fetched")
+        return self._fetched[url]
+
+    def _optimizer_url(self, src, width):
+        """``/_next/image`` URL for an internal image at ``width`` (None if not applicable)."""
+        parsed = urlparse(src)
+        if parsed.path.startswith("/_next/image"):
+            # Already optimized: ask for the width it actually needs
+            original = parse_qs(parsed.query).get("url", [None])[0]
+        else:
+            original = parsed.path if is_internal(src, self.base_url) else None
+        if not original or original.lower().endswith(".svg"):
+            return None
+        return urljoin(self.base_url, f"/_next/image?url={quote(original, safe='')}&w={width}&q=75")
+
+    def _load(self, driver, url):
+        driver.get(url)
+        wait_for_document_ready(driver)
+        first = driver.execute_script(_COLLECT_IMAGES)
+        # Scroll once through the page so lazy images load, then wait for them
+        driver.execute_async_script(_SCROLL_THROUGH)
+        try:
+            wait_for_images_loaded(driver, timeout=self.load_timeout)
+        except TimeoutException:
+            STATS.incr(STATS_SECTION, "pages with images still loading")
+        loaded = driver.execute_script(_COLLECT_IMAGES)
+        # Fold position as the page first rendered; sizes after everything loaded
+        for info in loaded["images"]:
+            before = first["images"][info["index"]] if info["index"] < len(first["images"]) else info
+            info["first_top"] = before["top"]
+            info["loading"] = before["loading"]
+        return first["viewport_height"], loaded["device_pixel_ratio"], loaded["images"]
+
+    def audit(self, driver, url):
+        start_time = time.perf_counter()
+        fold, dpr, infos = self._load(driver, url)
+
+        images = []
+        for info in infos:
+            if not info["src"] or info["src"].startswith("data:"):
+                continue
+            fetched = self._fetch(info["src"])
+            optimized = None
+            if info["rendered_width"] > 0 and not fetched.modern:
+                optimizer_url = self._optimizer_url(
+                    info["src"], optimizer_width(round(info["rendered_width"] * dpr))
+                )
+                if optimizer_url and optimizer_url != info["src"]:
+                    optimized = self._fetch(optimizer_url)
+            images.append(ImageRecord(info, fold, dpr, fetched, optimized))
+
+        audit = PageImageAudit(url, images, self.budgets)
+        STATS.incr(STATS_SECTION, "images audited", len(images))
+        STATS.incr(STATS_SECTION, "wasted bytes", audit.wasted_bytes)
+        STATS.incr(STATS_SECTION, "audit time (s)", time.perf_counter() - start_time)
+        if self.report_path:
+            audit.write(self.report_path)
+        return audit
@@ -0,0 +1,166 @@
+"""
+Concurrent link and asset checker.
+
+Collects every internal link and every ``<img>``/``og:image`` asset from a set
+of pages, deduplicates them and checks them with bounded concurrency on an
+asyncio event loop. The shared (blocking) HTTP client runs in a thread pool,
+so a full-site check takes roughly as long as its slowest request.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import requests
+
+from tests.stats import STATS
+
+STATS_SECTION = "link check"
+
+DEFAULT_CONCURRENCY = 8
+
+
+class LinkResult:
+    """Outcome of checking a single URL."""
+
+    def __init__(self, url, kind):
+        self.url = url
+        self.kind = kind  # "link" or "asset"
+        self.referrers = set()
+        self.status = None
+        self.content_type = ""
+        self.elapsed = None
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and self.status < 400
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "kind": self.kind,
+            "status": self.status,
+            "content_type": self.content_type,
+            "elapsed": self.elapsed,
+            "error": self.error,
+            "referrers": sorted(self.referrers),
+        }
+
+
+class LinkReport:
+    """Results of a site-wide check, keyed by URL."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def links(self):
+        return [r for r in self.results.values() if r.kind == "link"]
+
+    def assets(self):
+        return [r for r in self.results.values() if r.kind == "asset"]
+
+    def get(self, url):
+        return self.results.get(normalize_url(url))
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump([r.as_dict() for r in self.results.values()], f, indent=2)
+
+
+def normalize_url(url):
+    """Drop fragments so ``/#about`` and ``/`` are checked once."""
+    return urldefrag(url)[0]
+
+
+def is_internal(url, base_url):
+    return urlparse(url).netloc == urlparse(base_url).netloc
+
+
+def collect_urls(page_url, soup, base_url):
+    """Return (internal links, image assets) referenced by a parsed page."""
+    links = set()
+    for link in soup.find_all("a", href=True):
+        href = link["href"]
+        if href.startswith(("#", "mailto:", "tel:", "javascript:")):
+            continue
+        url = normalize_url(urljoin(page_url, href))
+        if is_internal(url, base_url):
+            links.add(url)
+
+    assets = set()
+    for img in soup.find_all("img"):
+        src = img.get("src")
+        if src and (src.startswith("/") or src.startswith("http")):
+            assets.add(normalize_url(urljoin(page_url, src)))
+    og_image = soup.find("meta", attrs={"property": "og:image"})
+    if og_image and og_image.get("content"):
+        assets.add(normalize_url(urljoin(page_url, og_image.get("content"))))
+
+    return links, assets
+
+
+def _check(http, result):
+    """Blocking check of one URL; HEAD first, GET if HEAD is not supported."""
+    start_time = time.perf_counter()
+    try:
+        response = http.head(result.url, allow_redirects=False)
+        if response.status_code in (405, 501):
+            response = http.get(result.url, allow_redirects=False, stream=True)
+            response.close()
+        result.status = response.status_code
+        result.content_type = response.headers.get("content-type", "")
+    except requests.exceptions.RequestException as e:
+        result.error = str(e)
+    result.elapsed = time.perf_counter() - start_time
+    return result
+
+
+async def _gather_bounded(fn, items, concurrency):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def bounded(item):
+            async with semaphore:
+                return await loop.run_in_executor(executor, fn, item)
+
+        return await asyncio.gather(*(bounded(item) for item in items))
+
+
+def run_bounded(fn, items, concurrency=DEFAULT_CONCURRENCY):
+    """Call blocking ``fn`` on every item with at most ``concurrency`` in flight.
+
+    Results are returned in the order of ``items``.
+    """
+    return asyncio.run(_gather_bounded(fn, list(items), concurrency))
+
+
+def check_urls(http, results, concurrency=DEFAULT_CONCURRENCY):
+    """Check every ``LinkResult`` concurrently, filling in status and timing."""
+    start_time = time.perf_counter()
+    run_bounded(lambda result: _check(http, result), results, concurrency)
+
+    STATS.incr(STATS_SECTION, "urls checked", len(results))
+    STATS.incr(STATS_SECTION, "broken", sum(1 for r in results if not r.ok))
+    STATS.incr(STATS_SECTION, "wall time (s)", time.perf_counter() - start_time)
+    STATS.incr(STATS_SECTION, "summed request time (s)", sum(r.elapsed or 0 for r in results))
+
+
+def check_site(http, pages, dom, page_urls, base_url, concurrency=DEFAULT_CONCURRENCY):
+    """Collect and check every internal link and asset on the given pages."""
+    results = {}
+    for page_url in page_urls:
+        soup = dom.parse(pages.get(page_url))
+        links, assets = collect_urls(page_url, soup, base_url)
+        for kind, urls in (("link", links), ("asset", assets)):
+            for url in urls:
+                result = results.setdefault(url, LinkResult(url, kind))
+                result.referrers.add(page_url)
+
+    check_urls(http, results.values(), concurrency)
+    return LinkReport(results)
@@ -0,0 +1,51 @@
+"""
+Cross-process file lock used to coordinate xdist workers and parallel runs.
+
+Only relies on ``os.open(O_CREAT | O_EXCL)`` so it behaves the same on
+Linux, macOS and Windows without extra dependencies.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+
+class LockTimeout(Exception):
+    """Raised when a lock could not be acquired in time."""
+
+
+@contextmanager
+def file_lock(path, timeout=120, poll_interval=0.1, stale_after=600):
+    """Hold an exclusive lock represented by ``path`` for the duration of the block.
+
+    A lock file older than ``stale_after`` seconds is assumed to belong to a
+    crashed process and is removed.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale_after:
+                    os.remove(path)
+                    continue
+            except OSError:
+                # Lock released between the open and the stat; just retry
+                continue
+            if time.monotonic() > deadline:
+                raise LockTimeout(f"Timed out waiting for lock {path}")
+            time.sleep(poll_interval)
+
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
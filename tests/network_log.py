@@ -0,0 +1,201 @@
+"""
+Per-test network request log built from Chrome DevTools Protocol events.
+
+With ``CAPTURE_NETWORK=true`` Chrome is started with performance logging,
+which makes ChromeDriver buffer the browser's ``Network.*`` CDP events.
+``NetworkLog`` turns those events into one record per request (URL, status,
+bytes on the wire, timing, cache status) and can wait until no request is in
+flight, which is exact where the JavaScript heuristic in ``tests.waits`` can
+miss requests that started before it was installed.
+"""
+
+import json
+import os
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from tests import waits
+from tests.stats import STATS
+
+LOG_TYPE = "performance"
+STATS_SECTION = "network log"
+
+
+def network_capture_enabled():
+    return os.getenv("CAPTURE_NETWORK", "false").lower() == "true"
+
+
+def enable_network_logging(options):
+    """Ask ChromeDriver to record CDP network events for ``get_log("performance")``."""
+    options.set_capability("goog:loggingPrefs", {LOG_TYPE: "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    return options
+
+
+class RequestRecord:
+    """One network request as seen by the browser."""
+
+    def __init__(self, request_id, url, method, resource_type, started):
+        self.request_id = request_id
+        self.url = url
+        self.method = method
+        self.resource_type = resource_type
+        self.started = started
+        self.finished = None
+        self.status = None
+        self.mime_type = None
+        self.encoded_bytes = 0
+        self.from_cache = False
+        self.error = None
+
+    @property
+    def done(self):
+        return self.finished is not None
+
+    @property
+    def duration_ms(self):
+        if self.finished is None:
+            return None
+        return (self.finished - self.started) * 1000
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "method": self.method,
+            "resource_type": self.resource_type,
+            "status": self.status,
+            "mime_type": self.mime_type,
+            "encoded_bytes": self.encoded_bytes,
+            "duration_ms": self.duration_ms,
+            "from_cache": self.from_cache,
+            "error": self.error,
+        }
+
+
+class NetworkLog:
+    """Collects the requests a browser makes while a test runs."""
+
+    def __init__(self, driver, enabled=True):
+        self.driver = driver
+        self.enabled = enabled
+        self._records = {}
+        self._order = []
+        self._last_event = time.monotonic()
+
+    def start(self):
+        """Drop events buffered before the test began."""
+        if self.enabled:
+            self.driver.get_log(LOG_TYPE)
+        self._records = {}
+        self._order = []
+        self._last_event = time.monotonic()
+        return self
+
+    def poll(self):
+        """Read buffered CDP events and update the request records."""
+        if not self.enabled:
+            return
+        entries = self.driver.get_log(LOG_TYPE)
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            self._handle(message.get("method", ""), message.get("params", {}))
+        if entries:
+            self._last_event = time.monotonic()
+
+    def _handle(self, method, params):
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            request = params["request"]
+            if request_id in self._records and params.get("redirectResponse"):
+                # A redirect reuses the request id; close the hop and start a new record
+                self._records[request_id].status = params["redirectResponse"].get("status")
+                self._records[request_id].finished = params["timestamp"]
+            record = RequestRecord(
+                request_id, request["url"], request["method"], params.get("type"), params["timestamp"]
+            )
+            self._records[request_id] = record
+            self._order.append(record)
+            return
+
+        record = self._records.get(request_id)
+        if record is None:
+            return
+        if method == "Network.responseReceived":
+            response = params["response"]
+            record.status = response.get("status")
+            record.mime_type = response.get("mimeType")
+            record.from_cache = record.from_cache or bool(
+                response.get("fromDiskCache") or response.get("fromServiceWorker")
+                or response.get("fromPrefetchCache")
+            )
+        elif method == "Network.requestServedFromCache":
+            record.from_cache = True
+        elif method == "Network.loadingFinished":
+            record.encoded_bytes = params.get("encodedDataLength", 0)
+            record.finished = params["timestamp"]
+        elif method == "Network.loadingFailed":
+            record.error = params.get("errorText") or "failed"
+            record.finished = params["timestamp"]
+
+    def requests(self):
+        """Requests seen so far, in the order they were sent."""
+        self.poll()
+        return list(self._order)
+
+    def in_flight(self):
+        self.poll()
+        return [record for record in self._order if not record.done]
+
+    def duplicates(self):
+        """URLs fetched more than once from the network (cache hits don't count)."""
+        counts = {}
+        for record in self.requests():
+            if record.method == "GET" and not record.from_cache and not record.url.startswith("data:"):
+                counts[record.url] = counts.get(record.url, 0) + 1
+        return {url: count for url, count in counts.items() if count > 1}
+
+    def failed(self):
+        return [record for record in self.requests() if record.error or (record.status or 0) >= 400]
+
+    def wait_for_network_idle(self, quiet_period=0.5, timeout=waits.DEFAULT_TIMEOUT):
+        """Wait until no request is in flight and no CDP event arrived for ``quiet_period``."""
+        if not self.enabled:
+            return waits.wait_for_network_idle(self.driver, quiet_period=quiet_period, timeout=timeout)
+
+        def idle(_):
+            pending = self.in_flight()
+            return not pending and time.monotonic() - self._last_event >= quiet_period
+
+        return WebDriverWait(self.driver, timeout, poll_frequency=waits.POLL_INTERVAL).until(
+            idle, "Network did not become idle"
+        )
+
+    def summary(self):
+        records = self.requests()
+        slowest = sorted(
+            (r for r in records if r.duration_ms is not None), key=lambda r: r.duration_ms, reverse=True
+        )
+        return {
+            "requests": len(records),
+            "from_cache": sum(1 for r in records if r.from_cache),
+            "failed": len(self.failed()),
+            "encoded_bytes": sum(r.encoded_bytes for r in records),
+            "duplicates": self.duplicates(),
+            "slowest": [r.as_dict() for r in slowest[:5]],
+        }
+
+    def attach(self, node):
+        """Add the request log to a test's report and the session statistics."""
+        if not self.enabled:
+            return
+        records = self.requests()
+        summary = self.summary()
+        node.user_properties.append(("network", {
+            "summary": summary,
+            "requests": [record.as_dict() for record in records],
+        }))
+        STATS.incr(STATS_SECTION, "requests captured", len(records))
+        STATS.incr(STATS_SECTION, "served from cache", summary["from_cache"])
+        STATS.incr(STATS_SECTION, "duplicate fetches", sum(count - 1 for count in summary["duplicates"].values()))
+        STATS.incr(STATS_SECTION, "bytes transferred", summary["encoded_bytes"])
@@ -0,0 +1,148 @@
+"""
+Session-wide cache of fetched pages.
+
+Most content and smoke tests inspect the same handful of pages, so each URL
+is fetched once and the snapshot (status, headers, body, timing) is shared.
+Tests that measure load time ask for a fresh fetch instead. Under xdist,
+``SharedPageCache`` also shares the snapshots between workers on disk.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from tests.locking import file_lock
+from tests.stats import STATS
+
+STATS_SECTION = "page cache"
+
+
+class CachedPage:
+    """Read-only snapshot of an HTTP response."""
+
+    def __init__(self, response, elapsed):
+        self.url = response.url
+        self.status_code = response.status_code
+        self.headers = CaseInsensitiveDict(response.headers)
+        self.content = response.content
+        self.text = response.text
+        self.encoding = response.encoding
+        # Wall-clock seconds for the whole request, body included
+        self.elapsed = elapsed
+
+    def json(self):
+        return json.loads(self.text)
+
+    def __repr__(self):
+        return f"<CachedPage {self.status_code} {self.url}>"
+
+
+class PageCache:
+    """Memoizes GET responses by URL, including connection failures."""
+
+    def __init__(self, fetch):
+        self._fetch = fetch
+        self._pages = {}
+
+    def get(self, url, fresh=False):
+        """Return the page for ``url``, fetching it only on the first call.
+
+        ``fresh=True`` always performs a new request (for timing tests) and
+        leaves the cached snapshot untouched.
+        """
+        if fresh:
+            STATS.incr(STATS_SECTION, "fresh fetches")
+            return self.fetch(url)
+
+        if url in self._pages:
+            STATS.incr(STATS_SECTION, "cache hits")
+            cached = self._pages[url]
+            if isinstance(cached, Exception):
+                raise cached
+            return cached
+
+        try:
+            page = self.fetch(url)
+        except requests.exceptions.RequestException as e:
+            # Remember failures too, so a down server costs one timeout, not one per test
+            self._pages[url] = e
+            raise
+        self._pages[url] = page
+        return page
+
+    def fetch(self, url):
+        """Perform an uncached GET and wrap the result."""
+        STATS.incr(STATS_SECTION, "requests made")
+        start_time = time.perf_counter()
+        response = self._fetch(url)
+        elapsed = time.perf_counter() - start_time
+        return CachedPage(response, elapsed)
+
+    def __contains__(self, url):
+        return url in self._pages
+
+    def __len__(self):
+        return len(self._pages)
+
+
+class SharedPageCache(PageCache):
+    """``PageCache`` whose snapshots are shared between processes through files.
+
+    The first worker to ask for a URL fetches it while holding a per-URL lock
+    and writes the snapshot; workers asking later wait for the lock and read
+    the file instead of making their own request.
+    """
+
+    def __init__(self, fetch, directory, lock_timeout=120):
+        super().__init__(fetch)
+        self.directory = directory
+        self.lock_timeout = lock_timeout
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode()).hexdigest() + ".pickle")
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _write(self, path, page):
+        if isinstance(page, Exception):
+            # Exceptions carry connection pools and the like; keep type and message
+            page = type(page)(str(page))
+        try:
+            data = pickle.dumps(page)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def get(self, url, fresh=False):
+        if fresh or url in self._pages:
+            return super().get(url, fresh=fresh)
+
+        path = self._path(url)
+        with file_lock(path + ".lock", timeout=self.lock_timeout):
+            cached = self._read(path)
+            if cached is None:
+                try:
+                    return super().get(url)
+                finally:
+                    if url in self._pages:
+                        self._write(path, self._pages[url])
+
+        STATS.incr(STATS_SECTION, "shared hits")
+        self._pages[url] = cached
+        if isinstance(cached, Exception):
+            raise cached
+        return cached
@@ -0,0 +1,332 @@
+"""
+Page weight analysis against per-asset-type budgets.
+
+For a page, every asset it loads is collected from its HTML (scripts,
+stylesheets, preloads, icons, images, and fonts and images referenced from
+the CSS) together with the files it links for download from ``public/``
+(PDFs, full-size images). Each asset is fetched once with the client's usual
+``Accept-Encoding`` to record its transfer size (bytes on the wire) next to
+its decoded size, and the totals per type are checked against the
+``page_weight`` section of ``tests/perf_budgets.json``. Text responses
+served without compression and images over budget are reported as well.
+
+Pages only reach the files they reference (and ``next/image`` serves
+resized copies), so every file in ``public/`` is also checked on its own
+against the per-asset budget of its type, referenced or not.
+"""
+
+import json
+import os
+import re
+from urllib.parse import quote, urljoin, urlparse
+
+import requests
+
+from tests.link_checker import DEFAULT_CONCURRENCY, is_internal, normalize_url, run_bounded
+from tests.locking import file_lock
+from tests.stats import STATS
+
+STATS_SECTION = "page weight"
+PUBLIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "public")
+
+# Asset kind by file extension; downloads are linked, not loaded with the page
+_EXTENSIONS = {
+    "script": (".js", ".mjs"),
+    "stylesheet": (".css",),
+    "font": (".woff2", ".woff", ".ttf", ".otf", ".eot"),
+    "image": (".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".svg", ".ico"),
+}
+DOWNLOAD_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".zip", ".doc", ".docx")
+
+# Content types worth compressing on the wire (woff2, images and PDFs already are)
+_COMPRESSIBLE_TYPES = (
+    "text/", "application/javascript", "application/json", "application/xml",
+    "image/svg+xml", "font/ttf", "font/otf", "application/x-font-ttf",
+)
+
+_CSS_URL = re.compile(r"url\(\s*['\"]?([^'\")]+)['\"]?\s*\)")
+
+
+def compressible_type(content_type):
+    """Whether a response of this content type should be sent compressed."""
+    return content_type.split(";")[0].strip().lower().startswith(_COMPRESSIBLE_TYPES)
+
+
+def kind_from_url(url, default="other"):
+    path = urlparse(url).path.lower()
+    if path.startswith("/_next/image"):
+        return "image"
+    for kind, extensions in _EXTENSIONS.items():
+        if path.endswith(extensions):
+            return kind
+    return default
+
+
+def collect_assets(page_url, soup, base_url):
+    """Return ``{url: kind}`` for the assets a parsed page loads or links for download."""
+    assets = {}
+
+    def add(url, kind):
+        if url and not url.startswith("data:"):
+            assets.setdefault(normalize_url(urljoin(page_url, url)), kind)
+
+    for script in soup.find_all("script", src=True):
+        add(script["src"], "script")
+    for link in soup.find_all("link", href=True):
+        rel = [value.lower() for value in link.get("rel", [])]
+        if "stylesheet" in rel:
+            add(link["href"], "stylesheet")
+        elif "preload" in rel or "modulepreload" in rel:
+            preload_as = link.get("as", "")
+            add(link["href"], {"style": "stylesheet", "script": "script", "font": "font",
+                               "image": "image"}.get(preload_as, kind_from_url(link["href"])))
+        elif "icon" in rel or "apple-touch-icon" in rel:
+            add(link["href"], "image")
+    for tag in soup.find_all(["img", "source", "video"]):
+        add(tag.get("src") or tag.get("poster"), "image")
+
+    for link in soup.find_all("a", href=True):
+        url = urljoin(page_url, link["href"])
+        if is_internal(url, base_url) and urlparse(url).path.lower().endswith(DOWNLOAD_EXTENSIONS):
+            add(url, "download")
+
+    # Only same-site assets are ours to budget
+    return {url: kind for url, kind in assets.items() if is_internal(url, base_url)}
+
+
+def public_assets(public_dir, base_url):
+    """Return ``{url: kind}`` for every file in ``public/`` that has a budgeted kind."""
+    assets = {}
+    for root, dirs, files in os.walk(public_dir):
+        for name in files:
+            path = os.path.relpath(os.path.join(root, name), public_dir).replace(os.sep, "/")
+            default = "download" if path.lower().endswith(DOWNLOAD_EXTENSIONS) else "other"
+            kind = kind_from_url(path, default)
+            if kind != "other":
+                assets[normalize_url(urljoin(base_url, "/" + quote(path)))] = kind
+    return assets
+
+
+class Asset:
+    """One fetched asset: transfer vs. decoded size and compression."""
+
+    def __init__(self, url, kind):
+        self.url = url
+        self.kind = kind
+        self.status = None
+        self.content_type = ""
+        self.encoding = None
+        self.transfer_bytes = None
+        self.decoded_bytes = None
+        self.error = None
+        self.body = None  # Kept for stylesheets only, to find their fonts and images
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and self.status < 400
+
+    @property
+    def compressed(self):
+        return self.encoding not in (None, "", "identity")
+
+    @property
+    def compressible(self):
+        return compressible_type(self.content_type) or self.kind in ("script", "stylesheet")
+
+    @property
+    def compression_ratio(self):
+        if not self.decoded_bytes:
+            return None
+        return self.transfer_bytes / self.decoded_bytes
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "kind": self.kind,
+            "status": self.status,
+            "content_type": self.content_type,
+            "encoding": self.encoding,
+            "transfer_bytes": self.transfer_bytes,
+            "decoded_bytes": self.decoded_bytes,
+            "compression_ratio": self.compression_ratio,
+            "error": self.error,
+        }
+
+
+def fetch_asset(http, asset):
+    """Download an asset, recording bytes on the wire and bytes after decoding."""
+    try:
+        response = http.get(asset.url, stream=True)
+        try:
+            body = response.content
+            # urllib3 counts the raw (still encoded) bytes it read from the socket
+            asset.transfer_bytes = response.raw.tell()
+        finally:
+            response.close()
+        asset.status = response.status_code
+        asset.content_type = response.headers.get("content-type", "")
+        asset.encoding = response.headers.get("content-encoding")
+        asset.decoded_bytes = len(body)
+        if asset.kind == "stylesheet":
+            asset.body = response.text
+    except requests.exceptions.RequestException as e:
+        asset.error = str(e)
+    if asset.kind == "other" and asset.content_type:
+        asset.kind = kind_from_content_type(asset.content_type)
+    return asset
+
+
+def kind_from_content_type(content_type):
+    content_type = content_type.lower()
+    for prefix, kind in (("image/", "image"), ("font/", "font"), ("text/css", "stylesheet"),
+                         ("javascript", "script")):
+        if prefix in content_type:
+            return kind
+    return "other"
+
+
+class PageWeightReport:
+    """Assets of one page, their totals per kind and any budget violations."""
+
+    def __init__(self, page_url, assets, budgets):
+        self.page_url = page_url
+        self.assets = assets
+        self.budgets = budgets
+
+    def totals(self):
+        """Transfer and decoded bytes per kind, plus an ``all`` row for the page load."""
+        totals = {}
+        for asset in self.assets:
+            if not asset.ok:
+                continue
+            for kind in (asset.kind, "all") if asset.kind != "download" else (asset.kind,):
+                row = totals.setdefault(kind, {"count": 0, "transfer_bytes": 0, "decoded_bytes": 0})
+                row["count"] += 1
+                row["transfer_bytes"] += asset.transfer_bytes
+                row["decoded_bytes"] += asset.decoded_bytes
+        return totals
+
+    def uncompressed(self):
+        """Compressible responses above the size threshold sent without Content-Encoding."""
+        min_bytes = self.budgets.get("compress_min_bytes", 1024)
+        return [
+            asset for asset in self.assets
+            if asset.ok and asset.compressible
+            and not asset.compressed and asset.decoded_bytes >= min_bytes
+        ]
+
+    def oversized(self):
+        """Assets whose transfer size exceeds the per-asset budget of their kind."""
+        per_asset = self.budgets.get("per_asset", {})
+        return [
+            asset for asset in self.assets
+            if asset.ok and asset.kind in per_asset
+            and asset.transfer_bytes > per_asset[asset.kind]
+        ]
+
+    def violations(self):
+        violations = [
+            f"{asset.url} ({asset.kind}) is {asset.transfer_bytes} bytes, "
+            f"budget {self.budgets['per_asset'][asset.kind]}"
+            for asset in self.oversized()
+        ]
+        for kind, limit in self.budgets.get("total", {}).items():
+            row = self.totals().get(kind)
+            if row and row["transfer_bytes"] > limit:
+                violations.append(f"{kind} total is {row['transfer_bytes']} bytes, budget {limit}")
+        violations += [
+            f"{asset.url} served uncompressed ({asset.decoded_bytes} bytes {asset.content_type or asset.kind})"
+            for asset in self.uncompressed()
+        ]
+        return violations
+
+    def as_dict(self):
+        return {
+            "page": self.page_url,
+            "totals": self.totals(),
+            "violations": self.violations(),
+            "assets": [asset.as_dict() for asset in self.assets],
+        }
+
+    def write(self, path):
+        """Merge this page into the JSON report (shared by all xdist workers)."""
+        with file_lock(path + ".lock"):
+            try:
+                with open(path) as f:
+                    pages = json.load(f)
+            except (OSError, ValueError):
+                pages = {}
+            pages[self.page_url] = self.as_dict()
+            with open(path, "w") as f:
+                json.dump(pages, f, indent=2)
+
+
+class PageWeightAnalyzer:
+    """Fetches page assets (each URL once per session) and builds ``PageWeightReport``s."""
+
+    def __init__(self, http, budgets, base_url, concurrency=DEFAULT_CONCURRENCY, report_path=None):
+        self.http = http
+        self.budgets = budgets
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.report_path = report_path
+        self._assets = {}
+
+    def _fetch_all(self, urls_and_kinds):
+        new = [Asset(url, kind) for url, kind in urls_and_kinds.items() if url not in self._assets]
+        if not new:
+            return
+        run_bounded(lambda asset: fetch_asset(self.http, asset), new, self.concurrency)
+        for asset in new:
+            self._assets[asset.url] = asset
+        STATS.incr(STATS_SECTION, "assets fetched", len(new))
+        STATS.incr(STATS_SECTION, "bytes transferred", sum(a.transfer_bytes or 0 for a in new))
+
+    def analyze(self, page, soup):
+        """Report for a fetched page (a ``CachedPage``) and its parsed document."""
+        urls = collect_assets(page.url, soup, self.base_url)
+        self._fetch_all(urls)
+
+        # Fonts and background images are only referenced from the stylesheets
+        referenced = {}
+        for url, kind in urls.items():
+            asset = self._assets[url]
+            if kind == "stylesheet" and asset.body:
+                for match in _CSS_URL.findall(asset.body):
+                    if match.startswith("data:"):
+                        continue
+                    css_url = normalize_url(urljoin(url, match))
+                    css_kind = kind_from_url(css_url)
+                    if css_kind in ("font", "image") and is_internal(css_url, self.base_url):
+                        referenced.setdefault(css_url, css_kind)
+        self._fetch_all(referenced)
+
+        document = Asset(page.url, "document")
+        document.status = page.status_code
+        document.content_type = page.headers.get("content-type", "")
+        document.encoding = page.headers.get("content-encoding")
+        document.decoded_bytes = len(page.content)
+        # A cached page no longer knows its wire size; Content-Length is it when present
+        document.transfer_bytes = int(page.headers.get("content-length") or document.decoded_bytes)
+
+        report = PageWeightReport(
+            page.url, [document] + [self._assets[url] for url in {**urls, **referenced}], self.budgets
+        )
+        STATS.incr(STATS_SECTION, "pages analyzed")
+        STATS.incr(STATS_SECTION, "budget violations", len(report.violations()))
+        if self.report_path:
+            report.write(self.report_path)
+        return report
+
+    def analyze_public(self, public_dir=PUBLIC_DIR):
+        """Report for every file in ``public/``, each against the per-asset budget of its type."""
+        urls = public_assets(public_dir, self.base_url)
+        self._fetch_all(urls)
+
+        # The files are not loaded together, so the per-page totals do not apply
+        budgets = {key: value for key, value in self.budgets.items() if key != "total"}
+        report = PageWeightReport("public/", [self._assets[url] for url in urls], budgets)
+        STATS.incr(STATS_SECTION, "public files checked", len(urls))
+        if self.report_path:
+            report.write(self.report_path)
+        return report
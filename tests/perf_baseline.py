@@ -0,0 +1,204 @@
+"""
+Historical performance baseline and regression gate.
+
+Timing tests measure each metric several times and record the median and
+interquartile range (IQR) in a SQLite file under ``reports/``. Each new
+measurement is compared with the same metric's results from the last N runs:
+it counts as a regression when its median exceeds the historical median by
+more than ``iqr_factor`` times the historical spread *and* by more than
+``min_relative`` of the baseline, so ordinary noise is not reported.
+With ``--perf-gate`` (or ``PERF_GATE=true``) a regression fails the test.
+"""
+
+import json
+import os
+import sqlite3
+import statistics
+import time
+import uuid
+
+from tests.stats import STATS
+
+STATS_SECTION = "performance baseline"
+
+DEFAULT_SAMPLES = 5
+DEFAULT_HISTORY = 10
+MIN_HISTORY = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    run_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    metric TEXT NOT NULL,
+    median REAL NOT NULL,
+    iqr REAL NOT NULL,
+    samples TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS measurements_metric ON measurements (metric, recorded_at);
+"""
+
+
+def summarize(samples):
+    """Median, quartiles and IQR of a list of samples."""
+    values = sorted(samples)
+    if len(values) >= 2:
+        q1, _, q3 = statistics.quantiles(values, n=4, method="inclusive")
+    else:
+        q1 = q3 = values[0]
+    return {
+        "samples": values,
+        "n": len(values),
+        "median": statistics.median(values),
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "min": values[0],
+        "max": values[-1],
+    }
+
+
+def measure(fn, samples=DEFAULT_SAMPLES):
+    """Time ``fn()`` ``samples`` times; return ``(summary, last result)``."""
+    timings = []
+    result = None
+    for _ in range(samples):
+        start_time = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start_time)
+    return summarize(timings), result
+
+
+class Comparison:
+    """Result of comparing one measurement with its history."""
+
+    def __init__(self, metric, current, history, iqr_factor, min_relative):
+        self.metric = metric
+        self.current = current
+        self.history = history
+        self.baseline = None
+        self.threshold = None
+
+        if len(history) >= MIN_HISTORY:
+            medians = [row["median"] for row in history]
+            self.baseline = statistics.median(medians)
+            q1, _, q3 = statistics.quantiles(medians, n=4, method="inclusive")
+            # Spread between runs, or within a run if runs happened to agree closely
+            spread = max(q3 - q1, statistics.median(row["iqr"] for row in history))
+            self.threshold = self.baseline + max(iqr_factor * spread, min_relative * self.baseline)
+
+    @property
+    def regressed(self):
+        return self.threshold is not None and self.current["median"] > self.threshold
+
+    @property
+    def change(self):
+        """Relative change of the median against the baseline (None without history)."""
+        if not self.baseline:
+            return None
+        return self.current["median"] / self.baseline - 1
+
+    def describe(self):
+        if self.baseline is None:
+            return f"{self.metric}: median {self.current['median']:.4f} (no baseline yet)"
+        return (
+            f"{self.metric}: median {self.current['median']:.4f} vs baseline {self.baseline:.4f} "
+            f"({self.change:+.1%}, threshold {self.threshold:.4f}, {len(self.history)} runs)"
+        )
+
+    def as_dict(self):
+        return {
+            "metric": self.metric,
+            "median": self.current["median"],
+            "iqr": self.current["iqr"],
+            "n": self.current["n"],
+            "baseline": self.baseline,
+            "threshold": self.threshold,
+            "history_runs": len(self.history),
+            "regressed": self.regressed,
+        }
+
+
+class PerfBaseline:
+    """SQLite-backed store of per-run metric medians."""
+
+    def __init__(self, path, run_id=None, history=DEFAULT_HISTORY, iqr_factor=3.0, min_relative=0.1):
+        self.path = path
+        self.run_id = run_id or uuid.uuid4().hex
+        self.history_size = history
+        self.iqr_factor = iqr_factor
+        self.min_relative = min_relative
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self):
+        # xdist workers write concurrently; wait for each other's transactions
+        return sqlite3.connect(self.path, timeout=30)
+
+    def history(self, metric):
+        """Most recent result of ``metric`` from each of the last N other runs."""
+        with self._connect() as db:
+            rows = db.execute(
+                """
+                SELECT median, iqr, MAX(recorded_at) AS latest FROM measurements
+                WHERE metric = ? AND run_id != ?
+                GROUP BY run_id
+                ORDER BY latest DESC
+                LIMIT ?
+                """,
+                (metric, self.run_id, self.history_size),
+            ).fetchall()
+        return [{"median": median, "iqr": iqr} for median, iqr, _ in rows]
+
+    def record(self, metric, summary):
+        """Compare ``summary`` with the history, then store it; return the ``Comparison``."""
+        comparison = Comparison(
+            metric, summary, self.history(metric), self.iqr_factor, self.min_relative
+        )
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO measurements (run_id, recorded_at, metric, median, iqr, samples) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.run_id, time.time(), metric, summary["median"], summary["iqr"],
+                 json.dumps(summary["samples"])),
+            )
+        return comparison
+
+
+class PerfRecorder:
+    """Per-test helper: measures, records against the baseline and applies the gate."""
+
+    def __init__(self, baseline, node, samples=DEFAULT_SAMPLES, gate=False):
+        self.baseline = baseline
+        self.node = node
+        self.samples = samples
+        self.gate = gate
+        self.comparisons = []
+
+    def measure(self, metric, fn, samples=None):
+        """Time ``fn()`` repeatedly and record it; return ``(summary, last result)``."""
+        summary, result = measure(fn, samples or self.samples)
+        self.record(metric, summary)
+        return summary, result
+
+    def record_samples(self, metric, samples):
+        """Record values measured by the test itself (e.g. browser timings)."""
+        summary = summarize(samples)
+        self.record(metric, summary)
+        return summary
+
+    def record(self, metric, summary):
+        comparison = self.baseline.record(metric, summary)
+        self.comparisons.append(comparison)
+        self.node.user_properties.append(("perf", comparison.as_dict()))
+        STATS.incr(STATS_SECTION, "metrics recorded")
+        if comparison.regressed:
+            STATS.incr(STATS_SECTION, "regressions")
+        return comparison
+
+    def check(self):
+        """Fail the test on regressions when the gate is on."""
+        regressions = [c.describe() for c in self.comparisons if c.regressed]
+        if regressions and self.gate:
+            raise AssertionError("Performance regression: " + "; ".join(regressions))
+        return regressions
@@ -0,0 +1,86 @@
+"""
+Up-front checks that the app under test is reachable and which routes exist.
+
+``probe`` makes one short request to ``BASE_URL``; when it fails, every
+network-dependent test is skipped (or failed) in setup instead of each one
+waiting for its own request to time out. ``EndpointMap`` checks the routes
+that tests declare with ``@pytest.mark.requires_endpoint("/api/...")`` in a
+single concurrent pass of HEAD requests, so tests for routes the app does not
+have are skipped without making a request.
+"""
+
+import time
+from urllib.parse import urljoin
+
+import requests
+
+from tests.link_checker import run_bounded
+from tests.stats import STATS
+
+STATS_SECTION = "reachability"
+MODES = ("skip", "fail")
+
+
+class Reachability:
+    """Outcome of probing the base URL."""
+
+    def __init__(self, base_url, status=None, error=None, elapsed=0.0):
+        self.base_url = base_url
+        self.status = status
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        # Any HTTP answer means the server is up; tests judge the status themselves
+        return self.error is None
+
+    def reason(self):
+        return f"{self.base_url} is not reachable ({self.error})"
+
+
+def probe(base_url, timeout=3):
+    """Make one short request to ``base_url``."""
+    start_time = time.perf_counter()
+    try:
+        response = requests.get(base_url, timeout=timeout, allow_redirects=False)
+        result = Reachability(base_url, status=response.status_code)
+    except requests.exceptions.RequestException as e:
+        result = Reachability(base_url, error=type(e).__name__)
+    result.elapsed = time.perf_counter() - start_time
+    STATS.incr(STATS_SECTION, "probe time (s)", result.elapsed)
+    return result
+
+
+class EndpointMap:
+    """Which paths the app serves (anything but a 404 counts), checked once each."""
+
+    def __init__(self, base_url, http, concurrency=8):
+        self.base_url = base_url
+        self.http = http
+        self.concurrency = concurrency
+        self.statuses = {}
+
+    def _status(self, path):
+        try:
+            return self.http.head(urljoin(self.base_url, path)).status_code
+        except requests.exceptions.RequestException:
+            return None
+
+    def prefetch(self, paths):
+        """Check every path not seen yet, concurrently."""
+        unknown = sorted(set(paths) - set(self.statuses))
+        if not unknown:
+            return
+        statuses = run_bounded(self._status, unknown, self.concurrency)
+        self.statuses.update(zip(unknown, statuses))
+        STATS.incr(STATS_SECTION, "endpoints checked", len(unknown))
+        STATS.incr(STATS_SECTION, "endpoints missing", sum(1 for s in statuses if s in (404, None)))
+
+    def available(self, path):
+        self.prefetch([path])
+        return self.statuses[path] not in (404, None)
+
+    def missing(self, paths):
+        self.prefetch(paths)
+        return [path for path in paths if not self.available(path)]
@@ -0,0 +1,263 @@
+"""
+Streaming test results.
+
+Every test is written to a JSONL file (``reports/results.jsonl``) the moment
+its teardown finishes: one line with its outcome, total duration, the
+duration of each phase (setup, call, teardown), the failure or skip message
+and the metrics tests attach as ``user_properties`` (perf, viewports,
+network log, ...). On the xdist controller the lines of all workers end up in
+the same file. Only tests still running are held in memory, and the file is
+line-buffered, so an interrupted run still leaves every finished result.
+
+The HTML and Markdown reports are rendered from the stream after the run (or
+later with ``python -m tests.result_stream``): one pass for the totals at the
+top, then another for the rows.
+"""
+
+import argparse
+import heapq
+import html
+import json
+import os
+import time
+from collections import Counter
+
+OUTCOMES = ("passed", "failed", "error", "skipped", "xfailed", "xpassed")
+SLOWEST = 10
+
+_ICONS = {
+    "passed": "✅", "failed": "❌", "error": "💥",
+    "skipped": "⏭️", "xfailed": "➖", "xpassed": "❗",
+}
+
+
+def _message(report):
+    """Skip reason or the exception message of a failure, for one-line summaries."""
+    if report.skipped and isinstance(report.longrepr, tuple):
+        return report.longrepr[2].replace("Skipped: ", "", 1)
+    reprcrash = getattr(report.longrepr, "reprcrash", None)
+    if reprcrash is not None:
+        return reprcrash.message.splitlines()[0]
+    text = report.longreprtext.strip()
+    return text.splitlines()[-1] if text else ""
+
+
+def _outcome(record, report):
+    wasxfail = hasattr(report, "wasxfail")
+    if report.failed:
+        return "failed" if report.when == "call" else "error"
+    if report.skipped:
+        return "xfailed" if wasxfail else "skipped"
+    if report.when == "call":
+        return "xpassed" if wasxfail else "passed"
+    return record["outcome"]
+
+
+class ResultStream:
+    """Writes one JSON line per test as its reports come in."""
+
+    def __init__(self, path):
+        self.path = path
+        self._running = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w", buffering=1)
+
+    def collect(self, report):
+        record = self._running.setdefault(report.nodeid, {
+            "nodeid": report.nodeid,
+            "file": report.location[0],
+            "outcome": None,
+            "duration": 0.0,
+            "phases": {},
+            "message": "",
+            "worker": getattr(report, "worker_id", None),
+            "metrics": {},
+        })
+        record["phases"][report.when] = report.duration
+        record["duration"] += report.duration
+        # The first failure or skip decides; a failing teardown still counts
+        if record["outcome"] in (None, "passed", "xpassed"):
+            outcome = _outcome(record, report)
+            if outcome != record["outcome"]:
+                record["outcome"] = outcome
+                if outcome not in ("passed", "xpassed"):
+                    record["message"] = _message(report)
+
+        if report.when == "teardown":
+            del self._running[report.nodeid]
+            record["metrics"] = dict(report.user_properties)
+            record["finished_at"] = time.time()
+            # Metrics are whatever tests attached; anything odd becomes a string
+            self._file.write(json.dumps(record, default=str) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+def iter_results(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class StreamSummary:
+    """Totals over a result stream, read in one pass without keeping the rows."""
+
+    def __init__(self, path, slowest=SLOWEST):
+        self.outcomes = Counter()
+        self.files = {}
+        self.duration = 0.0
+        self.started_at = None
+        self.finished_at = None
+
+        def counted(results):
+            for result in results:
+                self.outcomes[result["outcome"]] += 1
+                self.files.setdefault(result["file"], Counter())[result["outcome"]] += 1
+                self.duration += result["duration"]
+                finished_at = result.get("finished_at")
+                if finished_at is not None:
+                    start = finished_at - result["duration"]
+                    self.started_at = start if self.started_at is None else min(self.started_at, start)
+                    self.finished_at = max(self.finished_at or finished_at, finished_at)
+                yield result
+
+        self.slowest = [
+            (result["duration"], result["nodeid"])
+            for result in heapq.nlargest(slowest, counted(iter_results(path)), key=lambda r: r["duration"])
+        ]
+
+    @property
+    def total(self):
+        return sum(self.outcomes.values())
+
+    @property
+    def wall_time(self):
+        if self.started_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    def success_rate(self):
+        executed = self.outcomes["passed"] + self.outcomes["failed"] + self.outcomes["error"]
+        return self.outcomes["passed"] / executed if executed else None
+
+
+def _generated():
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _rate(summary):
+    rate = summary.success_rate()
+    return "n/a" if rate is None else f"{rate:.0%} (of executed tests)"
+
+
+def write_markdown(stream_path, md_path, title="Test Execution Report"):
+    """Render the stream as Markdown: summary, per-file table, slowest tests, problems."""
+    summary = StreamSummary(stream_path)
+    os.makedirs(os.path.dirname(md_path) or ".", exist_ok=True)
+    with open(md_path, "w") as f:
+        f.write(f"# {title}\n\n**Generated:** {_generated()}  \n**Results:** `{stream_path}`\n\n")
+        f.write("## 📊 Summary\n\n| Metric | Value |\n| --- | --- |\n")
+        f.write(f"| **Total Tests** | {summary.total} |\n")
+        for outcome in OUTCOMES:
+            if summary.outcomes[outcome]:
+                f.write(f"| **{outcome.capitalize()}** | {summary.outcomes[outcome]} |\n")
+        f.write(f"| **Success Rate** | {_rate(summary)} |\n")
+        f.write(f"| **Test Time** | {summary.duration:.1f}s ({summary.wall_time:.1f}s wall) |\n\n")
+
+        f.write("## 📁 Results by File\n\n| File | " + " | ".join(OUTCOMES) + " |\n")
+        f.write("| --- |" + " ---: |" * len(OUTCOMES) + "\n")
+        for path, counts in sorted(summary.files.items()):
+            f.write(f"| `{path}` | " + " | ".join(str(counts[o]) for o in OUTCOMES) + " |\n")
+
+        f.write("\n## 🐢 Slowest Tests\n\n| Test | Duration |\n| --- | ---: |\n")
+        for duration, nodeid in summary.slowest:
+            f.write(f"| `{nodeid}` | {duration:.2f}s |\n")
+
+        # Second pass: only the tests that need attention
+        headings = {"failed": "❌ Failed", "error": "💥 Errors", "xpassed": "❗ Unexpectedly Passed",
+                    "skipped": "⏭️ Skipped"}
+        for outcome, heading in headings.items():
+            if not summary.outcomes[outcome]:
+                continue
+            f.write(f"\n## {heading} ({summary.outcomes[outcome]})\n\n| Test | Message |\n| --- | --- |\n")
+            for result in iter_results(stream_path):
+                if result["outcome"] == outcome:
+                    message = result["message"].replace("|", "\\|").replace("\n", " ")
+                    f.write(f"| `{result['nodeid']}` | {message} |\n")
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 2rem; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5rem; }}
+th, td {{ border: 1px solid #ddd; padding: 0.3rem 0.6rem; text-align: left; vertical-align: top; }}
+td.num {{ text-align: right; }}
+tr.failed, tr.error {{ background: #fdecea; }}
+tr.skipped, tr.xfailed {{ background: #f5f5f5; }}
+tr.xpassed {{ background: #fff8e1; }}
+pre {{ margin: 0; white-space: pre-wrap; font-size: 0.85em; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>Generated {generated} from <code>{stream}</code></p>
+"""
+
+
+def write_html(stream_path, html_path, title="Test Report"):
+    """Render the stream as one self-contained HTML page with a row per test."""
+    summary = StreamSummary(stream_path)
+    escape = html.escape
+    os.makedirs(os.path.dirname(html_path) or ".", exist_ok=True)
+    with open(html_path, "w") as f:
+        f.write(_HTML_HEAD.format(title=escape(title), generated=_generated(), stream=escape(stream_path)))
+        f.write("<table><tr><th>Total</th>" + "".join(f"<th>{o}</th>" for o in OUTCOMES)
+                + "<th>Success rate</th><th>Test time</th></tr>\n")
+        f.write(f"<tr><td class=\"num\">{summary.total}</td>"
+                + "".join(f"<td class=\"num\">{summary.outcomes[o]}</td>" for o in OUTCOMES)
+                + f"<td>{escape(_rate(summary))}</td>"
+                + f"<td>{summary.duration:.1f}s ({summary.wall_time:.1f}s wall)</td></tr></table>\n")
+
+        f.write("<table><tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Setup / call / teardown</th>"
+                "<th>Worker</th><th>Message</th><th>Metrics</th></tr>\n")
+        for result in iter_results(stream_path):
+            phases = " / ".join(f"{result['phases'].get(when, 0):.2f}" for when in ("setup", "call", "teardown"))
+            metrics = ""
+            if result["metrics"]:
+                metrics = ("<details><summary>" + escape(", ".join(result["metrics"])) + "</summary><pre>"
+                           + escape(json.dumps(result["metrics"], indent=2)) + "</pre></details>")
+            f.write(
+                f"<tr class=\"{result['outcome']}\"><td><code>{escape(result['nodeid'])}</code></td>"
+                f"<td>{_ICONS.get(result['outcome'], '')} {result['outcome']}</td>"
+                f"<td class=\"num\">{result['duration']:.2f}s</td><td>{phases}</td>"
+                f"<td>{escape(result['worker'] or '')}</td><td>{escape(result['message'])}</td>"
+                f"<td>{metrics}</td></tr>\n"
+            )
+        f.write("</table>\n</body>\n</html>\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render reports from a test result stream")
+    parser.add_argument("stream", nargs="?", default=os.path.join("reports", "results.jsonl"))
+    parser.add_argument("--html", help="Write an HTML report to this path")
+    parser.add_argument("--md", help="Write a Markdown report to this path")
+    args = parser.parse_args(argv)
+    if args.html:
+        write_html(args.stream, args.html)
+    if args.md:
+        write_markdown(args.stream, args.md)
+    if not (args.html or args.md):
+        summary = StreamSummary(args.stream)
+        print(f"{summary.total} tests: " + ", ".join(
+            f"{summary.outcomes[o]} {o}" for o in OUTCOMES if summary.outcomes[o]
+        ))
+
+
+if __name__ == "__main__":
+    main()
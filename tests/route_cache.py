@@ -0,0 +1,120 @@
+"""
+Caching contract of ``/api/news``, observed from outside the app.
+
+The route keeps its scraped articles for a revalidation window (the
+``s-maxage`` it sends). ``probe_route_cache`` primes the cache, then calls
+the route repeatedly and records for every call its response time, the
+caching headers (``Cache-Control``, ``x-nextjs-cache`` and the route's own
+``x-news-cache``) and how many upstream requests the stub upstream saw
+meanwhile. Within the window no call after the first may reach the
+upstream, and the cached calls should be much faster than the scrape.
+"""
+
+import json
+import os
+import time
+
+from tests.benchmark import percentile
+from tests.http_caching import max_age
+from tests.stats import STATS
+
+STATS_SECTION = "news route cache"
+
+# Honoured only when the app scrapes the stub upstream (NEWS_UPSTREAM_BASE)
+REFRESH_HEADERS = {"x-news-cache": "refresh"}
+DEFAULT_CALLS = 10
+
+_S_MAXAGE = "s-maxage="
+
+
+def revalidation_window(cache_control):
+    """Seconds a shared cache may reuse the response (``s-maxage``, else ``max-age``)."""
+    for directive in (cache_control or "").split(","):
+        directive = directive.strip()
+        if directive.startswith(_S_MAXAGE) and directive[len(_S_MAXAGE):].isdigit():
+            return int(directive[len(_S_MAXAGE):])
+    return max_age(cache_control)
+
+
+def _call(http, url, stub, headers=None, timeout=60):
+    hits_before = stub.total_hits()
+    start_time = time.perf_counter()
+    response = http.get(url, headers=headers, timeout=timeout)
+    elapsed = time.perf_counter() - start_time
+    return {
+        "status": response.status_code,
+        "elapsed_ms": elapsed * 1000,
+        "cache_control": response.headers.get("cache-control"),
+        "nextjs_cache": response.headers.get("x-nextjs-cache"),
+        "route_cache": response.headers.get("x-news-cache"),
+        "upstream_hits": stub.total_hits() - hits_before,
+    }
+
+
+class RouteCacheRun:
+    """A priming call and the repeated calls that followed it."""
+
+    def __init__(self, url, prime, calls, wall_s):
+        self.url = url
+        self.prime = prime
+        self.calls = calls
+        self.wall_s = wall_s
+
+    @property
+    def window(self):
+        return revalidation_window(self.prime["cache_control"])
+
+    @property
+    def within_window(self):
+        """Whether every repeated call finished inside the revalidation window."""
+        return self.window is not None and self.wall_s < self.window
+
+    @property
+    def upstream_hits(self):
+        return sum(call["upstream_hits"] for call in self.calls)
+
+    def refetching_calls(self):
+        return [index for index, call in enumerate(self.calls) if call["upstream_hits"]]
+
+    def latency(self):
+        """Response-time distribution (ms) of the repeated calls."""
+        values = sorted(call["elapsed_ms"] for call in self.calls)
+        if not values:
+            return {}
+        return {
+            "min": values[0],
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "max": values[-1],
+        }
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "window_s": self.window,
+            "wall_s": self.wall_s,
+            "prime": self.prime,
+            "calls": self.calls,
+            "upstream_hits": self.upstream_hits,
+            "latency_ms": self.latency(),
+        }
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+
+def probe_route_cache(http, url, stub, calls=DEFAULT_CALLS):
+    """Prime the route's cache with a fresh scrape, then call it ``calls`` times."""
+    prime = _call(http, url, stub, headers=REFRESH_HEADERS)
+    start_time = time.perf_counter()
+    repeated = [_call(http, url, stub) for _ in range(calls)]
+    run = RouteCacheRun(url, prime, repeated, time.perf_counter() - start_time)
+
+    STATS.incr(STATS_SECTION, "priming scrape (ms)", prime["elapsed_ms"])
+    STATS.incr(STATS_SECTION, "repeated calls", len(repeated))
+    STATS.incr(STATS_SECTION, "upstream fetches after priming", run.upstream_hits)
+    if repeated:
+        STATS.incr(STATS_SECTION, "repeated call p50 (ms)", run.latency()["p50"])
+    return run
@@ -0,0 +1,187 @@
+"""
+pytest-xdist scheduling by fixture cost.
+
+A test that uses a browser (the ``driver`` fixture) makes its worker launch
+Chrome, while an HTTP-only test costs one request. With plain ``-n auto``
+scheduling browser tests land on every worker, so every worker pays for a
+browser. Here browser tests are split into at most ``--browser-workers``
+``xdist_group``s and the session is switched to ``--dist loadgroup``: each
+group runs on one worker, so only that many browsers are started, and the
+HTTP-only tests are load-balanced over all workers. Tests that touch state
+living outside the worker (the stub upstream, which the news tests reset
+and count hits on) share one group too, so they never run at the same time.
+``WorkerUtilization`` reports how busy each worker was.
+"""
+
+import os
+import shutil
+import time
+import uuid
+
+import pytest
+
+BROWSER_FIXTURES = ("driver", "driver_pool")
+DEFAULT_BROWSER_WORKERS = 2
+GROUP_PREFIX = "browser"
+
+# Fixtures backed by one process-wide resource -> group their tests run in
+SHARED_STATE_GROUPS = {"stub_upstream": "stub-upstream"}
+# Routes (from requires_endpoint markers) that drive such a resource
+SHARED_STATE_ENDPOINTS = {"/api/news": "stub-upstream"}
+# Marker for the stub-upstream tests, so runners can select or exclude them
+STUB_UPSTREAM_MARKER = "stub_upstream"
+
+
+def fixture_cost(item):
+    """``"browser"`` for tests that need a WebDriver, ``"http"`` otherwise."""
+    fixturenames = getattr(item, "fixturenames", ())
+    return "browser" if any(name in fixturenames for name in BROWSER_FIXTURES) else "http"
+
+
+def browser_workers(config):
+    return max(0, config.getoption("browser_workers"))
+
+
+def configure_scheduling(config):
+    """On the xdist controller: use loadgroup scheduling and fix the test run id.
+
+    Only the default ``load`` mode is replaced; an explicit ``--dist`` other
+    than ``load`` is left alone, and ``--browser-workers 0`` turns this off.
+    Workers parse the original command line, so they learn about the switch
+    from ``workerinput`` (see ``configure_node``).
+    """
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        if workerinput.get("loadgroup"):
+            config.option.loadgroup = True
+        return
+    if config.getoption("dist", "no") == "no":
+        return
+    if config.getoption("dist") == "load" and browser_workers(config):
+        config.option.dist = "loadgroup"
+    # Known up front so the controller can clean up the shared page cache
+    if config.getoption("testrunuid", None) is None:
+        config.option.testrunuid = uuid.uuid4().hex
+
+
+def configure_node(node):
+    """Tell a worker whether the controller schedules by group."""
+    node.workerinput["loadgroup"] = node.config.getoption("dist") == "loadgroup"
+
+
+def _shared_state_group(item):
+    fixturenames = getattr(item, "fixturenames", ())
+    for fixture, group in SHARED_STATE_GROUPS.items():
+        if fixture in fixturenames:
+            return group
+    for marker in item.iter_markers("requires_endpoint"):
+        for path in marker.args:
+            if path in SHARED_STATE_ENDPOINTS:
+                return SHARED_STATE_ENDPOINTS[path]
+    return None
+
+
+def mark_shared_state(items):
+    """Mark tests in the stub-upstream group ``stub_upstream``, in every process.
+
+    The stub is one per machine, not per pytest process; separate runs
+    (``run_tests.py --concurrent``) use the marker to keep these tests out
+    of processes that run at the same time.
+    """
+    for item in items:
+        if _shared_state_group(item) == "stub-upstream":
+            item.add_marker(getattr(pytest.mark, STUB_UPSTREAM_MARKER))
+
+
+def assign_groups(config, items):
+    """On an xdist worker: assign ``xdist_group``s to browser and shared-state tests.
+
+    Browser tests are spread round-robin over ``--browser-workers`` groups.
+
+    Runs before xdist turns the markers into node id suffixes, and gives
+    every worker the same assignment since they collect the same items.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None or not config.getoption("loadgroup", False):
+        return
+    groups = min(browser_workers(config), workerinput.get("workercount", 1))
+    browser_index = 0
+    for item in items:
+        if item.get_closest_marker("xdist_group"):
+            continue
+        name = _shared_state_group(item)
+        if name is None and groups and fixture_cost(item) == "browser":
+            name = f"{GROUP_PREFIX}-{browser_index % groups}"
+            browser_index += 1
+        if name is not None:
+            item.add_marker(pytest.mark.xdist_group(name=name))
+
+
+def _pages_root(config):
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return None
+    return os.path.join(str(cache.mkdir("portfolio")), "pages")
+
+
+def shared_pages_dir(config):
+    """Directory for the page cache shared by the workers of this run (None without xdist)."""
+    workerinput = getattr(config, "workerinput", None)
+    root = _pages_root(config)
+    if workerinput is None or root is None:
+        return None
+    return os.path.join(root, workerinput["testrunuid"])
+
+
+def remove_shared_pages(config):
+    """On the controller: delete this run's shared page cache."""
+    testrunuid = config.getoption("testrunuid", None)
+    root = _pages_root(config)
+    if hasattr(config, "workerinput") or testrunuid is None or root is None:
+        return
+    shutil.rmtree(os.path.join(root, testrunuid), ignore_errors=True)
+
+
+class WorkerUtilization:
+    """Per-worker test counts and busy time, collected from reports on the controller."""
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.workers = {}
+
+    def _worker(self, worker_id):
+        return self.workers.setdefault(worker_id, {"tests": 0, "busy_s": 0.0, "browsers": 0})
+
+    def collect(self, report):
+        worker_id = getattr(report, "worker_id", None)
+        if worker_id is None:
+            return
+        worker = self._worker(worker_id)
+        worker["busy_s"] += report.duration
+        if report.when == "call":
+            worker["tests"] += 1
+
+    def add_worker_stats(self, worker_id, stats):
+        """Take the browser launch count from a finished worker's ``STATS``."""
+        launched = stats.get("webdriver pool", {}).get("browsers launched", 0)
+        self._worker(worker_id)["browsers"] += launched
+
+    def write_summary(self, terminalreporter):
+        if not self.workers:
+            return
+        wall = time.perf_counter() - self.start_time
+        terminalreporter.write_sep("-", "worker utilization")
+        header = f"{'worker':<8} {'tests':>6} {'browsers':>9} {'busy s':>8} {'util':>7}"
+        terminalreporter.write_line(header)
+        terminalreporter.write_line("-" * len(header))
+        busy_total = 0.0
+        for worker_id in sorted(self.workers, key=lambda w: int(w.lstrip("gw") or 0)):
+            worker = self.workers[worker_id]
+            busy_total += worker["busy_s"]
+            terminalreporter.write_line(
+                f"{worker_id:<8} {worker['tests']:>6} {worker['browsers']:>9} "
+                f"{worker['busy_s']:8.1f} {worker['busy_s'] / wall:7.1%}"
+            )
+        terminalreporter.write_line(
+            f"session {wall:.1f}s wall; mean utilization {busy_total / (wall * len(self.workers)):.1%}"
+        )
@@ -0,0 +1,284 @@
+"""
+Builds, starts and warms up the Next.js app for a test session.
+
+``NextServer`` runs ``next build`` (only when the sources changed since the
+last build), launches ``next start`` (production mode) on a free port, waits
+until it answers and crawls the site once so one-off work (route
+initialisation, data caches, JIT) is not charged to the first test that
+happens to hit a page. Startup and warm-up times are recorded in ``STATS``;
+the warm-up's first request to each URL is the true cold hit, and its time is
+kept in ``metrics["cold_ms"]``.
+"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import time
+from urllib.parse import urljoin
+
+import requests
+
+from tests.crawler import Crawler
+from tests.http_client import HttpClient
+from tests.locking import LockTimeout, file_lock
+from tests.stats import STATS
+from tests.stub_upstream import DEFAULT_PORT, StubUpstreamServer
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATS_SECTION = "next server"
+
+# Set by launch_server to the JSON file holding the managed server's metrics
+METRICS_ENV = "SERVER_METRICS"
+
+# A build is stale when any of these is newer than .next/BUILD_ID
+BUILD_INPUTS = ["src", "public", "package.json", "package-lock.json", "next.config.ts", "tsconfig.json"]
+
+
+class ServerError(Exception):
+    """Raised when the app cannot be built or does not become ready."""
+
+
+def find_free_port(host="127.0.0.1"):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def _newest_mtime(path):
+    if os.path.isfile(path):
+        return os.path.getmtime(path)
+    newest = 0.0
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in ("node_modules", ".next")]
+        for name in files:
+            newest = max(newest, os.path.getmtime(os.path.join(root, name)))
+    return newest
+
+
+def _tail(path, lines=30):
+    try:
+        with open(path, errors="replace") as f:
+            return "".join(f.readlines()[-lines:])
+    except OSError:
+        return ""
+
+
+class NextServer:
+    """A ``next start`` process owned by the test session."""
+
+    def __init__(self, project_dir=PROJECT_DIR, host="127.0.0.1", port=None, env=None,
+                 build="auto", log_path=None, start_timeout=60, build_timeout=900):
+        self.project_dir = project_dir
+        self.host = host
+        self.port = port or find_free_port(host)
+        self.env = dict(os.environ, **(env or {}))
+        self.build_mode = build
+        self.log_path = log_path or os.path.join(project_dir, "reports", "next-server.log")
+        self.start_timeout = start_timeout
+        self.build_timeout = build_timeout
+        self.process = None
+        self.metrics = {}
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def _next(self, *args):
+        binary = os.path.join(self.project_dir, "node_modules", ".bin", "next.cmd" if os.name == "nt" else "next")
+        if not os.path.exists(binary):
+            raise ServerError(f"{binary} not found; run `npm ci` first")
+        return [binary, *args]
+
+    def needs_build(self):
+        build_id = os.path.join(self.project_dir, ".next", "BUILD_ID")
+        if self.build_mode == "always" or not os.path.exists(build_id):
+            return True
+        if self.build_mode == "never":
+            return False
+        built_at = os.path.getmtime(build_id)
+        return any(
+            _newest_mtime(os.path.join(self.project_dir, name)) > built_at
+            for name in BUILD_INPUTS
+            if os.path.exists(os.path.join(self.project_dir, name))
+        )
+
+    def build(self):
+        """Run ``next build`` if needed; concurrent runs share one build."""
+        with file_lock(os.path.join(self.project_dir, ".next-build.lock"), timeout=self.build_timeout):
+            if not self.needs_build():
+                STATS.incr(STATS_SECTION, "builds reused")
+                return
+            start_time = time.perf_counter()
+            try:
+                subprocess.run(
+                    self._next("build"), cwd=self.project_dir, env=self.env, check=True,
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=self.build_timeout,
+                )
+            except subprocess.CalledProcessError as e:
+                output = e.stdout.decode(errors="replace")[-3000:]
+                raise ServerError(f"next build failed:\n{output}") from e
+            except (OSError, subprocess.TimeoutExpired) as e:
+                raise ServerError(f"next build failed: {e}") from e
+            self.metrics["build_s"] = time.perf_counter() - start_time
+            STATS.incr(STATS_SECTION, "build time (s)", self.metrics["build_s"])
+
+    def start(self):
+        """Launch ``next start`` and wait until it serves the home page."""
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        log = open(self.log_path, "w")
+        start_time = time.perf_counter()
+        try:
+            self.process = subprocess.Popen(
+                self._next("start", "-H", self.host, "-p", str(self.port)),
+                cwd=self.project_dir, env=self.env, stdout=log, stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        except OSError as e:
+            raise ServerError(f"Could not run next start: {e}") from e
+        finally:
+            log.close()
+
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            if self.process.poll() is not None:
+                raise ServerError(
+                    f"next start exited with code {self.process.returncode}:\n{_tail(self.log_path)}"
+                )
+            try:
+                if requests.get(self.url, timeout=2).status_code < 500:
+                    break
+            except requests.exceptions.RequestException:
+                pass
+            if time.monotonic() > deadline:
+                self.stop()
+                raise ServerError(
+                    f"next start not ready after {self.start_timeout}s:\n{_tail(self.log_path)}"
+                )
+            time.sleep(0.1)
+
+        self.metrics["startup_s"] = time.perf_counter() - start_time
+        STATS.incr(STATS_SECTION, "startup time (s)", self.metrics["startup_s"])
+        return self
+
+    def warm_up(self, extra_paths=(), max_pages=50):
+        """Crawl the site (and fetch ``extra_paths``) once; return the URLs requested.
+
+        Each URL's first response is its cold hit (first request after server
+        start); its time to response headers is stored per URL in
+        ``metrics["cold_ms"]``. Pages are fetched one at a time so the cold
+        times do not include waiting behind each other.
+        """
+        cold_ms = {}
+
+        def record_cold(response, *args, **kwargs):
+            cold_ms.setdefault(response.url, response.elapsed.total_seconds() * 1000)
+
+        start_time = time.perf_counter()
+        http = HttpClient(timeout=30, retries=0)
+        http.session.hooks["response"].append(record_cold)
+        try:
+            crawler = Crawler(self.url, http, max_pages=max_pages, concurrency=1)
+            crawler.load_robots()
+            pages = crawler.crawl([urljoin(self.url, "/")])
+            urls = pages + [urljoin(self.url, path) for path in extra_paths]
+            for path in extra_paths:
+                try:
+                    http.get(urljoin(self.url, path))
+                except requests.exceptions.RequestException:
+                    pass
+        finally:
+            http.close()
+        self.metrics["warmup_s"] = time.perf_counter() - start_time
+        self.metrics["warmup_requests"] = len(urls)
+        self.metrics["cold_ms"] = cold_ms
+        STATS.incr(STATS_SECTION, "warm-up time (s)", self.metrics["warmup_s"])
+        STATS.incr(STATS_SECTION, "warm-up requests", len(urls))
+        return urls
+
+    def write_metrics(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"url": self.url, **self.metrics}, f, indent=2)
+
+    def _signal(self, sig):
+        if hasattr(os, "killpg"):
+            os.killpg(self.process.pid, sig)
+        else:
+            self.process.terminate()
+
+    def stop(self):
+        """Stop the server (its whole process group: node and its workers)."""
+        if self.process is None or self.process.poll() is not None:
+            return
+        try:
+            self._signal(signal.SIGTERM)
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._signal(getattr(signal, "SIGKILL", signal.SIGTERM))
+            self.process.wait()
+        except ProcessLookupError:
+            pass
+
+
+class ManagedServer:
+    """A warmed-up ``NextServer`` plus the stub upstream it scrapes."""
+
+    def __init__(self, server, stub=None):
+        self.server = server
+        self.stub = stub
+
+    @property
+    def url(self):
+        return self.server.url
+
+    def stop(self):
+        self.server.stop()
+        if self.stub is not None:
+            self.stub.stop()
+
+
+def launch_server():
+    """Build, start and warm up the app as configured by the environment.
+
+    ``/api/news`` is pointed at the stub upstream (started here unless one is
+    already running or ``NEWS_UPSTREAM_BASE``/``STUB_UPSTREAM_URL`` is set),
+    so the managed server never scrapes the live news sites. ``BASE_URL``,
+    ``STUB_UPSTREAM_URL`` and ``SERVER_METRICS`` (the server's metrics, cold
+    hits included, written to ``reports/server-metrics.json``) are exported
+    for the tests and any child processes.
+    """
+    stub = None
+    upstream = os.getenv("NEWS_UPSTREAM_BASE") or os.getenv("STUB_UPSTREAM_URL")
+    if not upstream:
+        stub_port = int(os.getenv("STUB_UPSTREAM_PORT", DEFAULT_PORT))
+        try:
+            stub = StubUpstreamServer(port=stub_port).start()
+        except OSError:
+            pass  # Already running; use it
+        upstream = f"http://127.0.0.1:{stub_port}"
+        os.environ["STUB_UPSTREAM_URL"] = upstream
+
+    server = NextServer(
+        port=int(os.getenv("SERVER_PORT", 0)) or None,
+        env={"NEWS_UPSTREAM_BASE": upstream},
+        build=os.getenv("SERVER_BUILD", "auto"),
+        start_timeout=float(os.getenv("SERVER_START_TIMEOUT", 60)),
+    )
+    warmup_paths = [path for path in os.getenv("SERVER_WARMUP_PATHS", "/api/news").split(",") if path]
+    try:
+        server.build()
+        server.start()
+        server.warm_up(warmup_paths)
+    except (ServerError, LockTimeout):
+        server.stop()
+        if stub is not None:
+            stub.stop()
+        raise
+
+    os.environ["BASE_URL"] = server.url
+    metrics_path = os.path.join(PROJECT_DIR, "reports", "server-metrics.json")
+    server.write_metrics(metrics_path)
+    os.environ[METRICS_ENV] = metrics_path
+    return ManagedServer(server, stub)
@@ -0,0 +1,56 @@
+"""
+Session-wide counters shown in the pytest terminal summary.
+
+Fixtures record what they did (browsers launched, pages fetched, ...) into
+``STATS``. Under pytest-xdist every worker keeps its own copy; the workers
+ship their counters back to the controller, which merges and prints them.
+"""
+
+from collections import OrderedDict
+
+
+class SessionStats:
+    """Named sections of additive counters."""
+
+    def __init__(self):
+        self._sections = OrderedDict()
+
+    def section(self, name):
+        """Return the counter dict for a section, creating it if needed."""
+        return self._sections.setdefault(name, OrderedDict())
+
+    def incr(self, section, key, amount=1):
+        """Add ``amount`` to a counter."""
+        counters = self.section(section)
+        counters[key] = counters.get(key, 0) + amount
+
+    def get(self, section, key, default=0):
+        """Read a counter without creating it."""
+        return self._sections.get(section, {}).get(key, default)
+
+    def as_dict(self):
+        """Plain-dict snapshot, safe to send over the xdist channel."""
+        return {name: dict(counters) for name, counters in self._sections.items()}
+
+    def merge(self, data):
+        """Add the counters from another ``as_dict()`` snapshot."""
+        for name, counters in data.items():
+            for key, value in counters.items():
+                self.incr(name, key, value)
+
+    def clear(self):
+        self._sections.clear()
+
+    def write_summary(self, terminalreporter):
+        """Print every non-empty section to the terminal summary."""
+        for name, counters in self._sections.items():
+            if not counters:
+                continue
+            terminalreporter.write_sep("-", name)
+            for key, value in counters.items():
+                if isinstance(value, float):
+                    value = f"{value:.3f}"
+                terminalreporter.write_line(f"{key}: {value}")
+
+
+STATS = SessionStats()
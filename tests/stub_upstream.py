@@ -0,0 +1,207 @@
+"""
+Local stand-in for the news sites scraped by ``/api/news``.
+
+The news route fetches ``${NEWS_UPSTREAM_BASE}/<host><path>`` when
+``NEWS_UPSTREAM_BASE`` is set, so starting the app with it pointing here
+makes the route scrape recorded HTML fixtures instead of the live sites.
+
+Per-host latency and failures can be injected, and every upstream request is
+counted. The stub is controlled over HTTP (``/__stub/...``) so tests in any
+process (xdist workers, the test runner) can share one instance.
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "upstream")
+DEFAULT_PORT = 4010
+
+# Failure modes that can be injected per host
+FAILURE_MODES = ("error", "reset", "hang", "empty")
+
+
+class _StubState:
+    """Injected behaviour and hit counts, shared by all handler threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.delay = {}
+            self.fail = {}
+            self.hang_seconds = 30.0
+            self.hits = {}
+
+    def configure(self, delay=None, fail=None, hang_seconds=None):
+        with self.lock:
+            if delay is not None:
+                self.delay = dict(delay)
+            if fail is not None:
+                unknown = set(fail.values()) - set(FAILURE_MODES)
+                if unknown:
+                    raise ValueError(f"Unknown failure modes: {sorted(unknown)}")
+                self.fail = dict(fail)
+            if hang_seconds is not None:
+                self.hang_seconds = float(hang_seconds)
+
+    def record_hit(self, host):
+        with self.lock:
+            self.hits[host] = self.hits.get(host, 0) + 1
+            delay = self.delay.get(host, self.delay.get("*", 0))
+            failure = self.fail.get(host, self.fail.get("*"))
+            return delay, failure, self.hang_seconds
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "delay": dict(self.delay),
+                "fail": dict(self.fail),
+                "hang_seconds": self.hang_seconds,
+                "hits": dict(self.hits),
+            }
+
+
+def _fixture_for(host):
+    for name in (f"{host}.html", "generic.html"):
+        path = os.path.join(FIXTURES_DIR, name)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+    return b"<html><body></body></html>"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, data, status=200):
+        self._send(status, json.dumps(data).encode(), "application/json")
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path == "/__stub/state":
+            return self._send_json(state.snapshot())
+
+        # /<host>/<path...> -> recorded page for that host
+        host = self.path.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+        delay, failure, hang_seconds = state.record_hit(host)
+        if delay:
+            time.sleep(delay)
+
+        if failure == "hang":
+            time.sleep(hang_seconds)
+            self.close_connection = True
+            return
+        if failure == "reset":
+            self.close_connection = True
+            self.connection.close()
+            return
+        if failure == "error":
+            return self._send(500, b"Injected upstream failure")
+        if failure == "empty":
+            return self._send(200, b"")
+        self._send(200, _fixture_for(host))
+
+    def do_POST(self):
+        state = self.server.state
+        if self.path == "/__stub/reset":
+            state.reset()
+            return self._send_json(state.snapshot())
+        if self.path == "/__stub/config":
+            try:
+                state.configure(**self._read_json())
+            except (TypeError, ValueError) as e:
+                return self._send_json({"error": str(e)}, status=400)
+            return self._send_json(state.snapshot())
+        self._send(404, b"Not found")
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # The route requests all of its upstreams at once, for every request it
+    # serves; the default backlog of 5 would drop connections under load
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubUpstreamServer:
+    """Runs the stub in a background thread of the current process."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self._server = _StubHTTPServer((host, port), _StubHandler)
+        self._server.state = _StubState()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StubUpstreamClient:
+    """Controls a (possibly remote) stub through its ``/__stub`` endpoints."""
+
+    def __init__(self, url, timeout=5):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, path, data=None):
+        response = requests.post(f"{self.url}{path}", json=data or {}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def reset(self):
+        """Clear injected delays/failures and hit counts."""
+        return self._post("/__stub/reset")
+
+    def configure(self, delay=None, fail=None, hang_seconds=None):
+        """Set per-host delay (seconds) and failure mode; ``"*"`` applies to all hosts."""
+        data = {"delay": delay, "fail": fail, "hang_seconds": hang_seconds}
+        return self._post("/__stub/config", {k: v for k, v in data.items() if v is not None})
+
+    def state(self):
+        response = requests.get(f"{self.url}/__stub/state", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def hits(self):
+        """Upstream requests received so far, by host."""
+        return self.state()["hits"]
+
+    def total_hits(self):
+        return sum(self.hits().values())
+
+    def is_running(self):
+        try:
+            self.state()
+            return True
+        except requests.exceptions.RequestException:
+            return False
@@ -6,12 +6,13 @@ from urllib.parse import urljoin
 class TestAPIEndpoints:
     """Test suite for API endpoints."""
     
-    def test_api_health_check(self, base_url):
+    @pytest.mark.requires_endpoint("/api/health")
+    def test_api_health_check(self, base_url, http):
         """Test API health check endpoint."""
         health_url = urljoin(base_url, "/api/health")
         
         try:
-            response = requests.get(health_url, timeout=10)
+            response = http.get(health_url)
             assert response.status_code == 200, f"Health check failed with status {response.status_code}"
             
             # If response is JSON, check for expected fields
@@ -21,7 +22,8 @@ class TestAPIEndpoints:
         except requests.exceptions.RequestException as e:
             pytest.skip(f"API endpoint not available: {e}")
     
-    def test_api_contact_form(self, base_url):
+    @pytest.mark.requires_endpoint("/api/contact")
+    def test_api_contact_form(self, base_url, http):
         """Test contact form API endpoint."""
         contact_url = urljoin(base_url, "/api/contact")
         
@@ -33,7 +35,7 @@ class TestAPIEndpoints:
         }
         
         try:
-            response = requests.post(contact_url, json=test_data, timeout=10)
+            response = http.post(contact_url, json=test_data)
             
             # Should return 200 or 201 for successful submission
             assert response.status_code in [200, 201], f"Contact form submission failed with status {response.status_code}"
@@ -46,7 +48,8 @@ class TestAPIEndpoints:
         except requests.exceptions.RequestException as e:
             pytest.skip(f"Contact API endpoint not available: {e}")
     
-    def test_api_contact_form_validation(self, base_url):
+    @pytest.mark.requires_endpoint("/api/contact")
+    def test_api_contact_form_validation(self, base_url, http):
         """Test contact form API validation with invalid data."""
         contact_url = urljoin(base_url, "/api/contact")
         
@@ -58,7 +61,7 @@ class TestAPIEndpoints:
         }
         
         try:
-            response = requests.post(contact_url, json=invalid_data, timeout=10)
+            response = http.post(contact_url, json=invalid_data)
             
             # Should return 400 for validation errors
             assert response.status_code == 400, f"Should return 400 for invalid data, got {response.status_code}"
@@ -71,12 +74,13 @@ class TestAPIEndpoints:
         except requests.exceptions.RequestException as e:
             pytest.skip(f"Contact API endpoint not available: {e}")
     
-    def test_api_projects_endpoint(self, base_url):
+    @pytest.mark.requires_endpoint("/api/projects")
+    def test_api_projects_endpoint(self, base_url, http):
         """Test projects API endpoint if it exists."""
         projects_url = urljoin(base_url, "/api/projects")
         
         try:
-            response = requests.get(projects_url, timeout=10)
+            response = http.get(projects_url)
             
             if response.status_code == 200:
                 # If endpoint exists, check response format
@@ -93,12 +97,13 @@ class TestAPIEndpoints:
         except requests.exceptions.RequestException as e:
             pytest.skip(f"Projects API endpoint not available: {e}")
     
-    def test_api_news_endpoint(self, base_url):
+    @pytest.mark.requires_endpoint("/api/news")
+    def test_api_news_endpoint(self, base_url, http):
         """Test news API endpoint if it exists."""
         news_url = urljoin(base_url, "/api/news")
         
         try:
-            response = requests.get(news_url, timeout=10)
+            response = http.get(news_url)
             
             if response.status_code == 200:
                 # If endpoint exists, check response format
@@ -115,7 +120,7 @@ class TestAPIEndpoints:
         except requests.exceptions.RequestException as e:
             pytest.skip(f"News API endpoint not available: {e}")
     
-    def test_api_cors_headers(self, base_url):
+    def test_api_cors_headers(self, base_url, http, endpoints):
         """Test CORS headers for API endpoints."""
         # Test a few common API endpoints
         api_endpoints = [
@@ -126,10 +131,13 @@ class TestAPIEndpoints:
         ]
         
         for endpoint in api_endpoints:
+            if not endpoints.available(endpoint):
+                continue
+            
             url = urljoin(base_url, endpoint)
             
             try:
-                response = requests.options(url, timeout=10)
+                response = http.options(url)
                 
                 # Check for CORS headers
                 cors_headers = [
@@ -146,7 +154,8 @@ class TestAPIEndpoints:
                 # Skip if endpoint doesn't exist
                 continue
     
-    def test_api_rate_limiting(self, base_url):
+    @pytest.mark.requires_endpoint("/api/contact")
+    def test_api_rate_limiting(self, base_url, http):
         """Test API rate limiting if implemented."""
         contact_url = urljoin(base_url, "/api/contact")
         
@@ -160,7 +169,7 @@ class TestAPIEndpoints:
             # Make multiple rapid requests
             responses = []
             for i in range(5):
-                response = requests.post(contact_url, json=test_data, timeout=10)
+                response = http.post(contact_url, json=test_data)
                 responses.append(response.status_code)
             
             # Check if any requests were rate limited (429 status)
@@ -174,17 +183,17 @@ class TestAPIEndpoints:
         except requests.exceptions.RequestException as e:
             pytest.skip(f"Contact API endpoint not available: {e}")
     
-    def test_api_error_handling(self, base_url):
+    @pytest.mark.requires_endpoint("/api/contact")
+    def test_api_error_handling(self, base_url, http):
         """Test API error handling for invalid requests."""
         contact_url = urljoin(base_url, "/api/contact")
         
         # Test with invalid JSON
         try:
-            response = requests.post(
+            response = http.post(
                 contact_url, 
                 data="invalid json", 
-                headers={'Content-Type': 'application/json'},
-                timeout=10
+                headers={'Content-Type': 'application/json'}
             )
             
             # Should return 400 for invalid JSON
@@ -193,13 +202,14 @@ class TestAPIEndpoints:
         except requests.exceptions.RequestException as e:
             pytest.skip(f"Contact API endpoint not available: {e}")
     
-    def test_api_method_not_allowed(self, base_url):
+    @pytest.mark.requires_endpoint("/api/contact")
+    def test_api_method_not_allowed(self, base_url, http):
         """Test API endpoints with unsupported HTTP methods."""
         contact_url = urljoin(base_url, "/api/contact")
         
         # Test with PUT method (should not be allowed)
         try:
-            response = requests.put(contact_url, json={}, timeout=10)
+            response = http.put(contact_url, json={})
             
             # Should return 405 Method Not Allowed
             assert response.status_code == 405, f"Should return 405 for unsupported method, got {response.status_code}"
@@ -207,36 +217,37 @@ class TestAPIEndpoints:
         except requests.exceptions.RequestException as e:
             pytest.skip(f"Contact API endpoint not available: {e}")
     
-    def test_api_response_time(self, base_url):
+    def test_api_response_time(self, base_url, http, perf, endpoints):
         """Test API response times are within acceptable limits."""
-        import time
-        
         endpoints_to_test = [
-            "/api/health",
-            "/api/contact"
+            endpoint for endpoint in ["/api/health", "/api/contact"] if endpoints.available(endpoint)
         ]
+        if not endpoints_to_test:
+            pytest.skip("No API endpoints to time")
         
         for endpoint in endpoints_to_test:
             url = urljoin(base_url, endpoint)
             
-            try:
-                start_time = time.time()
-                
-                if endpoint == "/api/contact":
-                    # POST request for contact form
-                    response = requests.post(url, json={
+            if endpoint == "/api/contact":
+                # POST request for contact form
+                def call():
+                    return http.post(url, json={
                         "name": "Performance Test",
                         "email": "perf@test.com",
                         "message": "Performance test message."
-                    }, timeout=10)
-                else:
-                    # GET request for other endpoints
-                    response = requests.get(url, timeout=10)
-                
-                response_time = time.time() - start_time
+                    })
+            else:
+                # GET request for other endpoints
+                def call():
+                    return http.get(url)
+            
+            try:
+                timing, _ = perf.measure(f"api.response_time.{endpoint}", call)
                 
-                # Assert response time is under 2 seconds
-                assert response_time < 2.0, f"API endpoint {endpoint} took {response_time:.2f}s to respond"
+                # Assert median response time is under 2 seconds
+                assert timing["median"] < 2.0, f"API endpoint {endpoint} took {timing['median']:.2f}s to respond"
                 
             except requests.exceptions.RequestException as e:
-                pytest.skip(f"API endpoint {endpoint} not available: {e}") 
\ No newline at end of file
+                pytest.skip(f"API endpoint {endpoint} not available: {e}")
+        
+        perf.check() 
\ No newline at end of file
@@ -0,0 +1,267 @@
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import pytest
+import requests
+
+from tests.route_cache import REFRESH_HEADERS, probe_route_cache
+from tests.stats import STATS
+from tests.stub_upstream import StubUpstreamClient, StubUpstreamServer
+
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports")
+
+# Injected upstream delays (seconds) for the latency scaling test
+UPSTREAM_DELAYS = [0.0, 0.1, 0.25, 0.5]
+SAMPLES_PER_DELAY = 3
+# Above this the route is fetching upstreams one after another (up to 8 in a row)
+UPSTREAM_LATENCY_SLOPE_MAX = 1.5
+
+# Hosts the route scrapes, per scraper
+LEGAL_UPSTREAMS = ["www.law360.com", "abcnews.go.com", "www.forbes.com"]
+TECH_UPSTREAMS = [
+    "arstechnica.com", "www.theverge.com", "www.wired.com", "venturebeat.com",
+    "techcrunch.com", "www.cnet.com", "www.engadget.com", "mashable.com",
+]
+# Delay (seconds) of the slowest upstream at each point of the fan-out curve
+FANOUT_DELAYS = [0.1, 0.2, 0.4]
+# Must match the app's NEWS_UPSTREAM_TIMEOUT_MS
+UPSTREAM_TIMEOUT = float(os.getenv("NEWS_UPSTREAM_TIMEOUT_MS", 5000)) / 1000
+
+LEGAL_FALLBACK_TITLE = "AI in Legal Practice: Transforming Document Review and Case Analysis"
+
+
+def staggered_delays(slowest):
+    """Per-host delays rising to ``slowest`` within each scraper's list of upstreams."""
+    delays = {}
+    for hosts in (LEGAL_UPSTREAMS, TECH_UPSTREAMS):
+        for index, host in enumerate(hosts):
+            delays[host] = slowest * (index + 1) / len(hosts)
+    return delays
+
+
+def sequential_latency(delays):
+    """What the route would take fetching each scraper's upstreams one after another."""
+    return max(sum(delays[host] for host in hosts) for hosts in (LEGAL_UPSTREAMS, TECH_UPSTREAMS))
+
+
+@pytest.fixture(scope="module")
+def local_stub():
+    """A private stub instance on a random port, for testing the stub itself."""
+    server = StubUpstreamServer(port=0).start()
+    yield StubUpstreamClient(server.url)
+    server.stop()
+
+
+class TestStubUpstream:
+    """Tests for the stub upstream server used by the news route benchmarks."""
+
+    def test_serves_recorded_fixture_per_host(self, local_stub):
+        """Test that each host gets its recorded page and unknown hosts a generic one."""
+        response = requests.get(f"{local_stub.url}/www.law360.com/", timeout=5)
+        assert response.status_code == 200
+        assert "article-title" in response.text
+
+        response = requests.get(f"{local_stub.url}/example.com/tech", timeout=5)
+        assert response.status_code == 200
+        assert "<h2>" in response.text
+
+    def test_counts_hits_per_host(self, local_stub):
+        """Test that upstream requests are counted per host and reset clears them."""
+        local_stub.reset()
+        requests.get(f"{local_stub.url}/www.forbes.com/technology/", timeout=5)
+        requests.get(f"{local_stub.url}/www.forbes.com/technology/", timeout=5)
+        requests.get(f"{local_stub.url}/arstechnica.com/", timeout=5)
+
+        assert local_stub.hits() == {"www.forbes.com": 2, "arstechnica.com": 1}
+
+        local_stub.reset()
+        assert local_stub.total_hits() == 0
+
+    def test_injected_delay(self, local_stub):
+        """Test that per-host delays apply only to that host."""
+        local_stub.reset()
+        local_stub.configure(delay={"www.wired.com": 0.3})
+
+        start_time = time.perf_counter()
+        requests.get(f"{local_stub.url}/www.wired.com/", timeout=5)
+        slow = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        requests.get(f"{local_stub.url}/www.cnet.com/", timeout=5)
+        fast = time.perf_counter() - start_time
+
+        assert slow >= 0.3, f"Delayed host answered in {slow:.2f}s"
+        assert fast < 0.3, f"Undelayed host took {fast:.2f}s"
+        local_stub.reset()
+
+    def test_injected_failures(self, local_stub):
+        """Test the error, empty, reset and hang failure modes."""
+        local_stub.reset()
+        local_stub.configure(
+            fail={"a.test": "error", "b.test": "empty", "c.test": "reset", "d.test": "hang"},
+            hang_seconds=2,
+        )
+
+        assert requests.get(f"{local_stub.url}/a.test/", timeout=5).status_code == 500
+        assert requests.get(f"{local_stub.url}/b.test/", timeout=5).text == ""
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(f"{local_stub.url}/c.test/", timeout=5)
+        with pytest.raises(requests.exceptions.RequestException):
+            requests.get(f"{local_stub.url}/d.test/", timeout=0.5)
+        local_stub.reset()
+
+    def test_rejects_unknown_failure_mode(self, local_stub):
+        """Test that configuring an unknown failure mode is refused."""
+        with pytest.raises(requests.exceptions.HTTPError):
+            local_stub.configure(fail={"*": "explode"})
+
+
+class TestNewsRouteUpstreams:
+    """Benchmarks of /api/news against the stub upstream (app must use the stub)."""
+
+    def _get_news(self, base_url, http):
+        # Skip the route's cache: these tests measure the scrape itself
+        start_time = time.perf_counter()
+        response = http.get(urljoin(base_url, "/api/news"), headers=REFRESH_HEADERS, timeout=60)
+        return response, time.perf_counter() - start_time
+
+    def test_news_scrapes_stub_fixtures(self, base_url, http, news_stub):
+        """Test that the route returns articles parsed from the recorded fixtures."""
+        response, _ = self._get_news(base_url, http)
+        assert response.status_code == 200
+
+        data = response.json()
+        sources = {article["source"] for article in data["legal"]}
+        assert "Law360" in sources, "Legal news should include the Law360 fixture articles"
+        assert news_stub.hits().get("www.law360.com") == 1
+
+    def test_news_fallback_when_upstreams_fail(self, base_url, http, news_stub):
+        """Test that the route falls back to static articles when every upstream fails."""
+        news_stub.configure(fail={"*": "error"})
+
+        response, _ = self._get_news(base_url, http)
+        assert response.status_code == 200
+
+        data = response.json()
+        titles = [article["title"] for article in data["legal"]]
+        assert LEGAL_FALLBACK_TITLE in titles, "Legal news should use the fallback articles"
+        assert data["tech"], "Tech news should use the fallback articles"
+
+    def test_news_latency_scales_with_upstream_delay(self, base_url, http, news_stub):
+        """Test that each second of upstream delay adds about one second of route latency."""
+        curve = []
+        for delay in UPSTREAM_DELAYS:
+            news_stub.configure(delay={"*": delay})
+            samples = [self._get_news(base_url, http)[1] for _ in range(SAMPLES_PER_DELAY)]
+            median = statistics.median(samples)
+            curve.append({"delay": delay, "median": median, "samples": samples})
+            STATS.incr("news route latency vs upstream delay", f"delay {delay:.2f}s -> median (s)", median)
+
+        # Seconds of route latency per second of delay on every upstream
+        slope, _ = statistics.linear_regression(
+            [point["delay"] for point in curve], [point["median"] for point in curve]
+        )
+        STATS.incr("news route latency vs upstream delay", "slope", slope)
+
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        with open(os.path.join(REPORTS_DIR, "news-upstream-latency.json"), "w") as f:
+            json.dump({"slope": slope, "curve": curve}, f, indent=2)
+
+        # The upstreams are fetched at the same time, so the route waits for
+        # the delay once: much less means it skipped them, more that it waits
+        # for some of them in turn
+        assert 0.5 <= slope <= UPSTREAM_LATENCY_SLOPE_MAX, (
+            f"Route latency grows {slope:.2f}s per second of upstream delay, expected about 1"
+        )
+
+    def test_news_concurrent_requests(self, base_url, http, news_stub):
+        """Test that concurrent route requests overlap instead of queueing."""
+        news_stub.configure(delay={"*": 0.25})
+        _, single = self._get_news(base_url, http)
+
+        concurrency = 5
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda _: self._get_news(base_url, http), range(concurrency)))
+        wall_time = time.perf_counter() - start_time
+
+        STATS.incr("news route concurrency", "single request (s)", single)
+        STATS.incr("news route concurrency", f"{concurrency} concurrent requests (s)", wall_time)
+
+        assert all(response.status_code == 200 for response, _ in results)
+        assert wall_time < single * 2, (
+            f"{concurrency} concurrent requests took {wall_time:.2f}s vs {single:.2f}s for one"
+        )
+
+    def test_news_served_from_cache_within_window(self, base_url, http, news_stub):
+        """Test that repeated calls within the revalidation window never reach the upstreams."""
+        news_stub.configure(delay={"*": 0.25})
+        run = probe_route_cache(http, urljoin(base_url, "/api/news"), news_stub)
+        run.write(os.path.join(REPORTS_DIR, "news-cache.json"))
+
+        assert run.prime["status"] == 200
+        assert run.window, f"No s-maxage/max-age in Cache-Control {run.prime['cache_control']!r}"
+        if not run.within_window:
+            pytest.skip(f"Calls took {run.wall_s:.1f}s, longer than the {run.window}s window")
+
+        refetching = run.refetching_calls()
+        assert not refetching, (
+            f"Calls {refetching} fetched from the upstreams again "
+            f"({run.upstream_hits} upstream requests within the {run.window}s window)"
+        )
+        assert all(call["route_cache"] == "HIT" for call in run.calls), (
+            f"x-news-cache: {[call['route_cache'] for call in run.calls]}"
+        )
+        # Cached answers skip the 0.25s upstream delay entirely
+        assert run.latency()["p90"] < run.prime["elapsed_ms"], (
+            f"Cached p90 {run.latency()['p90']:.0f}ms vs {run.prime['elapsed_ms']:.0f}ms for the scrape"
+        )
+
+    def test_news_latency_tracks_slowest_upstream(self, base_url, http, news_stub):
+        """Test that upstreams are fetched concurrently: latency follows the slowest, not the sum."""
+        baseline = statistics.median(self._get_news(base_url, http)[1] for _ in range(SAMPLES_PER_DELAY))
+
+        curve = []
+        for slowest in FANOUT_DELAYS:
+            delays = staggered_delays(slowest)
+            news_stub.configure(delay=delays)
+            samples = [self._get_news(base_url, http)[1] for _ in range(SAMPLES_PER_DELAY)]
+            median = statistics.median(samples)
+            curve.append({
+                "slowest_upstream": slowest,
+                "sequential": sequential_latency(delays),
+                "median": median,
+                "added": median - baseline,
+                "samples": samples,
+            })
+            STATS.incr("news route fan-out", f"slowest {slowest:.2f}s -> median (s)", median)
+
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        with open(os.path.join(REPORTS_DIR, "news-fanout-latency.json"), "w") as f:
+            json.dump({"baseline": baseline, "curve": curve}, f, indent=2)
+
+        for point in curve:
+            # Closer to the slowest upstream than to all of them in a row
+            midpoint = (point["slowest_upstream"] + point["sequential"]) / 2
+            assert point["added"] < midpoint, (
+                f"Upstream delays up to {point['slowest_upstream']:.2f}s added {point['added']:.2f}s; "
+                f"fetched one after another they add {point['sequential']:.2f}s"
+            )
+
+    def test_news_hanging_upstream_is_bounded(self, base_url, http, news_stub):
+        """Test that one upstream that never answers only holds the route up until the timeout."""
+        news_stub.configure(fail={"www.forbes.com": "hang"}, hang_seconds=UPSTREAM_TIMEOUT * 3)
+
+        response, elapsed = self._get_news(base_url, http)
+        STATS.incr("news route fan-out", "hanging upstream -> route (s)", elapsed)
+
+        assert response.status_code == 200
+        assert elapsed < UPSTREAM_TIMEOUT + 2, (
+            f"Route took {elapsed:.1f}s with a hanging upstream (timeout {UPSTREAM_TIMEOUT:.1f}s)"
+        )
+        sources = {article["source"] for article in response.json()["legal"]}
+        assert "Law360" in sources, "The other upstreams should still be scraped"
@@ -6,19 +6,19 @@ class TestSmoke:
     """Smoke tests to verify basic functionality."""
     
     @pytest.mark.smoke
-    def test_website_accessible(self, base_url):
+    def test_website_accessible(self, base_url, pages):
         """Test that the website is accessible."""
         try:
-            response = requests.get(base_url, timeout=10)
+            response = pages.get(base_url)
             assert response.status_code == 200, f"Website returned status {response.status_code}"
         except requests.exceptions.RequestException as e:
             pytest.skip(f"Website not accessible: {e}")
     
     @pytest.mark.smoke
-    def test_homepage_content(self, base_url):
+    def test_homepage_content(self, base_url, pages):
         """Test that homepage has basic content."""
         try:
-            response = requests.get(base_url, timeout=10)
+            response = pages.get(base_url)
             assert response.status_code == 200
             
             # Check for basic content indicators
@@ -29,10 +29,10 @@ class TestSmoke:
             pytest.skip(f"Website not accessible: {e}")
     
     @pytest.mark.smoke
-    def test_meta_tags_present(self, base_url):
+    def test_meta_tags_present(self, base_url, pages):
         """Test that basic meta tags are present."""
         try:
-            response = requests.get(base_url, timeout=10)
+            response = pages.get(base_url)
             assert response.status_code == 200
             
             content = response.text
@@ -43,10 +43,10 @@ class TestSmoke:
             pytest.skip(f"Website not accessible: {e}")
     
     @pytest.mark.smoke
-    def test_responsive_design_basic(self, base_url):
+    def test_responsive_design_basic(self, base_url, pages):
         """Test basic responsive design elements."""
         try:
-            response = requests.get(base_url, timeout=10)
+            response = pages.get(base_url)
             assert response.status_code == 200
             
             content = response.text
@@ -57,10 +57,10 @@ class TestSmoke:
             pytest.skip(f"Website not accessible: {e}")
     
     @pytest.mark.smoke
-    def test_no_console_errors(self, base_url):
+    def test_no_console_errors(self, base_url, pages):
         """Test that there are no obvious JavaScript errors."""
         try:
-            response = requests.get(base_url, timeout=10)
+            response = pages.get(base_url)
             assert response.status_code == 200
             
             content = response.text
@@ -74,29 +74,29 @@ class TestSmoke:
             pytest.skip(f"Website not accessible: {e}")
     
     @pytest.mark.smoke
-    def test_page_load_time(self, base_url):
-        """Test that page loads within reasonable time."""
-        import time
-        
+    def test_page_load_time(self, base_url, pages, perf):
+        """Test that page loads within reasonable time (median of repeated loads)."""
         try:
-            start_time = time.time()
-            response = requests.get(base_url, timeout=10)
-            load_time = time.time() - start_time
+            # Deliberately bypass the page cache to measure real loads
+            timing, response = perf.measure(
+                "smoke.page_load_time", lambda: pages.get(base_url, fresh=True)
+            )
             
             assert response.status_code == 200
-            assert load_time < 5.0, f"Page took {load_time:.2f}s to load, which is too slow"
+            assert timing["median"] < 5.0, f"Page took {timing['median']:.2f}s to load, which is too slow"
+            perf.check()
             
         except requests.exceptions.RequestException as e:
             pytest.skip(f"Website not accessible: {e}")
     
     @pytest.mark.smoke
-    def test_https_redirect(self, base_url):
+    def test_https_redirect(self, base_url, http):
         """Test HTTPS redirect if applicable."""
         if base_url.startswith("https://"):
             # Already HTTPS, test HTTP redirect
             http_url = base_url.replace("https://", "http://")
             try:
-                response = requests.get(http_url, timeout=10, allow_redirects=False)
+                response = http.get(http_url, allow_redirects=False)
                 # Should redirect to HTTPS
                 assert response.status_code in [301, 302], "Should redirect HTTP to HTTPS"
             except requests.exceptions.RequestException:
@@ -107,11 +107,11 @@ class TestSmoke:
             pytest.skip("HTTPS redirect test not applicable")
     
     @pytest.mark.smoke
-    def test_favicon_accessible(self, base_url):
+    def test_favicon_accessible(self, base_url, http):
         """Test that favicon is accessible."""
         try:
             favicon_url = urljoin(base_url, "/favicon.ico")
-            response = requests.head(favicon_url, timeout=10)
+            response = http.head(favicon_url)
             assert response.status_code in [200, 404], "Favicon should be accessible or return 404"
             
         except requests.exceptions.RequestException:
@@ -119,11 +119,11 @@ class TestSmoke:
             pass
     
     @pytest.mark.smoke
-    def test_robots_txt(self, base_url):
+    def test_robots_txt(self, base_url, pages):
         """Test robots.txt file."""
         try:
             robots_url = urljoin(base_url, "/robots.txt")
-            response = requests.get(robots_url, timeout=10)
+            response = pages.get(robots_url)
             assert response.status_code in [200, 404], "robots.txt should be accessible or return 404"
             
         except requests.exceptions.RequestException:
@@ -131,11 +131,11 @@ class TestSmoke:
             pass
     
     @pytest.mark.smoke
-    def test_sitemap_xml(self, base_url):
+    def test_sitemap_xml(self, base_url, pages):
         """Test sitemap.xml file."""
         try:
             sitemap_url = urljoin(base_url, "/sitemap.xml")
-            response = requests.get(sitemap_url, timeout=10)
+            response = pages.get(sitemap_url)
             assert response.status_code in [200, 404], "sitemap.xml should be accessible or return 404"
             
         except requests.exceptions.RequestException:
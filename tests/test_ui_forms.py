@@ -2,7 +2,9 @@ import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-import time
+from selenium.common.exceptions import TimeoutException
+
+from tests.waits import wait_for_focus_change, wait_for_ui_settled
 
 class TestForms:
     """Test suite for form functionality."""
@@ -41,8 +43,8 @@ class TestForms:
         submit_button = contact_form.find_element(By.CSS_SELECTOR, "button[type='submit'], input[type='submit'], .submit-btn")
         submit_button.click()
         
-        # Wait for validation messages
-        time.sleep(1)
+        # Wait for the form to react (validation messages or a request)
+        wait_for_ui_settled(driver)
         
         # Check for validation errors (this will depend on your form implementation)
         error_messages = driver.find_elements(By.CSS_SELECTOR, ".error, .validation-error, [role='alert']")
@@ -87,8 +89,8 @@ class TestForms:
         submit_button = contact_form.find_element(By.CSS_SELECTOR, "button[type='submit'], input[type='submit'], .submit-btn")
         submit_button.click()
         
-        # Wait for submission response
-        time.sleep(2)
+        # Wait for the submission request and its response to render
+        wait_for_ui_settled(driver)
         
         # Check for success message or redirect
         success_messages = driver.find_elements(By.CSS_SELECTOR, ".success, .success-message, [role='status']")
@@ -157,7 +159,10 @@ class TestForms:
             
             # Test tab key navigation
             element.send_keys(Keys.TAB)
-            time.sleep(0.1)  # Small delay for focus change
+            try:
+                wait_for_focus_change(driver, element, timeout=2)
+            except TimeoutException:
+                pass  # Reported by the assertion below
             
             # Verify focus moved to next element (if not the last element)
             if i < len(focusable_elements) - 1:
@@ -255,8 +260,12 @@ class TestForms:
             submit_button.click()
             
             # Check for validation messages
-            time.sleep(1)
-            validation_messages = driver.find_elements(By.CSS_SELECTOR, ".error, .validation-error, [role='alert']")
+            try:
+                validation_messages = wait.until(
+                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".error, .validation-error, [role='alert']"))
+                )
+            except TimeoutException:
+                validation_messages = []
             
             # Should have validation errors for required fields
             assert len(validation_messages) > 0, "Should show validation errors for required fields" 
\ No newline at end of file
@@ -0,0 +1,19 @@
+import pytest
+from urllib.parse import urlparse
+
+class TestImages:
+    """Test suite for image optimization."""
+    
+    def test_image_optimization(self, driver, site_page, image_auditor):
+        """Test that images on every discovered page stay within the wasted-bytes budget."""
+        page = urlparse(site_page).path
+        
+        # Intrinsic vs. rendered size, format, lazy loading and caching of every <img>
+        audit = image_auditor.audit(driver, site_page)
+        if not audit.images:
+            pytest.skip(f"No images on {page}")
+        
+        budget = audit.budgets.get("wasted_bytes_per_page")
+        assert not audit.over_budget(), (
+            f"Images on {page} waste {audit.wasted_bytes} bytes (budget {budget}): {audit.describe()}"
+        )
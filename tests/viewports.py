@@ -0,0 +1,256 @@
+"""
+Responsive layout checks over a matrix of device profiles.
+
+Instead of resizing the window and reloading the page for every size, each
+profile is applied with Chrome's device emulation
+(``Emulation.setDeviceMetricsOverride``) to the page that is already
+loaded; the page re-lays itself out exactly as on a real resize. The page is
+only reloaded for profiles with their own user agent, whose server-rendered
+markup may differ. With several browsers the profiles are split between
+them and checked at the same time.
+
+Each profile yields a layout record (viewport vs. document width, the
+elements sticking out), attached to the test report and merged into
+``reports/viewports.json``.
+"""
+
+import json
+import os
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.locking import file_lock
+from tests.stats import STATS
+from tests.waits import wait_for_document_ready, wait_for_dom_settled
+
+STATS_SECTION = "viewport matrix"
+PROPERTY = "viewports"
+
+IPHONE_UA = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+)
+ANDROID_UA = (
+    "Mozilla/5.0 (Linux; Android 14; Pixel 7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+)
+
+
+class Viewport:
+    """A device profile: CSS viewport size, pixel ratio, mobile flag and user agent."""
+
+    def __init__(self, name, width, height, scale=1, mobile=False, user_agent=None):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.mobile = mobile
+        self.user_agent = user_agent
+
+    @property
+    def needs_reload(self):
+        # Server-side rendering can depend on the user agent, not on the size
+        return bool(self.user_agent)
+
+    def metrics(self):
+        return {
+            "width": self.width,
+            "height": self.height,
+            "deviceScaleFactor": self.scale,
+            "mobile": self.mobile,
+        }
+
+    def __repr__(self):
+        return f"<Viewport {self.name} {self.width}x{self.height}>"
+
+
+PROFILES = {
+    viewport.name: viewport
+    for viewport in [
+        Viewport("desktop", 1920, 1080),
+        Viewport("laptop", 1366, 768),
+        Viewport("tablet-landscape", 1024, 768, scale=2, mobile=True),
+        Viewport("tablet", 768, 1024, scale=2, mobile=True),
+        Viewport("iphone-se", 375, 667, scale=2, mobile=True, user_agent=IPHONE_UA),
+        Viewport("pixel-7", 412, 915, scale=2.625, mobile=True, user_agent=ANDROID_UA),
+        Viewport("small", 320, 568, scale=2, mobile=True),
+    ]
+}
+DEFAULT_PROFILES = "desktop,laptop,tablet-landscape,tablet,iphone-se,pixel-7,small"
+
+
+def load_viewports(spec=None):
+    """Profiles named in ``spec`` (or ``VIEWPORTS``): profile names or ``WIDTHxHEIGHT``."""
+    spec = spec or os.getenv("VIEWPORTS", DEFAULT_PROFILES)
+    viewports = []
+    for entry in (part.strip() for part in spec.split(",")):
+        if not entry:
+            continue
+        if entry in PROFILES:
+            viewports.append(PROFILES[entry])
+            continue
+        try:
+            width, height = (int(value) for value in entry.lower().split("x"))
+        except ValueError:
+            raise ValueError(
+                f"Unknown viewport {entry!r}; use WIDTHxHEIGHT or one of: {', '.join(PROFILES)}"
+            ) from None
+        viewports.append(Viewport(entry, width, height))
+    return viewports
+
+
+# Drivers with an active override, so the pool only clears those
+_emulated = weakref.WeakSet()
+
+
+def emulate(driver, viewport):
+    """Apply ``viewport`` to the current tab (takes effect without a reload)."""
+    driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", viewport.metrics())
+    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": viewport.mobile})
+    # An empty user agent removes a previous override
+    driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {"userAgent": viewport.user_agent or ""})
+    _emulated.add(driver)
+
+
+def clear_emulation(driver):
+    """Undo ``emulate``; used by the driver pool between tests."""
+    if driver not in _emulated:
+        return
+    driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": False})
+    driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {"userAgent": ""})
+    _emulated.discard(driver)
+
+
+# Elements reaching past the viewport edge, unless an ancestor clips them
+_LAYOUT_SCRIPT = """
+const root = document.documentElement;
+const width = root.clientWidth;
+const clipped = el => {
+    for (let node = el.parentElement; node && node !== document.body; node = node.parentElement) {
+        const overflow = getComputedStyle(node).overflowX;
+        if (overflow !== 'visible') return true;
+    }
+    return false;
+};
+const describe = el => el.tagName.toLowerCase()
+    + (el.id ? '#' + el.id : '')
+    + (typeof el.className === 'string' && el.className.trim()
+        ? '.' + el.className.trim().split(/\\s+/).slice(0, 2).join('.') : '');
+const offenders = [];
+if (root.scrollWidth > width) {
+    for (const el of document.body.querySelectorAll('*')) {
+        const rect = el.getBoundingClientRect();
+        if (rect.width && (rect.right > width + 1 || rect.left < -1) && !clipped(el)) {
+            offenders.push(`${describe(el)} (${Math.round(rect.left)}..${Math.round(rect.right)}px)`);
+            if (offenders.length >= 10) break;
+        }
+    }
+}
+return {
+    client_width: width,
+    scroll_width: root.scrollWidth,
+    document_height: root.scrollHeight,
+    offenders: offenders,
+};
+"""
+
+_NEXT_FRAME = "requestAnimationFrame(() => requestAnimationFrame(arguments[arguments.length - 1]));"
+
+
+def check_layout(driver):
+    """Current layout numbers of the page in ``driver``."""
+    return driver.execute_script(_LAYOUT_SCRIPT)
+
+
+class ViewportMatrix:
+    """Checks one URL under every viewport, spread over one or more browsers."""
+
+    def __init__(self, drivers, viewports, node=None, report_path=None):
+        self.drivers = list(drivers)
+        self.viewports = list(viewports)
+        self.node = node
+        self.report_path = report_path
+
+    def _settle(self, driver, reloaded):
+        if reloaded:
+            wait_for_document_ready(driver)
+        else:
+            # Let resize handlers and the re-layout run
+            driver.execute_async_script(_NEXT_FRAME)
+        wait_for_dom_settled(driver, quiet_period=0.1)
+
+    def _run_browser(self, driver, url, viewports):
+        results = []
+        loaded_user_agent = None
+        # Profiles without a user agent share the first load
+        for viewport in sorted(viewports, key=lambda v: v.user_agent or ""):
+            start_time = time.perf_counter()
+            emulate(driver, viewport)
+            reloaded = not results or viewport.user_agent != loaded_user_agent
+            if reloaded:
+                driver.get(url)
+                loaded_user_agent = viewport.user_agent
+            self._settle(driver, reloaded)
+
+            layout = check_layout(driver)
+            results.append({
+                "url": url,
+                "viewport": viewport.name,
+                "width": viewport.width,
+                "height": viewport.height,
+                "mobile": viewport.mobile,
+                "reloaded": reloaded,
+                "overflow": layout["scroll_width"] > layout["client_width"],
+                "elapsed_ms": (time.perf_counter() - start_time) * 1000,
+                **layout,
+            })
+        return results
+
+    def run(self, url):
+        """Check ``url`` under every viewport; return one record per viewport, in order."""
+        shares = [self.viewports[i::len(self.drivers)] for i in range(len(self.drivers))]
+        if len(self.drivers) == 1:
+            batches = [self._run_browser(self.drivers[0], url, shares[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(self.drivers)) as executor:
+                batches = list(executor.map(
+                    lambda args: self._run_browser(*args),
+                    [(driver, url, share) for driver, share in zip(self.drivers, shares) if share],
+                ))
+
+        by_name = {result["viewport"]: result for batch in batches for result in batch}
+        results = [by_name[viewport.name] for viewport in self.viewports]
+
+        STATS.incr(STATS_SECTION, "viewports checked", len(results))
+        # The first load of each browser is not a reload
+        STATS.incr(STATS_SECTION, "page reloads", sum(r["reloaded"] for r in results) - len(batches))
+        STATS.incr(STATS_SECTION, "overflowing viewports", sum(r["overflow"] for r in results))
+        if self.node is not None:
+            self.node.user_properties.append((PROPERTY, results))
+        if self.report_path:
+            self.write(results)
+        return results
+
+    def write(self, results):
+        """Merge ``results`` into the JSON report (shared by all xdist workers)."""
+        with file_lock(self.report_path + ".lock"):
+            try:
+                with open(self.report_path) as f:
+                    report = json.load(f)
+            except (OSError, ValueError):
+                report = {}
+            for result in results:
+                report.setdefault(result["url"], {})[result["viewport"]] = result
+            with open(self.report_path, "w") as f:
+                json.dump(report, f, indent=2)
+
+
+def describe_overflow(results):
+    """One line per overflowing viewport, for assertion messages."""
+    return [
+        f"{r['viewport']} ({r['width']}x{r['height']}): document {r['scroll_width']}px wide "
+        f"in a {r['client_width']}px viewport; {', '.join(r['offenders']) or 'no single element found'}"
+        for r in results if r["overflow"]
+    ]
@@ -0,0 +1,196 @@
+"""
+Event-driven wait helpers for the Selenium tests.
+
+Each helper polls a condition with ``WebDriverWait`` and returns as soon as it
+holds, replacing fixed ``time.sleep`` calls that either waste time or are too
+short on a slow machine. All raise ``TimeoutException`` when the condition is
+not met in time.
+"""
+
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+# Counts in-flight fetch/XHR requests; installed lazily on the current page
+_NETWORK_HOOK = """
+if (!window.__waitsNetwork) {
+    const state = window.__waitsNetwork = {pending: 0};
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function() {
+            state.pending++;
+            return originalFetch.apply(this, arguments).finally(() => { state.pending--; });
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        state.pending++;
+        this.addEventListener('loadend', () => { state.pending--; }, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+}
+return {
+    pending: window.__waitsNetwork.pending,
+    resources: performance.getEntriesByType('resource').length,
+};
+"""
+
+# Records the time of the last DOM mutation; installed lazily on the current page
+_MUTATION_HOOK = """
+if (!window.__waitsMutations) {
+    const state = window.__waitsMutations = {last: performance.now()};
+    new MutationObserver(() => { state.last = performance.now(); })
+        .observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__waitsMutations.last;
+"""
+
+# Infinite animations (animate-pulse, float, ...) never finish, so they do not count
+_ANIMATIONS_RUNNING = """
+const root = arguments[0];
+const animations = root ? root.getAnimations({subtree: true}) : document.getAnimations();
+return animations.some(animation =>
+    animation.playState === 'running'
+    && !(animation.effect && animation.effect.getComputedTiming().endTime === Infinity));
+"""
+
+
+class _Unchanged:
+    """Predicate that holds once ``sample()`` returns the same value for ``quiet_period`` seconds."""
+
+    def __init__(self, sample, quiet_period):
+        self.sample = sample
+        self.quiet_period = quiet_period
+        self.value = object()
+        self.since = None
+
+    def __call__(self, driver):
+        value = self.sample(driver)
+        now = time.monotonic()
+        if value != self.value:
+            self.value = value
+            self.since = now
+            return False
+        return now - self.since >= self.quiet_period
+
+
+def _wait(driver, timeout, predicate, message):
+    return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(predicate, message)
+
+
+def wait_for_document_ready(driver, timeout=DEFAULT_TIMEOUT):
+    """Wait until ``document.readyState`` is ``complete``."""
+    return _wait(
+        driver, timeout,
+        lambda d: d.execute_script("return document.readyState") == "complete",
+        "Document did not finish loading",
+    )
+
+
+def wait_for_load_event(driver, timeout=DEFAULT_TIMEOUT):
+    """Wait until the load event has finished (``loadEventEnd`` of the navigation is set).
+
+    ``readyState`` turns ``complete`` before the load handlers have run, so
+    navigation timing may still report ``loadEventEnd`` as 0 at that point.
+    """
+    return _wait(
+        driver, timeout,
+        lambda d: d.execute_script(
+            "const nav = performance.getEntriesByType('navigation')[0];"
+            "return Boolean(nav) && nav.loadEventEnd > 0;"
+        ),
+        "Load event did not finish",
+    )
+
+
+def scroll_position(driver):
+    return tuple(driver.execute_script("return [window.pageXOffset, window.pageYOffset];"))
+
+
+def wait_for_scroll_settled(driver, start_position=None, quiet_period=0.15, timeout=DEFAULT_TIMEOUT):
+    """Wait until the scroll position stops changing.
+
+    With ``start_position`` the wait also requires the page to have moved away
+    from it, so it cannot return before a smooth scroll has even started.
+    """
+    settled = _Unchanged(scroll_position, quiet_period)
+
+    def predicate(d):
+        done = settled(d)
+        return done and (start_position is None or settled.value != tuple(start_position))
+
+    _wait(driver, timeout, predicate, "Scroll position did not settle")
+    return settled.value
+
+
+def wait_for_element_stable(driver, element, quiet_period=0.1, timeout=DEFAULT_TIMEOUT):
+    """Wait until an element's position and size stop changing."""
+    _wait(
+        driver, timeout,
+        _Unchanged(lambda d: tuple(sorted(element.rect.items())), quiet_period),
+        "Element did not stop moving",
+    )
+    return element
+
+
+def wait_for_animations_finished(driver, element=None, timeout=DEFAULT_TIMEOUT):
+    """Wait until no finite CSS/Web Animations are running (on ``element`` or the whole document).
+
+    Looping animations never end and are ignored.
+    """
+    return _wait(
+        driver, timeout,
+        lambda d: not d.execute_script(_ANIMATIONS_RUNNING, element),
+        "Animations did not finish",
+    )
+
+
+def wait_for_dom_settled(driver, quiet_period=0.3, timeout=DEFAULT_TIMEOUT):
+    """Wait until the DOM has not been mutated for ``quiet_period`` seconds."""
+    return _wait(
+        driver, timeout,
+        lambda d: d.execute_script(_MUTATION_HOOK) >= quiet_period * 1000,
+        "DOM kept changing",
+    )
+
+
+def wait_for_network_idle(driver, quiet_period=0.5, timeout=DEFAULT_TIMEOUT):
+    """Wait until no fetch/XHR is in flight and no new resources load for ``quiet_period``.
+
+    Requests started before the first poll are only seen through resource
+    timing, so one still in flight at that moment counts once it completes.
+    """
+    idle = _Unchanged(lambda d: d.execute_script(_NETWORK_HOOK)["resources"], quiet_period)
+
+    def predicate(d):
+        return idle(d) and d.execute_script(_NETWORK_HOOK)["pending"] == 0
+
+    return _wait(driver, timeout, predicate, "Network did not become idle")
+
+
+def wait_for_images_loaded(driver, timeout=DEFAULT_TIMEOUT):
+    """Wait until every ``<img>`` on the page has finished loading (or failed)."""
+    return _wait(
+        driver, timeout,
+        lambda d: d.execute_script("return Array.from(document.images).every(img => img.complete);"),
+        "Images still loading",
+    )
+
+
+def wait_for_ui_settled(driver, timeout=DEFAULT_TIMEOUT):
+    """Wait for the page to react to an interaction: network idle, then a quiet DOM."""
+    wait_for_network_idle(driver, quiet_period=0.2, timeout=timeout)
+    wait_for_dom_settled(driver, quiet_period=0.2, timeout=timeout)
+
+
+def wait_for_focus_change(driver, previous, timeout=DEFAULT_TIMEOUT):
+    """Wait until the focused element is no longer ``previous``; return the new one."""
+    _wait(
+        driver, timeout,
+        lambda d: d.switch_to.active_element != previous,
+        "Focus did not move",
+    )
+    return driver.switch_to.active_element
@@ -0,0 +1,131 @@
+"""
+Navigation Timing / Web Vitals capture for the Selenium tests.
+
+After a page load, ``capture_metrics`` reads the browser's own performance
+entries (navigation timing, paint timing, largest-contentful-paint,
+layout-shift and resource timing) so tests can assert on real TTFB, FCP, LCP
+and CLS numbers instead of wall-clock time around ``driver.get``.
+Budgets live in ``tests/perf_budgets.json`` (override with ``PERF_BUDGETS``).
+"""
+
+import json
+import os
+
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_budgets.json")
+
+# Buffered observers hand back entries recorded before they were created,
+# so LCP and CLS can be read after the page has loaded.
+_CAPTURE_SCRIPT = """
+const result = {navigation: null, paint: {}, lcp: null, cls: 0, resources: []};
+
+const nav = performance.getEntriesByType('navigation')[0];
+if (nav) {
+    result.navigation = {
+        ttfb: nav.responseStart - nav.startTime,
+        dom_interactive: nav.domInteractive - nav.startTime,
+        dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+        // 0 until the load event has finished; not a load time
+        load: nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+        transfer_size: nav.transferSize,
+        decoded_size: nav.decodedBodySize,
+    };
+}
+
+performance.getEntriesByType('paint').forEach(entry => {
+    result.paint[entry.name] = entry.startTime;
+});
+
+try {
+    const observer = new PerformanceObserver(() => {});
+    observer.observe({type: 'largest-contentful-paint', buffered: true});
+    const entries = observer.takeRecords();
+    observer.disconnect();
+    if (entries.length) {
+        result.lcp = entries[entries.length - 1].startTime;
+    }
+} catch (e) {}
+
+try {
+    const observer = new PerformanceObserver(() => {});
+    observer.observe({type: 'layout-shift', buffered: true});
+    for (const entry of observer.takeRecords()) {
+        if (!entry.hadRecentInput) {
+            result.cls += entry.value;
+        }
+    }
+    observer.disconnect();
+} catch (e) {}
+
+result.resources = performance.getEntriesByType('resource').map(entry => ({
+    name: entry.name,
+    initiator_type: entry.initiatorType,
+    transfer_size: entry.transferSize,
+    encoded_size: entry.encodedBodySize,
+    decoded_size: entry.decodedBodySize,
+    duration: entry.duration,
+}));
+
+return result;
+"""
+
+
+def capture_metrics(driver):
+    """Return navigation, paint, LCP, CLS and resource metrics for the current page."""
+    raw = driver.execute_script(_CAPTURE_SCRIPT)
+    navigation = raw.get("navigation") or {}
+    resources = raw.get("resources") or []
+
+    return {
+        "url": driver.current_url,
+        "ttfb_ms": navigation.get("ttfb"),
+        "dom_interactive_ms": navigation.get("dom_interactive"),
+        "dom_content_loaded_ms": navigation.get("dom_content_loaded"),
+        "load_ms": navigation.get("load"),
+        "fp_ms": raw["paint"].get("first-paint"),
+        "fcp_ms": raw["paint"].get("first-contentful-paint"),
+        "lcp_ms": raw.get("lcp"),
+        "cls": raw.get("cls"),
+        "document_transfer_bytes": navigation.get("transfer_size"),
+        "resource_count": len(resources),
+        "resource_transfer_bytes": sum(r.get("transfer_size") or 0 for r in resources),
+        "resources": resources,
+    }
+
+
+def load_budgets(section="web_vitals"):
+    """Read one section of the budgets file."""
+    path = os.getenv("PERF_BUDGETS", BUDGETS_PATH)
+    with open(path) as f:
+        return json.load(f).get(section, {})
+
+
+def check_budgets(metrics, budgets):
+    """Return a list of budget violations (metrics that were not captured are ignored)."""
+    violations = []
+    for name, limit in budgets.items():
+        value = metrics.get(name)
+        if value is not None and value > limit:
+            violations.append(f"{name}={value:.3f} exceeds budget {limit}")
+    return violations
+
+
+class PageMetricsRecorder:
+    """Captures metrics for a test, attaches them to its report and checks budgets."""
+
+    def __init__(self, driver, node, budgets):
+        self.driver = driver
+        self.node = node
+        self.budgets = budgets
+        self.captured = []
+
+    def capture(self):
+        metrics = capture_metrics(self.driver)
+        self.captured.append(metrics)
+        # Resource lists are large; the report keeps the summary numbers
+        summary = {key: value for key, value in metrics.items() if key != "resources"}
+        self.node.user_properties.append(("web_vitals", summary))
+        return metrics
+
+    def assert_within_budget(self, metrics):
+        violations = check_budgets(metrics, self.budgets)
+        assert not violations, f"Performance budget exceeded on {metrics['url']}: " + "; ".join(violations)